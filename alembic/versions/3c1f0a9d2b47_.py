@@ -0,0 +1,44 @@
+"""otp_codes lookup and purge indexes
+
+Revision ID: 3c1f0a9d2b47
+Revises: 70bd23d881e3
+Create Date: 2026-10-17 09:12:40.511203
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3c1f0a9d2b47"
+down_revision: Union[str, Sequence[str], None] = "70bd23d881e3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_otp_codes_email_created_at",
+        "otp_codes",
+        ["email", sa.text("created_at DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_otp_codes_email_unused",
+        "otp_codes",
+        ["email", sa.text("created_at DESC")],
+        unique=False,
+        postgresql_where=sa.text("NOT used"),
+    )
+    op.create_index("ix_otp_codes_expires_at", "otp_codes", ["expires_at"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_otp_codes_expires_at", table_name="otp_codes")
+    op.drop_index("ix_otp_codes_email_unused", table_name="otp_codes", postgresql_where=sa.text("NOT used"))
+    op.drop_index("ix_otp_codes_email_created_at", table_name="otp_codes")
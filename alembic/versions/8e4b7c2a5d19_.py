@@ -0,0 +1,82 @@
+"""user_stats rollup table
+
+Revision ID: 8e4b7c2a5d19
+Revises: 3c1f0a9d2b47
+Create Date: 2026-10-17 11:03:27.884120
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8e4b7c2a5d19"
+down_revision: Union[str, Sequence[str], None] = "3c1f0a9d2b47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "user_stats",
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("skill", sa.String(length=50), nullable=False),
+        sa.Column("practice_type", sa.String(length=50), server_default=sa.text("''"), nullable=False),
+        sa.Column("sessions", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("scored_sessions", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("score_sum", sa.Numeric(precision=12, scale=1), server_default=sa.text("0"), nullable=False),
+        sa.Column("score_max", sa.Numeric(precision=3, scale=1), nullable=True),
+        sa.Column("time_spent", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("first_score", sa.Numeric(precision=3, scale=1), nullable=True),
+        sa.Column("first_score_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_score", sa.Numeric(precision=3, scale=1), nullable=True),
+        sa.Column("last_score_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_activity_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("scored_day_sum", sa.BigInteger(), server_default=sa.text("0"), nullable=False),
+        sa.Column("scored_day_square_sum", sa.BigInteger(), server_default=sa.text("0"), nullable=False),
+        sa.Column(
+            "scored_day_score_sum", sa.Numeric(precision=20, scale=1), server_default=sa.text("0"), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("user_id", "skill", "practice_type"),
+    )
+    # Backfill from the existing history; afterwards the application keeps the rows up to date
+    op.execute(
+        """
+        INSERT INTO user_stats (
+            user_id, skill, practice_type, sessions, scored_sessions, score_sum, score_max, time_spent,
+            first_score, first_score_at, last_score, last_score_at, last_activity_at,
+            scored_day_sum, scored_day_square_sum, scored_day_score_sum
+        )
+        SELECT
+            user_id,
+            lower(type),
+            coalesce(practice_type, ''),
+            count(*),
+            count(score),
+            coalesce(sum(score), 0),
+            max(score),
+            coalesce(sum(time_spent), 0),
+            (array_agg(score ORDER BY created_at ASC) FILTER (WHERE score IS NOT NULL))[1],
+            min(created_at) FILTER (WHERE score IS NOT NULL),
+            (array_agg(score ORDER BY created_at DESC) FILTER (WHERE score IS NOT NULL))[1],
+            max(created_at) FILTER (WHERE score IS NOT NULL),
+            max(created_at),
+            coalesce(sum(epoch_day) FILTER (WHERE score IS NOT NULL), 0),
+            coalesce(sum(epoch_day * epoch_day) FILTER (WHERE score IS NOT NULL), 0),
+            coalesce(sum(epoch_day * score) FILTER (WHERE score IS NOT NULL), 0)
+        FROM (
+            SELECT *, date(timezone('UTC', created_at)) - DATE '1970-01-01' AS epoch_day FROM user_activities
+        ) AS activities
+        GROUP BY user_id, lower(type), coalesce(practice_type, '')
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("user_stats")
@@ -0,0 +1,52 @@
+"""(created_at, id) indexes for keyset pagination of the list endpoints
+
+Revision ID: a6e1c8b3d950
+Revises: f2a9d6c4e813
+Create Date: 2026-10-17 18:05:12.337418
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a6e1c8b3d950"
+down_revision: Union[str, Sequence[str], None] = "f2a9d6c4e813"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_user_activities_user_id_created_at_id",
+        "user_activities",
+        ["user_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index("ix_vocabulary_user_id_created_at_id", "vocabulary", ["user_id", "created_at", "id"], unique=False)
+    op.create_index("ix_mock_tests_created_at_id", "mock_tests", ["created_at", "id"], unique=False)
+    op.create_index("ix_passages_skill_created_at_id", "passages", ["skill", "created_at", "id"], unique=False)
+    op.create_index(
+        "ix_practice_questions_standalone_skill_created_at_id",
+        "practice_questions",
+        ["skill", "created_at", "id"],
+        unique=False,
+        postgresql_where=sa.text("passage_id IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_practice_questions_standalone_skill_created_at_id",
+        table_name="practice_questions",
+        postgresql_where=sa.text("passage_id IS NULL"),
+    )
+    op.drop_index("ix_passages_skill_created_at_id", table_name="passages")
+    op.drop_index("ix_mock_tests_created_at_id", table_name="mock_tests")
+    op.drop_index("ix_vocabulary_user_id_created_at_id", table_name="vocabulary")
+    op.drop_index("ix_user_activities_user_id_created_at_id", table_name="user_activities")
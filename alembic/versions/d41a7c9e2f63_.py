@@ -0,0 +1,29 @@
+"""users.data_version for per-user cache keys and ETags
+
+Revision ID: d41a7c9e2f63
+Revises: b5d2e9f4c071
+Create Date: 2026-10-17 15:02:44.518203
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d41a7c9e2f63"
+down_revision: Union[str, Sequence[str], None] = "b5d2e9f4c071"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("users", sa.Column("data_version", sa.BigInteger(), server_default=sa.text("0"), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "data_version")
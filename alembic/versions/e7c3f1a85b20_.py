@@ -0,0 +1,27 @@
+"""practice_questions.passage_id index for loading passage questions
+
+Revision ID: e7c3f1a85b20
+Revises: d41a7c9e2f63
+Create Date: 2026-10-17 16:20:37.904115
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e7c3f1a85b20"
+down_revision: Union[str, Sequence[str], None] = "d41a7c9e2f63"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f("ix_practice_questions_passage_id"), "practice_questions", ["passage_id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_practice_questions_passage_id"), table_name="practice_questions")
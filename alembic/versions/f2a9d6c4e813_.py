@@ -0,0 +1,63 @@
+"""content_version counter bumped by triggers on the content tables
+
+Revision ID: f2a9d6c4e813
+Revises: e7c3f1a85b20
+Create Date: 2026-10-17 17:05:12.340871
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2a9d6c4e813"
+down_revision: Union[str, Sequence[str], None] = "e7c3f1a85b20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CONTENT_TABLES = ("passages", "practice_questions", "mock_tests")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "content_version",
+        sa.Column("id", sa.Integer(), server_default=sa.text("1"), nullable=False),
+        sa.Column("version", sa.BigInteger(), server_default=sa.text("0"), nullable=False),
+        sa.CheckConstraint("id = 1", name="ck_content_version_single_row"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute("INSERT INTO content_version (id, version) VALUES (1, 0)")
+    # Once per statement: bump the version and tell every worker (app.setup.invalidation) on commit
+    op.execute(
+        """
+        CREATE FUNCTION bump_content_version() RETURNS trigger AS $$
+        DECLARE
+            new_version bigint;
+        BEGIN
+            UPDATE content_version SET version = version + 1 WHERE id = 1 RETURNING version INTO new_version;
+            PERFORM pg_notify(
+                'cache_invalidation',
+                json_build_object('namespace', 'content', 'key', new_version::text, 'prefix', false)::text
+            );
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in CONTENT_TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_bump_content_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION bump_content_version()"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in CONTENT_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_bump_content_version ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_content_version()")
+    op.drop_table("content_version")
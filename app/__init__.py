@@ -1,25 +1,115 @@
+import uuid
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
-from app.common.utils.version import get_project_version
-from app.core.config import SETTINGS
 from fastapi import FastAPI
-from app.api.route import router as api_router
 
+from app.api.route import router as api_router
+from app.common.utils.cache import principal_cache, user_data_cache
+from app.common.utils.content_catalog import content_catalog
+from app.common.utils.email import email_dispatcher
+from app.common.utils.offload import offloader
+from app.common.utils.token import revocation_filter
+from app.common.utils.version import get_project_version
+from app.core.config import SETTINGS
+from app.crud.auth import AuthCrud
+from app.setup.background import PeriodicTask
 from app.setup.database import sessionmanager
+from app.setup.instrumentation import slow_query_recorder
+from app.setup.invalidation import invalidation_bus
 from app.setup.middleware import middlewares
 
 
-def create_app() -> FastAPI:
-    database_url = (
+def _database_url(server: str, port: int) -> str:
+    return (
         f"postgresql+asyncpg://{SETTINGS.POSTGRES_USERNAME}:{SETTINGS.POSTGRES_PASSWORD}"
+        f"@{server}:{port}/{SETTINGS.POSTGRES_DATABASE}"
+    )
+
+
+def _listener_dsn() -> str:
+    return (
+        f"postgresql://{SETTINGS.POSTGRES_USERNAME}:{SETTINGS.POSTGRES_PASSWORD}"
         f"@{SETTINGS.POSTGRES_SERVER}:{SETTINGS.POSTGRES_PORT}/{SETTINGS.POSTGRES_DATABASE}"
     )
-    sessionmanager.init(database_url)
+
+
+def init_database() -> None:
+    """Configure the session manager (and its instrumentation) from the settings"""
+    database_url = _database_url(SETTINGS.POSTGRES_SERVER, SETTINGS.POSTGRES_PORT)
+    replica_urls = []
+    for replica in SETTINGS.POSTGRES_REPLICA_SERVERS:
+        server, _, port = replica.partition(":")
+        replica_urls.append(_database_url(server, int(port) if port else SETTINGS.POSTGRES_PORT))
+    slow_query_recorder.configure(
+        enabled=SETTINGS.DB_SLOW_QUERY_LOG_ENABLED,
+        threshold_ms=SETTINGS.DB_SLOW_QUERY_THRESHOLD_MS,
+        explain_sample_rate=SETTINGS.DB_SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+        ring_size=SETTINGS.DB_SLOW_QUERY_RING_SIZE,
+    )
+    sessionmanager.init(
+        database_url,
+        replica_urls=replica_urls,
+        replica_strategy=SETTINGS.DB_REPLICA_STRATEGY,
+        read_your_writes_seconds=SETTINGS.DB_READ_YOUR_WRITES_SECONDS,
+        pool_size=SETTINGS.DB_POOL_SIZE,
+        max_overflow=SETTINGS.DB_MAX_OVERFLOW,
+        pool_timeout=SETTINGS.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=SETTINGS.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=SETTINGS.DB_POOL_PRE_PING,
+        statement_cache_size=SETTINGS.DB_STATEMENT_CACHE_SIZE,
+    )
+
+
+def create_app() -> FastAPI:
+    init_database()
+
+    async def purge_expired_otps() -> None:
+        async with sessionmanager.session() as db:
+            await AuthCrud.purge_expired_otps(db, SETTINGS.OTP_PURGE_BATCH_SIZE)
+
+    def invalidate_principal(key: str) -> None:
+        # Another worker changed the user: drop its cached row and stop trusting the claims of its access tokens
+        user_id = uuid.UUID(key)
+        principal_cache.invalidate(user_id)
+        revocation_filter.revoke(user_id)
+
+    invalidation_bus.subscribe("principal", invalidate=invalidate_principal, clear=principal_cache.clear)
+
+    invalidation_bus.subscribe(
+        "content",
+        invalidate=lambda key: content_catalog.advance(int(key)),
+        clear=content_catalog.forget_version,
+    )
+
+    background_tasks = [
+        PeriodicTask("purge-expired-otps", SETTINGS.OTP_PURGE_INTERVAL_SECONDS, purge_expired_otps),
+        PeriodicTask("sweep-user-data-cache", SETTINGS.USER_DATA_CACHE_SWEEP_SECONDS, user_data_cache.cleanup_expired),
+    ]
 
     @asynccontextmanager
     async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+        await sessionmanager.warmup(SETTINGS.DB_POOL_WARMUP_CONNECTIONS)
+        await email_dispatcher.start(
+            pool_size=SETTINGS.SMTP_POOL_SIZE,
+            queue_size=SETTINGS.SMTP_QUEUE_MAX_SIZE,
+            max_retries=SETTINGS.SMTP_MAX_RETRIES,
+            retry_backoff_seconds=SETTINGS.SMTP_RETRY_BACKOFF_SECONDS,
+            timeout_seconds=SETTINGS.SMTP_TIMEOUT_SECONDS,
+            max_idle_seconds=SETTINGS.SMTP_MAX_IDLE_SECONDS,
+        )
+        if SETTINGS.CACHE_INVALIDATION_ENABLED:
+            invalidation_bus.start(_listener_dsn(), SETTINGS.CACHE_INVALIDATION_KEEPALIVE_SECONDS)
+        for task in background_tasks:
+            task.start()
+        if SETTINGS.CONTENT_CACHE_ENABLED:
+            await content_catalog.warm()
         yield
+        for task in background_tasks:
+            await task.stop()
+        await invalidation_bus.stop()
+        offloader.shutdown()
+        await email_dispatcher.stop()
         if sessionmanager._engine is not None:
             await sessionmanager.close()
 
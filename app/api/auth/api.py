@@ -1,18 +1,27 @@
+import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Annotated
 
-import jwt
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.common.utils.email import send_email
+from app.common.utils.email import email_dispatcher
+from app.common.utils.token import REFRESH_TOKEN_TYPE, create_access_token, create_refresh_token, decode_token
 from app.core.config import SETTINGS
 from app.core.depends.get_current_user import get_current_user
 from app.core.depends.get_session import get_session
+from app.core.depends.rate_limit import login_rate_limit, register_rate_limit, verify_otp_rate_limit
 from app.crud.auth import AuthCrud
 from app.crud.user import UserCrud
 from app.model.model import OtpCode, User
-from app.schema.auth import LoginRequest, RegisterRequest, UpdateProfileRequest, VerifyOtpRequest
+from app.schema.auth import (
+    LoginRequest,
+    RefreshTokenRequest,
+    RegisterRequest,
+    UpdateProfileRequest,
+    VerifyOtpRequest,
+)
+from app.setup.database import sessionmanager
 
 router = APIRouter(
     prefix="/auth",
@@ -21,12 +30,15 @@ router = APIRouter(
 
 
 @router.post("/login")
-async def login(payload: LoginRequest, db: Annotated[AsyncSession, Depends(get_session)]):
+async def login(
+    payload: Annotated[LoginRequest, Depends(login_rate_limit)], db: Annotated[AsyncSession, Depends(get_session)]
+):
     # Issue OTP using AuthCrud
     otp = await AuthCrud.issue_otp(db, str(payload.email))
+    await sessionmanager.release(db)
 
-    # Send OTP email
-    await send_email(str(payload.email), subject="Your login code", body=f"Your OTP is {otp.otp_code}")
+    # Send OTP email in the background; the code is already stored
+    await email_dispatcher.enqueue(str(payload.email), subject="Your login code", body=f"Your OTP is {otp.otp_code}")
 
     return {
         "success": True,
@@ -36,7 +48,9 @@ async def login(payload: LoginRequest, db: Annotated[AsyncSession, Depends(get_s
 
 
 @router.post("/register")
-async def register(payload: RegisterRequest, db: Annotated[AsyncSession, Depends(get_session)]):
+async def register(
+    payload: Annotated[RegisterRequest, Depends(register_rate_limit)], db: Annotated[AsyncSession, Depends(get_session)]
+):
     email = str(payload.email)
 
     # Get or create user using UserCrud
@@ -53,15 +67,14 @@ async def register(payload: RegisterRequest, db: Annotated[AsyncSession, Depends
 
     # Update user with registration data if it's a new user or if data is provided
     if payload.name or payload.targetScore is not None or payload.testDate is not None:
-        await UserCrud.update_user_profile(
+        user = await UserCrud.update_user_profile(
             db,
             user_id=user.id,
             name=payload.name,
             target_score=payload.targetScore,
             test_date=payload.testDate,
         )
-        # Refresh user data and update our variables
-        user = await UserCrud.get_user_by_id(db, user.id)
+        # The update returns the fresh row, so no reload is needed
         if user:
             user_name = user.name
             user_target_score = user.target_score
@@ -78,10 +91,9 @@ async def register(payload: RegisterRequest, db: Annotated[AsyncSession, Depends
     otp = OtpCode(email=email, otp_code=otp_code, expires_at=expires_at, created_at=now)
     db.add(otp)
     await db.commit()
-    await db.refresh(otp)
 
-    # Send OTP to user's email
-    await send_email(email, subject="Your login code", body=f"Your OTP is {otp.otp_code}")
+    # Send OTP to user's email in the background
+    await email_dispatcher.enqueue(email, subject="Your login code", body=f"Your OTP is {otp.otp_code}")
 
     # Response per spec using stored data
     user_payload = {
@@ -104,24 +116,41 @@ async def register(payload: RegisterRequest, db: Annotated[AsyncSession, Depends
 
 
 @router.post("/verify-otp")
-async def verify_otp(payload: VerifyOtpRequest, db: Annotated[AsyncSession, Depends(get_session)]):
+async def verify_otp(
+    payload: Annotated[VerifyOtpRequest, Depends(verify_otp_rate_limit)],
+    db: Annotated[AsyncSession, Depends(get_session)],
+):
     # Verify OTP using AuthCrud
     user = await AuthCrud.verify_otp(db, str(payload.email), payload.otp)
 
     if user is None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid or expired OTP")
 
-    # Issue JWT
-    now = datetime.now(timezone.utc)
-    exp = now + timedelta(minutes=SETTINGS.JWT_EXPIRE_MINUTES)
-    claims = {
-        "sub": str(user.id),
-        "email": user.email,
-        "iat": int(now.timestamp()),
-        "exp": int(exp.timestamp()),
-    }
-    token = jwt.encode(claims, SETTINGS.JWT_SECRET, algorithm=SETTINGS.JWT_ALGORITHM)
+    return {"success": True, "data": _build_login_data(user), "message": "Login successful"}
 
+
+@router.post("/refresh")
+async def refresh_token(payload: RefreshTokenRequest, db: Annotated[AsyncSession, Depends(get_session)]):
+    if not SETTINGS.AUTH_STATELESS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Token refresh is not enabled")
+
+    try:
+        claims = decode_token(payload.refreshToken)
+        if claims.get("typ") != REFRESH_TOKEN_TYPE:
+            raise ValueError("Not a refresh token")
+        user_id = uuid.UUID(claims["sub"])
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+
+    # New claims always come from the current row
+    user = await UserCrud.get_user_by_id(db, user_id)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+
+    return {"success": True, "data": _build_login_data(user), "message": "Token refreshed"}
+
+
+def _build_login_data(user: User) -> dict:
     user_payload = {
         "id": str(user.id),
         "name": user.name,
@@ -134,8 +163,10 @@ async def verify_otp(payload: VerifyOtpRequest, db: Annotated[AsyncSession, Depe
         "level": user.level,
         "xp": user.xp,
     }
-
-    return {"success": True, "data": {"user": user_payload, "token": token}, "message": "Login successful"}
+    data = {"user": user_payload, "token": create_access_token(user)}
+    if SETTINGS.AUTH_STATELESS_ENABLED:
+        data["refreshToken"] = create_refresh_token(user)
+    return data
 
 
 @router.get("/profile")
@@ -1,12 +1,18 @@
+from datetime import datetime
 from typing import Annotated
+from zoneinfo import ZoneInfo
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.common.utils.cache import user_data_cache, user_data_key
 from app.common.utils.dashboard import convert_dashboard_to_response
+from app.common.utils.http import check_etag, make_etag
 from app.core.depends.get_current_user import get_current_user
-from app.core.depends.get_session import get_session
+from app.core.depends.get_session import get_read_session
+from app.core.depends.get_time_zone import get_time_zone
 from app.crud.dashboard import DashboardCrud
+from app.crud.user import UserCrud
 from app.model.model import User
 
 router = APIRouter(
@@ -17,16 +23,27 @@ router = APIRouter(
 
 @router.get("")
 async def get_dashboard(
+    request: Request,
+    response: Response,
     current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_session)],
+    db: Annotated[AsyncSession, Depends(get_read_session)],
+    tz: Annotated[str, Depends(get_time_zone)],
 ):
     """
     Get comprehensive dashboard data
     """
-    # Get dashboard data
-    dashboard_data = await DashboardCrud.get_dashboard_data(db, current_user.id)
+    # Streaks depend on the local day, so the key changes at midnight even without writes
+    data_version = await UserCrud.get_data_version(db, current_user.id)
+    today = datetime.now(ZoneInfo(tz)).date()
+    cache_key = user_data_key("dashboard", current_user.id, data_version, tz, today)
+    not_modified = check_etag(request, response, make_etag(cache_key))
+    if not_modified is not None:
+        return not_modified
 
-    # Convert to response format
-    dashboard_response = convert_dashboard_to_response(dashboard_data)
+    async def load():
+        dashboard_data = await DashboardCrud.get_dashboard_data(db, current_user.id, tz=tz)
+        return convert_dashboard_to_response(dashboard_data)
+
+    dashboard_response = await user_data_cache.get_or_load(cache_key, load)
 
     return {"success": True, "data": dashboard_response}
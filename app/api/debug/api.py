@@ -0,0 +1,52 @@
+from fastapi import APIRouter
+
+from app.common.utils.cache import user_data_cache
+from app.common.utils.content_catalog import content_catalog
+from app.common.utils.offload import offloader
+from app.setup.database import sessionmanager
+from app.setup.instrumentation import slow_query_recorder
+from app.setup.invalidation import invalidation_bus
+
+router = APIRouter(
+    prefix="/debug",
+    tags=["debug"],
+)
+
+
+@router.get("/pool")
+async def get_pool_status():
+    """
+    Get live database connection pool statistics
+    """
+    return {"success": True, "data": sessionmanager.pool_status()}
+
+
+@router.get("/slow-queries")
+async def get_slow_queries():
+    """
+    Get the most recent slow statements with their sampled query plans
+    """
+    return {"success": True, "data": slow_query_recorder.entries()}
+
+
+@router.get("/offload")
+async def get_offload_stats():
+    """
+    Get inline and offloaded counts with queueing and compute time of the CPU-heavy computations
+    """
+    return {"success": True, "data": offloader.stats()}
+
+
+@router.get("/caches")
+async def get_cache_stats():
+    """
+    Get hit, miss and eviction counters of the caches and the state of the invalidation listener
+    """
+    return {
+        "success": True,
+        "data": {
+            "userData": user_data_cache.stats(),
+            "content": content_catalog.stats(),
+            "invalidation": invalidation_bus.stats(),
+        },
+    }
@@ -1,12 +1,10 @@
 import uuid
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, HTTPException, Query, Request
 
-from app.common.utils.mock_test import convert_mock_test_to_response
-from app.core.depends.get_session import get_session
-from app.crud.mock_test import MockTestCrud
+from app.common.utils.content_catalog import catalog_response
+from app.common.utils.pagination import decode_cursor
 
 router = APIRouter(
     prefix="/mock-tests",
@@ -16,38 +14,29 @@ router = APIRouter(
 
 @router.get("")
 async def get_mock_tests(
-    db: Annotated[AsyncSession, Depends(get_session)],
+    request: Request,
     limit: Annotated[int, Query(ge=1, le=100)] = 50,
+    cursor: Annotated[str | None, Query(description="nextCursor of the previous page")] = None,
 ):
     """
     Get all available mock tests
     """
-    # Get all mock tests
-    mock_tests = await MockTestCrud.get_all_mock_tests(db, limit=limit)
-
-    # Convert to response format
-    test_responses = [convert_mock_test_to_response(test) for test in mock_tests]
-
-    return {"success": True, "data": test_responses}
+    # Mock tests, a page at a time, served from the content catalog
+    return await catalog_response(request, "mock-tests", limit=limit, after=decode_cursor(cursor))
 
 
 @router.get("/{test_id}")
 async def get_mock_test_by_id(
+    request: Request,
     test_id: uuid.UUID,
-    db: Annotated[AsyncSession, Depends(get_session)],
 ):
     """
     Get specific mock test details
     """
-    # Get mock test by ID
-    mock_test = await MockTestCrud.get_mock_test_by_id(db, test_id)
-
-    if not mock_test:
-        from fastapi import HTTPException
+    # Mock test by ID, served from the content catalog
+    response = await catalog_response(request, "mock-test", test_id=test_id)
 
+    if response is None:
         raise HTTPException(status_code=404, detail="Mock test not found")
 
-    # Convert to response format
-    test_response = convert_mock_test_to_response(mock_test)
-
-    return {"success": True, "data": test_response}
+    return response
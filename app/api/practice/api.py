@@ -1,16 +1,9 @@
-from typing import Annotated, List
+from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Query, Request
 
-from app.common.utils.practice import (
-    convert_passage_to_response,
-    convert_reading_passage_to_response,
-    convert_speaking_question_to_response,
-    convert_writing_prompt_to_response,
-)
-from app.core.depends.get_session import get_session
-from app.crud.practice import PracticeCrud
+from app.common.utils.content_catalog import catalog_response
+from app.common.utils.pagination import decode_cursor
 
 router = APIRouter(
     prefix="/practice",
@@ -20,42 +13,35 @@ router = APIRouter(
 
 @router.get("/listening")
 async def get_listening_practice(
-    db: Annotated[AsyncSession, Depends(get_session)],
+    request: Request,
     limit: Annotated[int, Query(ge=1, le=50)] = 10,
+    cursor: Annotated[str | None, Query(description="nextCursor of the previous page")] = None,
 ):
     """
     Get listening practice questions
     """
-    # Get listening passages with questions
-    passages = await PracticeCrud.get_listening_passages_with_questions(db, limit=limit)
-
-    # Convert to response format
-    passage_responses = [convert_passage_to_response(passage) for passage in passages]
-
-    return {"success": True, "data": {"passages": passage_responses}}
+    # Listening passages with questions, a page at a time, served from the content catalog
+    return await catalog_response(request, "listening", limit=limit, after=decode_cursor(cursor))
 
 
 @router.get("/reading")
 async def get_reading_practice(
-    db: Annotated[AsyncSession, Depends(get_session)],
+    request: Request,
     limit: Annotated[int, Query(ge=1, le=50)] = 10,
+    cursor: Annotated[str | None, Query(description="nextCursor of the previous page")] = None,
 ):
     """
     Get reading practice questions
     """
-    # Get reading passages with questions
-    passages = await PracticeCrud.get_reading_passages_with_questions(db, limit=limit)
-
-    # Convert to response format
-    passage_responses = [convert_reading_passage_to_response(passage) for passage in passages]
-
-    return {"success": True, "data": {"passages": passage_responses}}
+    # Reading passages with questions, a page at a time, served from the content catalog
+    return await catalog_response(request, "reading", limit=limit, after=decode_cursor(cursor))
 
 
 @router.get("/speaking")
 async def get_speaking_practice(
-    db: Annotated[AsyncSession, Depends(get_session)],
+    request: Request,
     limit: Annotated[int, Query(ge=1, le=50)] = 10,
+    cursor: Annotated[str | None, Query(description="nextCursor of the previous page")] = None,
     question_type: Annotated[
         str | None,
         Query(
@@ -66,19 +52,17 @@ async def get_speaking_practice(
     """
     Get speaking practice questions
     """
-    # Get speaking questions
-    questions = await PracticeCrud.get_speaking_questions(db, limit=limit, question_type=question_type)
-
-    # Convert to response format
-    question_responses = [convert_speaking_question_to_response(question) for question in questions]
-
-    return {"success": True, "data": {"questions": question_responses}}
+    # Speaking questions, a page at a time, served from the content catalog
+    return await catalog_response(
+        request, "speaking", limit=limit, question_type=question_type, after=decode_cursor(cursor)
+    )
 
 
 @router.get("/writing")
 async def get_writing_practice(
-    db: Annotated[AsyncSession, Depends(get_session)],
+    request: Request,
     limit: Annotated[int, Query(ge=1, le=50)] = 10,
+    cursor: Annotated[str | None, Query(description="nextCursor of the previous page")] = None,
     question_type: Annotated[
         str | None,
         Query(
@@ -89,10 +73,7 @@ async def get_writing_practice(
     """
     Get writing practice questions
     """
-    # Get writing prompts
-    prompts = await PracticeCrud.get_writing_prompts(db, limit=limit, question_type=question_type)
-
-    # Convert to response format
-    prompt_responses = [convert_writing_prompt_to_response(prompt) for prompt in prompts]
-
-    return {"success": True, "data": {"prompts": prompt_responses}}
+    # Writing prompts, a page at a time, served from the content catalog
+    return await catalog_response(
+        request, "writing", limit=limit, question_type=question_type, after=decode_cursor(cursor)
+    )
@@ -1,13 +1,19 @@
+from datetime import datetime
 from typing import Annotated
+from zoneinfo import ZoneInfo
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.common.utils.cache import user_data_cache, user_data_key
+from app.common.utils.http import check_etag, make_etag
 from app.common.utils.level import calculate_level_progress
+from app.common.utils.pagination import decode_cursor, encode_cursor
 from app.common.utils.user_activity import convert_user_activity_to_response, convert_user_activity_to_submit_response
 from app.common.utils.user_analytics import convert_analytics_to_response
 from app.core.depends.get_current_user import get_current_user
-from app.core.depends.get_session import get_session
+from app.core.depends.get_session import get_read_session, get_session
+from app.core.depends.get_time_zone import get_time_zone
 from app.crud.user import UserCrud
 from app.crud.user_activity import UserActivityCrud
 from app.crud.user_analytics import UserAnalyticsCrud
@@ -139,25 +145,31 @@ async def submit_practice_session(
 @router.get("/activities")
 async def get_user_activities(
     current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_session)],
+    db: Annotated[AsyncSession, Depends(get_read_session)],
     limit: Annotated[int, Query(ge=1, le=100)] = 50,
+    cursor: Annotated[str | None, Query(description="nextCursor of the previous page")] = None,
 ):
     """
     Get user's activities
     """
-    # Get user activities
-    user_activities = await UserActivityCrud.get_user_activities(db, current_user.id, limit=limit)
+    # Get a page of user activities
+    user_activities, next_after = await UserActivityCrud.get_user_activities(
+        db, current_user.id, limit=limit, after=decode_cursor(cursor)
+    )
 
     # Convert to response format
     activity_responses = [convert_user_activity_to_response(activity) for activity in user_activities]
 
-    return {"success": True, "data": activity_responses}
+    return {"success": True, "data": activity_responses, "nextCursor": encode_cursor(next_after)}
 
 
 @router.get("/analytics")
 async def get_user_analytics(
+    request: Request,
+    response: Response,
     current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_session)],
+    db: Annotated[AsyncSession, Depends(get_read_session)],
+    tz: Annotated[str, Depends(get_time_zone)],
     time_range: Annotated[str, Query(description="Time range: all, 7d, 30d, 90d")] = "all",
     practice_type: Annotated[str, Query(description="Practice type: both, mockTest, practice")] = "both",
 ):
@@ -180,15 +192,25 @@ async def get_user_analytics(
             detail=f"Invalid practiceType. Must be one of: {', '.join(valid_practice_types)}",
         )
 
-    # Get analytics data
-    analytics_data = await UserAnalyticsCrud.get_user_analytics(
-        db=db,
-        user_id=current_user.id,
-        time_range=time_range,
-        practice_type=practice_type,
-    )
+    # Time windows and streaks move with the local day, so it is part of the key next to the data version
+    data_version = await UserCrud.get_data_version(db, current_user.id)
+    today = datetime.now(ZoneInfo(tz)).date()
+    cache_key = user_data_key("analytics", current_user.id, data_version, tz, today, time_range, practice_type)
+    not_modified = check_etag(request, response, make_etag(cache_key))
+    if not_modified is not None:
+        return not_modified
+
+    async def load():
+        analytics_data = await UserAnalyticsCrud.get_user_analytics(
+            db=db,
+            user_id=current_user.id,
+            time_range=time_range,
+            practice_type=practice_type,
+            tz=tz,
+        )
+        return convert_analytics_to_response(analytics_data)
 
-    # Convert to response format
-    analytics_response = convert_analytics_to_response(analytics_data)
+    # Concurrent misses for the same key share one computation
+    analytics_response = await user_data_cache.get_or_load(cache_key, load)
 
     return {"success": True, "data": analytics_response}
@@ -1,16 +1,20 @@
 import uuid
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.common.utils.cache import user_data_cache, user_data_key
+from app.common.utils.http import check_etag, make_etag
+from app.common.utils.pagination import decode_cursor, encode_cursor
 from app.common.utils.vocabulary import (
     convert_vocabulary_to_added_response,
     convert_vocabulary_to_response,
     convert_vocabulary_to_update_response,
 )
 from app.core.depends.get_current_user import get_current_user
-from app.core.depends.get_session import get_session
+from app.core.depends.get_session import get_read_session, get_session
+from app.crud.user import UserCrud
 from app.crud.vocabulary import VocabularyCrud
 from app.model.model import User
 from app.schema.vocabulary import AddVocabularyRequest, UpdateVocabularyRequest
@@ -23,20 +27,34 @@ router = APIRouter(
 
 @router.get("")
 async def get_user_vocabulary(
+    request: Request,
+    response: Response,
     current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_session)],
+    db: Annotated[AsyncSession, Depends(get_read_session)],
     limit: Annotated[int, Query(ge=1, le=200)] = 100,
+    cursor: Annotated[str | None, Query(description="nextCursor of the previous page")] = None,
 ):
     """
     Get user's vocabulary list
     """
-    # Get user vocabulary
-    vocabulary_list = await VocabularyCrud.get_user_vocabulary(db, current_user.id, limit=limit)
-
-    # Convert to response format
-    vocabulary_responses = [convert_vocabulary_to_response(vocab) for vocab in vocabulary_list]
+    after = decode_cursor(cursor)
+    data_version = await UserCrud.get_data_version(db, current_user.id)
+    cache_key = user_data_key("vocabulary", current_user.id, data_version, limit, cursor or "")
+    not_modified = check_etag(request, response, make_etag(cache_key))
+    if not_modified is not None:
+        return not_modified
+
+    async def load():
+        vocabulary_list, next_after = await VocabularyCrud.get_user_vocabulary(
+            db, current_user.id, limit=limit, after=after
+        )
+        return {
+            "success": True,
+            "data": [convert_vocabulary_to_response(vocab) for vocab in vocabulary_list],
+            "nextCursor": encode_cursor(next_after),
+        }
 
-    return {"success": True, "data": vocabulary_responses}
+    return await user_data_cache.get_or_load(cache_key, load)
 
 
 @router.post("")
@@ -0,0 +1,53 @@
+"""Rebuild the activity rollup tables from user_activities.
+
+Usage:
+    python -m app.commands.rollups stats                   # lifetime totals, every user
+    python -m app.commands.rollups daily --user-id <id>    # daily totals of a single user
+    python -m app.commands.rollups all --since 2025-01-01  # repair recent days (lifetime totals in full)
+"""
+
+import argparse
+import asyncio
+import uuid
+from datetime import date
+
+from app import init_database
+from app.crud.user_stats import UserStatsCrud
+from app.setup.database import sessionmanager
+
+
+async def rebuild_stats(user_id: uuid.UUID | None) -> int:
+    async with sessionmanager.session() as db:
+        return await UserStatsCrud.rebuild(db, user_id)
+
+
+async def rebuild_daily(user_id: uuid.UUID | None, since: date | None) -> int:
+    async with sessionmanager.session() as db:
+        return await UserStatsCrud.rebuild_daily(db, user_id, since)
+
+
+async def main(args: argparse.Namespace) -> None:
+    init_database()
+    try:
+        if args.table in ("stats", "all"):
+            rows = await rebuild_stats(args.user_id)
+            print(f"Rebuilt {rows} user_stats rows")
+        if args.table in ("daily", "all"):
+            rows = await rebuild_daily(args.user_id, args.since)
+            print(f"Rebuilt {rows} user_daily_activity rows")
+    finally:
+        await sessionmanager.close()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("table", choices=["stats", "daily", "all"], help="Rollup to rebuild")
+    parser.add_argument("--user-id", type=uuid.UUID, default=None, help="Only rebuild this user's rows")
+    parser.add_argument(
+        "--since", type=date.fromisoformat, default=None, help="Only rebuild daily rows from this UTC day (YYYY-MM-DD)"
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
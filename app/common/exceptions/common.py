@@ -7,3 +7,21 @@ class UniqueViolationField(HTTPException):
 
     def __init__(self) -> None:
         super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail="Unique constraint violation")
+
+
+class RateLimitExceeded(HTTPException):
+    """Exception to be raised when a client exceeds a rate limit."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests, please try again later",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class InvalidCursor(HTTPException):
+    """Exception to be raised when a pagination cursor cannot be decoded."""
+
+    def __init__(self) -> None:
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
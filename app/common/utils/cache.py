@@ -1,45 +1,227 @@
 import asyncio
-from datetime import datetime, timedelta, timezone
-from typing import Any, Optional
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional, Union
 
+from app.common.utils.redis import RedisClient
+from app.common.utils.shared_cache import RedisCacheStore, SharedCache, SqliteCacheStore
+from app.core.config import SETTINGS
 
-class SimpleCache:
-    """Simple in-memory cache for analytics data"""
+_MISSING = object()
 
-    def __init__(self):
-        self._cache = {}
-        self._lock = asyncio.Lock()
 
-    async def get(self, key: str) -> Optional[Any]:
+class _Shard:
+    __slots__ = ("entries", "lock", "loading")
+
+    def __init__(self) -> None:
+        self.entries: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        self.lock = asyncio.Lock()
+        self.loading: dict[Hashable, asyncio.Future] = {}
+
+
+class BoundedCache:
+    """
+    Bounded in-memory cache with per-entry TTLs for async callers.
+
+    Keys are spread over shards, each with its own lock and its own share of the entry budget, evicting the least
+    recently used entry when full. ``get_or_load`` coalesces concurrent misses for a key into a single load.
+    Expired entries are dropped on access and by ``cleanup_expired``, which the app runs periodically.
+    """
+
+    def __init__(self, max_entries: int, default_ttl_seconds: float, shards: int = 16):
+        self._shards = [_Shard() for _ in range(shards)]
+        self._max_entries_per_shard = max(1, -(-max_entries // shards))
+        self._default_ttl_seconds = default_ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.coalesced_loads = 0
+
+    def _shard(self, key: Hashable) -> _Shard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def _lookup(self, shard: _Shard, key: Hashable) -> Any:
+        item = shard.entries.get(key)
+        if item is not None:
+            value, expiry = item
+            if time.monotonic() < expiry:
+                shard.entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del shard.entries[key]
+            self.expirations += 1
+        self.misses += 1
+        return _MISSING
+
+    def _store(self, shard: _Shard, key: Hashable, value: Any, ttl_seconds: Optional[float]) -> None:
+        ttl = self._default_ttl_seconds if ttl_seconds is None else ttl_seconds
+        shard.entries[key] = (value, time.monotonic() + ttl)
+        shard.entries.move_to_end(key)
+        while len(shard.entries) > self._max_entries_per_shard:
+            shard.entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get(self, key: Hashable) -> Optional[Any]:
         """Get value from cache if not expired"""
-        async with self._lock:
-            if key in self._cache:
-                value, expiry = self._cache[key]
-                if datetime.now(timezone.utc) < expiry:
-                    return value
-                else:
-                    del self._cache[key]
-            return None
+        shard = self._shard(key)
+        async with shard.lock:
+            value = self._lookup(shard, key)
+        return None if value is _MISSING else value
+
+    async def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Set value in cache with TTL (the cache default when omitted)"""
+        shard = self._shard(key)
+        async with shard.lock:
+            self._store(shard, key, value, ttl_seconds)
+
+    async def get_or_load(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl_seconds: Optional[float] = None
+    ) -> Any:
+        """Get value from cache, or load and cache it; concurrent callers for the same key share one load"""
+        shard = self._shard(key)
+        async with shard.lock:
+            value = self._lookup(shard, key)
+            if value is not _MISSING:
+                return value
+            future = shard.loading.get(key)
+            owner = future is None
+            if owner:
+                future = asyncio.get_running_loop().create_future()
+                shard.loading[key] = future
+            else:
+                self.coalesced_loads += 1
 
-    async def set(self, key: str, value: Any, ttl_seconds: int = 300) -> None:
-        """Set value in cache with TTL"""
-        async with self._lock:
-            expiry = datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds)
-            self._cache[key] = (value, expiry)
+        if not owner:
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The loading request went away; load on behalf of this one instead
+                return await self.get_or_load(key, loader, ttl_seconds)
+
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark the exception as retrieved in case nobody was waiting
+            future.exception()
+            raise
+        else:
+            await self.set(key, value, ttl_seconds)
+            future.set_result(value)
+            return value
+        finally:
+            shard.loading.pop(key, None)
+
+    async def invalidate(self, key: Hashable) -> None:
+        """Remove a single entry"""
+        shard = self._shard(key)
+        async with shard.lock:
+            shard.entries.pop(key, None)
 
     async def clear(self) -> None:
         """Clear all cache entries"""
-        async with self._lock:
-            self._cache.clear()
+        for shard in self._shards:
+            async with shard.lock:
+                shard.entries.clear()
+
+    async def cleanup_expired(self) -> int:
+        """Remove expired entries, returning how many were removed"""
+        removed = 0
+        for shard in self._shards:
+            async with shard.lock:
+                now = time.monotonic()
+                expired_keys = [key for key, (_, expiry) in shard.entries.items() if now >= expiry]
+                for key in expired_keys:
+                    del shard.entries[key]
+                removed += len(expired_keys)
+        self.expirations += removed
+        return removed
+
+    def stats(self) -> dict[str, int]:
+        """Counters since startup and the current number of entries"""
+        return {
+            "entries": sum(len(shard.entries) for shard in self._shards),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "coalescedLoads": self.coalesced_loads,
+        }
+
+
+class LRUCache:
+    """Bounded in-memory LRU cache with a fixed TTL, for synchronous lookups on the event loop"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self._cache: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get value from cache if not expired, marking it as recently used"""
+        item = self._cache.get(key)
+        if item is None:
+            return None
+        value, expiry = item
+        if time.monotonic() >= expiry:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Set value in cache, evicting the least recently used entry when full"""
+        self._cache[key] = (value, time.monotonic() + self._ttl_seconds)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._max_entries:
+            self._cache.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove a single entry"""
+        self._cache.pop(key, None)
+
+    def clear(self) -> None:
+        """Clear all cache entries"""
+        self._cache.clear()
+
+
+def create_cache(name: str, max_entries: int, default_ttl_seconds: float) -> Union[BoundedCache, SharedCache]:
+    """Build a cache on the backend selected by CACHE_BACKEND (memory, local or redis)"""
+    if SETTINGS.CACHE_BACKEND == "local":
+        directory = SETTINGS.CACHE_LOCAL_DIR or ("/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir())
+        store = SqliteCacheStore(os.path.join(directory, f"{name}.cache.sqlite3"), max_entries=max_entries)
+        return SharedCache(name, store, default_ttl_seconds)
+    if SETTINGS.CACHE_BACKEND == "redis":
+        if not SETTINGS.REDIS_URL:
+            raise RuntimeError("REDIS_URL is required for the redis cache backend.")
+        store = RedisCacheStore(RedisClient.from_url(SETTINGS.REDIS_URL), prefix=f"cache:{name}:")
+        return SharedCache(name, store, default_ttl_seconds)
+    return BoundedCache(max_entries=max_entries, default_ttl_seconds=default_ttl_seconds)
+
+
+def user_data_key(kind: str, user_id: Any, data_version: int, *params: Any) -> str:
+    """Cache key of a per-user response; a write bumps the data version, so stale entries are never read again"""
+    return ":".join([kind, str(user_id), str(data_version), *(str(param) for param in params)])
 
-    async def cleanup_expired(self) -> None:
-        """Remove expired entries"""
-        async with self._lock:
-            current_time = datetime.now(timezone.utc)
-            expired_keys = [key for key, (_, expiry) in self._cache.items() if current_time >= expiry]
-            for key in expired_keys:
-                del self._cache[key]
 
+# Global cache instances
 
-# Global cache instance
-analytics_cache = SimpleCache()
+# Per-user read responses (dashboard, analytics, vocabulary), keyed by the user's data version
+user_data_cache = create_cache(
+    "user-data",
+    max_entries=SETTINGS.USER_DATA_CACHE_MAX_ENTRIES,
+    default_ttl_seconds=SETTINGS.USER_DATA_CACHE_TTL_SECONDS,
+)
+# Authenticated users by id, read by get_current_user and invalidated by UserCrud writes
+principal_cache = LRUCache(
+    max_entries=SETTINGS.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=SETTINGS.PRINCIPAL_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,208 @@
+"""Read-through cache of the practice and mock test catalog, as serialized response bodies.
+
+Usage:
+    response = await catalog_response(request, "listening", limit=limit, after=decode_cursor(cursor))
+
+Passages, practice questions and mock tests are editorial content that rarely changes, so the responses built from
+them are cached as the JSON bytes sent to the client, keyed by the content version and the request parameters.
+Each body carries a strong ETag of its bytes, so a client revalidating with If-None-Match gets a 304 from memory, and
+a ``Cache-Control`` header from ``CONTENT_HTTP_CACHE_CONTROL`` lets clients and CDNs reuse it in between.
+
+Triggers on the content tables bump ``content_version`` and notify the invalidation bus with the new version, which
+clears the cache in every worker. While the bus is listening a hit does not touch the database; while it is not
+(disconnected, or disabled with ``CACHE_INVALIDATION_ENABLED=False``), each request reads the version (a primary key
+lookup) so a missed notification cannot serve stale content. Versions and
+misses are read from the primary: a replica may not have replayed the change a notification announces yet.
+"""
+
+from __future__ import annotations
+
+import logging
+import uuid
+from typing import Any, Awaitable, Callable, NamedTuple, Optional
+
+from fastapi import Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.common.utils.cache import BoundedCache
+from app.common.utils.http import etag_matches, make_strong_etag
+from app.common.utils.mock_test import convert_mock_test_to_response
+from app.common.utils.pagination import Cursor, encode_cursor
+from app.common.utils.practice import (
+    convert_passage_to_response,
+    convert_reading_passage_to_response,
+    convert_speaking_question_to_response,
+    convert_writing_prompt_to_response,
+)
+from app.common.utils.shared_cache import encode_value
+from app.core.config import SETTINGS
+from app.crud.content import ContentCrud
+from app.crud.mock_test import MockTestCrud
+from app.crud.practice import PracticeCrud
+from app.setup.database import sessionmanager
+from app.setup.invalidation import invalidation_bus
+
+logger = logging.getLogger(__name__)
+
+
+async def _load_listening(db: AsyncSession, limit: int, after: Optional[Cursor]) -> dict[str, Any]:
+    passages, next_after = await PracticeCrud.get_passages_with_questions(db, "listening", limit=limit, after=after)
+    return {
+        "success": True,
+        "data": {"passages": [convert_passage_to_response(passage) for passage in passages]},
+        "nextCursor": encode_cursor(next_after),
+    }
+
+
+async def _load_reading(db: AsyncSession, limit: int, after: Optional[Cursor]) -> dict[str, Any]:
+    passages, next_after = await PracticeCrud.get_passages_with_questions(db, "reading", limit=limit, after=after)
+    return {
+        "success": True,
+        "data": {"passages": [convert_reading_passage_to_response(passage) for passage in passages]},
+        "nextCursor": encode_cursor(next_after),
+    }
+
+
+async def _load_speaking(
+    db: AsyncSession, limit: int, question_type: Optional[str], after: Optional[Cursor]
+) -> dict[str, Any]:
+    questions, next_after = await PracticeCrud.get_speaking_questions(
+        db, limit=limit, question_type=question_type, after=after
+    )
+    return {
+        "success": True,
+        "data": {"questions": [convert_speaking_question_to_response(question) for question in questions]},
+        "nextCursor": encode_cursor(next_after),
+    }
+
+
+async def _load_writing(
+    db: AsyncSession, limit: int, question_type: Optional[str], after: Optional[Cursor]
+) -> dict[str, Any]:
+    prompts, next_after = await PracticeCrud.get_writing_prompts(
+        db, limit=limit, question_type=question_type, after=after
+    )
+    return {
+        "success": True,
+        "data": {"prompts": [convert_writing_prompt_to_response(prompt) for prompt in prompts]},
+        "nextCursor": encode_cursor(next_after),
+    }
+
+
+async def _load_mock_tests(db: AsyncSession, limit: int, after: Optional[Cursor]) -> dict[str, Any]:
+    mock_tests, next_after = await MockTestCrud.get_all_mock_tests(db, limit=limit, after=after)
+    return {
+        "success": True,
+        "data": [convert_mock_test_to_response(test) for test in mock_tests],
+        "nextCursor": encode_cursor(next_after),
+    }
+
+
+async def _load_mock_test(db: AsyncSession, test_id: uuid.UUID) -> Optional[dict[str, Any]]:
+    mock_test = await MockTestCrud.get_mock_test_by_id(db, test_id)
+    if mock_test is None:
+        return None
+    return {"success": True, "data": convert_mock_test_to_response(mock_test)}
+
+
+_LOADERS: dict[str, Callable[..., Awaitable[Optional[dict[str, Any]]]]] = {
+    "listening": _load_listening,
+    "reading": _load_reading,
+    "speaking": _load_speaking,
+    "writing": _load_writing,
+    "mock-tests": _load_mock_tests,
+    "mock-test": _load_mock_test,
+}
+
+# The first pages with the endpoint defaults, loaded at startup
+_WARMUP: list[tuple[str, dict[str, Any]]] = [
+    ("listening", {"limit": 10, "after": None}),
+    ("reading", {"limit": 10, "after": None}),
+    ("speaking", {"limit": 10, "question_type": None, "after": None}),
+    ("writing", {"limit": 10, "question_type": None, "after": None}),
+    ("mock-tests", {"limit": 50, "after": None}),
+]
+
+
+class CatalogEntry(NamedTuple):
+    body: bytes
+    etag: str
+
+
+class ContentCatalog:
+    """
+    Serialized catalog responses for the content version this worker last saw.
+
+    Entries are keyed by that version, so advancing it makes every older entry unreachable even if a load that
+    started before the change finishes after it. Forgetting the version (when notifications may have been missed)
+    keeps the entries: they are served again once the database confirms their version is still current.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self._cache = BoundedCache(max_entries=max_entries, default_ttl_seconds=ttl_seconds)
+        self._version = -1
+        self._version_known = False
+
+    async def get(self, kind: str, **params: Any) -> Optional[CatalogEntry]:
+        """Get the JSON body and ETag of a catalog response (None when the item does not exist), loading on a miss"""
+        if not SETTINGS.CONTENT_CACHE_ENABLED:
+            return await self._load(kind, params)
+        if not self._version_known or not invalidation_bus.listening:
+            async with sessionmanager.session() as db:
+                await self.advance(await ContentCrud.get_content_version(db))
+        key = (self._version, kind, *sorted(params.items()))
+        return await self._cache.get_or_load(key, lambda: self._load(kind, params))
+
+    @staticmethod
+    async def _load(kind: str, params: dict[str, Any]) -> Optional[CatalogEntry]:
+        async with sessionmanager.session() as db:
+            body = await _LOADERS[kind](db, **params)
+        if body is None:
+            return None
+        data = encode_value(body)
+        return CatalogEntry(data, make_strong_etag(data))
+
+    async def advance(self, version: int) -> None:
+        """Record the current content version, dropping the entries of older ones"""
+        if version > self._version:
+            await self._cache.clear()
+            self._version = version
+        self._version_known = True
+
+    def forget_version(self) -> None:
+        """Make the next request read the content version from the database"""
+        self._version_known = False
+
+    async def warm(self) -> None:
+        """Load the responses for the endpoint defaults; failures are logged, the endpoints load on demand"""
+        try:
+            for kind, params in _WARMUP:
+                await self.get(kind, **params)
+        except Exception:
+            logger.exception("Could not warm the content catalog")
+
+    def stats(self) -> dict[str, Any]:
+        """Counters since startup, the current number of entries and the content version"""
+        return {**self._cache.stats(), "version": self._version, "versionKnown": self._version_known}
+
+
+content_catalog = ContentCatalog(
+    max_entries=SETTINGS.CONTENT_CACHE_MAX_ENTRIES,
+    ttl_seconds=SETTINGS.CONTENT_CACHE_TTL_SECONDS,
+)
+
+
+async def catalog_response(request: Request, kind: str, **params: Any) -> Optional[Response]:
+    """
+    Build the response for a catalog request: the cached body, or a 304 when the client's copy is current.
+    Returns None when the item does not exist.
+    """
+    entry = await content_catalog.get(kind, **params)
+    if entry is None:
+        return None
+    cache_controls = SETTINGS.CONTENT_HTTP_CACHE_CONTROL
+    cache_control = cache_controls.get(kind) or cache_controls.get("default", "no-cache")
+    headers = {"ETag": entry.etag, "Cache-Control": cache_control}
+    if etag_matches(request, entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
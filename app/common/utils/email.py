@@ -3,31 +3,33 @@
 Usage:
     from app.common.utils.email import send_email
     await send_email(to_email="user@example.com", subject="Hello", body="Hi")
+
+Request handlers should use ``email_dispatcher.enqueue(...)`` instead, which returns once the message is queued and
+leaves delivery to background workers that keep their SMTP sessions open between messages.
 """
 
 from __future__ import annotations
 
 import asyncio
+import logging
 import smtplib
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from app.core.config import SETTINGS
 
+logger = logging.getLogger(__name__)
 
-def _send_email_sync(
-    to_email: str,
-    subject: str,
-    body: str,
-) -> None:
-    host = SETTINGS.SMTP_HOST
-    port = SETTINGS.SMTP_PORT
-    username = SETTINGS.SMTP_USERNAME
-    password = SETTINGS.SMTP_PASSWORD
-    use_tls = SETTINGS.SMTP_USE_TLS
-    from_email = SETTINGS.SMTP_FROM_EMAIL or (username or "")
-    from_name = SETTINGS.SMTP_FROM_NAME
 
-    if not host or not port or not from_email:
+def _sender_address() -> str:
+    from_email = SETTINGS.SMTP_FROM_EMAIL or (SETTINGS.SMTP_USERNAME or "")
+    if not SETTINGS.SMTP_HOST or not SETTINGS.SMTP_PORT or not from_email:
         raise RuntimeError("SMTP settings are not configured properly.")
+    return from_email
+
+
+def _build_message(from_email: str, to_email: str, subject: str, body: str) -> str:
+    from_name = SETTINGS.SMTP_FROM_NAME
 
     # Minimal RFC2822 text message with headers
     from_header = f"{from_name} <{from_email}>" if from_name else from_email
@@ -39,15 +41,33 @@ def _send_email_sync(
         "Content-Type: text/plain; charset=utf-8",
         "Content-Transfer-Encoding: 8bit",
     ]
-    message = "\r\n".join(headers) + "\r\n\r\n" + (body or "")
+    return "\r\n".join(headers) + "\r\n\r\n" + (body or "")
 
-    with smtplib.SMTP(host, port) as server:
+
+def _open_connection(timeout: float | None = None) -> smtplib.SMTP:
+    server = smtplib.SMTP(SETTINGS.SMTP_HOST, SETTINGS.SMTP_PORT, timeout=timeout)
+    try:
         server.ehlo()
-        if use_tls:
+        if SETTINGS.SMTP_USE_TLS:
             server.starttls()
             server.ehlo()
-        if username and password:
-            server.login(username, password)
+        if SETTINGS.SMTP_USERNAME and SETTINGS.SMTP_PASSWORD:
+            server.login(SETTINGS.SMTP_USERNAME, SETTINGS.SMTP_PASSWORD)
+    except BaseException:
+        server.close()
+        raise
+    return server
+
+
+def _send_email_sync(
+    to_email: str,
+    subject: str,
+    body: str,
+) -> None:
+    from_email = _sender_address()
+    message = _build_message(from_email, to_email, subject, body)
+
+    with _open_connection() as server:
         server.sendmail(from_email, [to_email], message)
 
 
@@ -65,3 +85,160 @@ async def send_email(
         subject,
         body,
     )
+
+
+class _PooledConnection:
+    """
+    One authenticated SMTP session reused across messages.
+
+    Only ever used from a single worker thread at a time.
+    """
+
+    def __init__(self, timeout: float, max_idle_seconds: float):
+        self._server: smtplib.SMTP | None = None
+        self._last_used = 0.0
+        self._timeout = timeout
+        self._max_idle_seconds = max_idle_seconds
+
+    def send(self, to_email: str, subject: str, body: str) -> None:
+        from_email = _sender_address()
+        message = _build_message(from_email, to_email, subject, body)
+        # Servers drop idle sessions on their own; reconnecting up front is cheaper than a failed send
+        if self._server is not None and time.monotonic() - self._last_used > self._max_idle_seconds:
+            self.close()
+        if self._server is None:
+            self._server = _open_connection(self._timeout)
+        try:
+            self._server.sendmail(from_email, [to_email], message)
+        except (smtplib.SMTPServerDisconnected, OSError):
+            # The session is unusable, so the retry gets a fresh connection
+            self.close()
+            raise
+        self._last_used = time.monotonic()
+
+    def close(self) -> None:
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except Exception:
+            self._server.close()
+        self._server = None
+
+
+class EmailDispatcher:
+    """
+    In-process email queue drained by a fixed number of workers.
+
+    Each worker owns one SMTP session on a dedicated thread, so sending does not compete with the default executor
+    and the TLS handshake and login are paid once per connection rather than once per message. Failed sends are
+    retried with exponential backoff on a fresh connection, and dropped with an error log once the retries run out.
+    """
+
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue[tuple[str, str, str]] | None = None
+        self._workers: list[asyncio.Task] = []
+        self._executor: ThreadPoolExecutor | None = None
+        self._max_retries = 0
+        self._retry_backoff_seconds = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._queue is not None
+
+    async def start(
+        self,
+        *,
+        pool_size: int,
+        queue_size: int,
+        max_retries: int,
+        retry_backoff_seconds: float,
+        timeout_seconds: float,
+        max_idle_seconds: float,
+    ) -> None:
+        """Start the workers, each with its own SMTP session"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=queue_size)
+        self._max_retries = max_retries
+        self._retry_backoff_seconds = retry_backoff_seconds
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="smtp")
+        self._workers = [
+            asyncio.create_task(self._work(_PooledConnection(timeout_seconds, max_idle_seconds)))
+            for _ in range(pool_size)
+        ]
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Give queued messages a chance to go out, then stop the workers and close their sessions"""
+        if self._queue is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Dropping %d queued emails on shutdown", self._queue.qsize())
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        self._queue = None
+        self._workers = []
+        self._executor = None
+
+    async def enqueue(self, to_email: str, subject: str, body: str) -> None:
+        """
+        Queue a plain text email, or send it right away when the dispatcher is not running.
+
+        Never waits for the queue: when it is full (a stalled SMTP server) the email is dropped with an error log, so
+        the request that triggered it still returns promptly and the queue does not grow without bound.
+        """
+        if self._queue is None:
+            await send_email(to_email, subject, body)
+            return
+        try:
+            self._queue.put_nowait((to_email, subject, body))
+        except asyncio.QueueFull:
+            logger.error(
+                "Email queue full, dropping email to %s",
+                to_email,
+                extra={"event": "email_queue_full", "subject": subject, "queue_size": self._queue.maxsize},
+            )
+
+    async def _work(self, connection: _PooledConnection) -> None:
+        assert self._queue is not None
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                to_email, subject, body = await self._queue.get()
+                try:
+                    await self._deliver(loop, connection, to_email, subject, body)
+                finally:
+                    self._queue.task_done()
+        finally:
+            await loop.run_in_executor(self._executor, connection.close)
+
+    async def _deliver(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        connection: _PooledConnection,
+        to_email: str,
+        subject: str,
+        body: str,
+    ) -> None:
+        for attempt in range(self._max_retries + 1):
+            try:
+                await loop.run_in_executor(self._executor, connection.send, to_email, subject, body)
+                return
+            except Exception:
+                if attempt == self._max_retries:
+                    logger.exception(
+                        "Giving up on email to %s after %d attempts",
+                        to_email,
+                        attempt + 1,
+                        extra={"event": "email_delivery_failed", "subject": subject},
+                    )
+                    return
+                await asyncio.sleep(self._retry_backoff_seconds * 2**attempt)
+
+
+email_dispatcher = EmailDispatcher()
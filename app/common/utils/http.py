@@ -0,0 +1,38 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts: object) -> str:
+    """Weak ETag derived from the values that determine a response, e.g. the user's data version"""
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def make_strong_etag(body: bytes) -> str:
+    """Strong ETag of a response body, unchanged for as long as the bytes are"""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the client's If-None-Match lists the ETag (weak comparison, as If-None-Match requires)"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+def check_etag(
+    request: Request, response: Response, etag: str, cache_control: str = "private, no-cache"
+) -> Optional[Response]:
+    """
+    Set the ETag on the response and return a 304 response if the client's If-None-Match already matches it.
+    By default clients are told to revalidate every time, which is cheap since it skips the work behind the response.
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    response.headers.update(headers)
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return None
@@ -0,0 +1,144 @@
+"""Run CPU-heavy computations off the event loop once their input is large enough.
+
+Usage:
+    result = await offloader.run("analytics", compute, rows, size=len(rows))
+
+Small inputs are computed inline, where the pool round trip would cost more than the work. Above
+``OFFLOAD_MIN_ROWS`` the call goes to a bounded pool: threads by default, which suits NumPy code that releases the
+GIL, or processes with ``OFFLOAD_EXECUTOR=process`` (the function and its arguments must then be picklable).
+Per computation the time spent waiting for a worker and the time spent computing are recorded separately.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from app.core.config import SETTINGS
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _timed_call(func: Callable[..., T], args: tuple[Any, ...]) -> tuple[T, float, float]:
+    # Runs in the worker; wall clock start so queueing can be measured across processes
+    started_at = time.time()
+    started = time.perf_counter()
+    result = func(*args)
+    return result, started_at, time.perf_counter() - started
+
+
+class OffloadStats:
+    """Counters of one named computation."""
+
+    def __init__(self) -> None:
+        self.inline = 0
+        self.offloaded = 0
+        self.queue_seconds = 0.0
+        self.max_queue_seconds = 0.0
+        self.compute_seconds = 0.0
+        self.max_compute_seconds = 0.0
+
+    def record(self, offloaded: bool, queue_seconds: float, compute_seconds: float) -> None:
+        if offloaded:
+            self.offloaded += 1
+        else:
+            self.inline += 1
+        self.queue_seconds += queue_seconds
+        self.max_queue_seconds = max(self.max_queue_seconds, queue_seconds)
+        self.compute_seconds += compute_seconds
+        self.max_compute_seconds = max(self.max_compute_seconds, compute_seconds)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "inline": self.inline,
+            "offloaded": self.offloaded,
+            "queueMs": round(self.queue_seconds * 1000, 2),
+            "maxQueueMs": round(self.max_queue_seconds * 1000, 2),
+            "computeMs": round(self.compute_seconds * 1000, 2),
+            "maxComputeMs": round(self.max_compute_seconds * 1000, 2),
+        }
+
+
+class Offloader:
+    """
+    A lazily created, bounded executor shared by the computations of this worker.
+
+    At most ``max_workers`` computations run at once; further ones wait in the pool's queue, and that wait is what
+    the queue time measures.
+    """
+
+    def __init__(self) -> None:
+        self._kind = "thread"
+        self._max_workers = 2
+        self._min_rows = 5_000
+        self._executor: Executor | None = None
+        self._stats: dict[str, OffloadStats] = {}
+
+    def configure(self, kind: str, max_workers: int, min_rows: int) -> None:
+        """Select the thread or process pool, its size and the input size above which calls are offloaded"""
+        self._kind = kind
+        self._max_workers = max_workers
+        self._min_rows = min_rows
+
+    async def run(self, name: str, func: Callable[..., T], *args: Any, size: int) -> T:
+        """Compute func(*args), in the pool when size reaches the threshold, recording the timings under name"""
+        stats = self._stats.setdefault(name, OffloadStats())
+        if self._max_workers <= 0 or size < self._min_rows:
+            started = time.perf_counter()
+            result = func(*args)
+            stats.record(False, 0.0, time.perf_counter() - started)
+            return result
+
+        submitted_at = time.time()
+        result, started_at, compute_seconds = await asyncio.get_running_loop().run_in_executor(
+            self._get_executor(), _timed_call, func, args
+        )
+        queue_seconds = max(0.0, started_at - submitted_at)
+        stats.record(True, queue_seconds, compute_seconds)
+        logger.debug(
+            "Offloaded %s (%d rows): queued %.2f ms, computed %.2f ms",
+            name,
+            size,
+            queue_seconds * 1000,
+            compute_seconds * 1000,
+            extra={
+                "event": "offload",
+                "name": name,
+                "size": size,
+                "queue_ms": round(queue_seconds * 1000, 2),
+                "compute_ms": round(compute_seconds * 1000, 2),
+            },
+        )
+        return result
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self._kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="offload")
+        return self._executor
+
+    def shutdown(self) -> None:
+        """Stop the pool, letting running computations finish"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict[str, Any]:
+        """Per computation counters since startup"""
+        return {
+            "executor": self._kind,
+            "maxWorkers": self._max_workers,
+            "minRows": self._min_rows,
+            "computations": {name: stats.as_dict() for name, stats in self._stats.items()},
+        }
+
+
+offloader = Offloader()
+offloader.configure(SETTINGS.OFFLOAD_EXECUTOR, SETTINGS.OFFLOAD_MAX_WORKERS, SETTINGS.OFFLOAD_MIN_ROWS)
@@ -0,0 +1,68 @@
+"""Keyset pagination over (created_at, id), newest first.
+
+Usage:
+    after = decode_cursor(cursor)
+    items, next_after = await VocabularyCrud.get_user_vocabulary(db, user_id, limit=limit, after=after)
+    return {"success": True, "data": [...], "nextCursor": encode_cursor(next_after)}
+
+A page is the rows strictly after the last row of the previous page in (created_at DESC, id DESC) order, so with an
+index ending in (created_at, id) every page is one index range scan however deep the client pages, unlike OFFSET.
+``id`` breaks ties between rows created in the same transaction. One row more than the limit is fetched to tell
+whether there is a next page. Cursors are opaque to clients: base64url encoded JSON of the last row's key.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+from typing import Any, NamedTuple, Optional, Sequence, TypeVar
+
+from sqlalchemy import Select, tuple_
+
+from app.common.exceptions.common import InvalidCursor
+
+T = TypeVar("T")
+
+
+class Cursor(NamedTuple):
+    created_at: datetime
+    id: uuid.UUID
+
+
+def encode_cursor(after: Optional[Cursor]) -> Optional[str]:
+    """Opaque cursor string of a page position (None at the end of the list)"""
+    if after is None:
+        return None
+    data = json.dumps({"c": after.created_at.isoformat(), "i": str(after.id)}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Cursor]:
+    """Page position of a cursor string from encode_cursor (None for the first page); raises InvalidCursor"""
+    if not cursor:
+        return None
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        created_at = datetime.fromisoformat(data["c"])
+        return Cursor(created_at, uuid.UUID(data["i"]))
+    except (binascii.Error, ValueError, TypeError, KeyError) as exc:
+        raise InvalidCursor() from exc
+
+
+def keyset_page(query: Select, model: Any, limit: int, after: Optional[Cursor]) -> Select:
+    """Restrict a query on model to the page after the given position, fetching one extra row"""
+    if after is not None:
+        query = query.where(tuple_(model.created_at, model.id) < tuple_(after.created_at, after.id))
+    return query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+
+
+def split_page(rows: Sequence[T], limit: int) -> tuple[list[T], Optional[Cursor]]:
+    """The rows of a page fetched with keyset_page, and the position of the next page if there is one"""
+    items = list(rows[:limit])
+    if len(rows) <= limit:
+        return items, None
+    last = items[-1]
+    return items, Cursor(last.created_at, last.id)
@@ -26,9 +26,7 @@ def convert_question_to_response(question: PracticeQuestion) -> QuestionResponse
 
 def convert_passage_to_response(passage: Passage) -> PassageResponse:
     """Convert a Passage model with questions to PassageResponse"""
-    questions = []
-    if hasattr(passage, "questions") and passage.questions:
-        questions = [convert_question_to_response(q) for q in passage.questions]
+    questions = [convert_question_to_response(q) for q in passage.questions]
 
     return PassageResponse(
         id=passage.id,
@@ -40,9 +38,7 @@ def convert_passage_to_response(passage: Passage) -> PassageResponse:
 
 def convert_reading_passage_to_response(passage: Passage) -> ReadingPassageResponse:
     """Convert a Passage model with questions to ReadingPassageResponse"""
-    questions = []
-    if hasattr(passage, "questions") and passage.questions:
-        questions = [convert_question_to_response(q) for q in passage.questions]
+    questions = [convert_question_to_response(q) for q in passage.questions]
 
     return ReadingPassageResponse(
         id=passage.id,
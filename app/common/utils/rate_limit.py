@@ -0,0 +1,144 @@
+"""Token-bucket rate limiting for request handlers.
+
+Usage:
+    @router.post("/login")
+    async def login(payload: Annotated[LoginRequest, Depends(login_rate_limit)]): ...
+
+Buckets live in process memory by default. With ``RATE_LIMIT_BACKEND=redis`` they are kept in Redis and updated by
+a Lua script, so the limits hold across workers. When Redis fails, the limiter falls back to the in-process buckets
+and only tries Redis again after ``RATE_LIMIT_BACKEND_RETRY_SECONDS``.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import time
+
+from app.common.utils.redis import RedisClient
+from app.core.config import SETTINGS
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryTokenBucketBackend:
+    """Buckets in a dict of key -> (tokens, updated_at); only valid within one process."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._max_keys = max_keys
+
+    async def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        """Take one token and return 0, or the seconds until one is available"""
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+        if tokens < 1:
+            self._buckets[key] = (tokens, now)
+            return (1 - tokens) / refill_per_second
+        if key not in self._buckets and len(self._buckets) >= self._max_keys:
+            self._prune(now, refill_per_second, capacity)
+        self._buckets[key] = (tokens - 1, now)
+        return 0.0
+
+    def _prune(self, now: float, refill_per_second: float, capacity: int) -> None:
+        # A bucket that has refilled completely carries no state
+        full_after = capacity / refill_per_second
+        self._buckets = {key: value for key, value in self._buckets.items() if now - value[1] < full_after}
+
+
+# KEYS[1] bucket key; ARGV capacity, refill per second. Uses the server clock so workers agree on time.
+_TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate)
+local wait = 0
+if tokens < 1 then
+  wait = (1 - tokens) / rate
+else
+  tokens = tokens - 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisTokenBucketBackend:
+    """Buckets shared by every worker through Redis."""
+
+    def __init__(self, client: RedisClient, prefix: str = "rate_limit:"):
+        self._client = client
+        self._prefix = prefix
+
+    async def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        """Take one token and return 0, or the seconds until one is available"""
+        wait = await self._client.execute("EVAL", _TAKE_SCRIPT, 1, self._prefix + key, capacity, refill_per_second)
+        return float(wait)
+
+
+class RateLimiter:
+    """
+    Checks requests against named token buckets on the configured backend.
+
+    A failing shared backend opens a circuit: requests use the in-process buckets without touching it until the retry
+    delay has passed, then a single request probes it again. Opening and closing the circuit are logged once each.
+    """
+
+    def __init__(self) -> None:
+        self._memory = MemoryTokenBucketBackend()
+        self._backend: MemoryTokenBucketBackend | RedisTokenBucketBackend = self._memory
+        self._retry_seconds = 30.0
+        self._backend_down = False
+        self._retry_at = 0.0
+
+    def configure(self, backend: str, redis_url: str | None, retry_seconds: float = 30.0) -> None:
+        """Select the memory or redis backend, and how long to bypass the redis backend after it failed"""
+        self._retry_seconds = retry_seconds
+        self._backend_down = False
+        self._retry_at = 0.0
+        if backend == "redis":
+            if not redis_url:
+                raise RuntimeError("REDIS_URL is required for the redis rate limit backend.")
+            self._backend = RedisTokenBucketBackend(RedisClient.from_url(redis_url))
+        else:
+            self._backend = self._memory
+
+    async def hit(self, key: str, limit: int, period_seconds: float) -> int:
+        """Count one request against the bucket; return 0, or the whole seconds to wait when over the limit"""
+        refill_per_second = limit / period_seconds
+        if self._backend is self._memory:
+            return math.ceil(await self._memory.take(key, limit, refill_per_second))
+
+        if self._backend_down:
+            now = time.monotonic()
+            if now < self._retry_at:
+                return math.ceil(await self._memory.take(key, limit, refill_per_second))
+            # Let this request probe the backend while the others keep bypassing it
+            self._retry_at = now + self._retry_seconds
+
+        try:
+            wait = await self._backend.take(key, limit, refill_per_second)
+        except Exception:
+            # Fail open on the shared backend but keep limiting within this process
+            if not self._backend_down:
+                logger.exception(
+                    "Rate limit backend unavailable, using the in-process buckets for %.0f s", self._retry_seconds
+                )
+                self._backend_down = True
+            self._retry_at = time.monotonic() + self._retry_seconds
+            wait = await self._memory.take(key, limit, refill_per_second)
+        else:
+            if self._backend_down:
+                logger.info("Rate limit backend available again")
+                self._backend_down = False
+        return math.ceil(wait)
+
+
+rate_limiter = RateLimiter()
+rate_limiter.configure(SETTINGS.RATE_LIMIT_BACKEND, SETTINGS.REDIS_URL, SETTINGS.RATE_LIMIT_BACKEND_RETRY_SECONDS)
@@ -0,0 +1,145 @@
+"""Minimal asyncio Redis client speaking RESP2, enough for scripted commands.
+
+Usage:
+    client = RedisClient.from_url("redis://localhost:6379/0")
+    await client.execute("SET", "key", "value")
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from urllib.parse import unquote, urlparse
+
+
+class RedisError(Exception):
+    """Error reply returned by the Redis server."""
+
+
+class RedisClient:
+    """
+    A single Redis connection shared by the event loop.
+
+    Commands are serialized with a lock, which keeps the client simple and is plenty for short commands. The
+    connection is opened lazily, dropped whenever a command does not complete normally, and reopened by the next one.
+    Opening happens outside the command lock in a single task that every waiting command shares, so an unreachable
+    server costs the callers one connect timeout together rather than one each in turn.
+    """
+
+    def __init__(self, host: str, port: int, db: int = 0, password: str | None = None, timeout: float = 1.0):
+        self._host = host
+        self._port = port
+        self._db = db
+        self._password = password
+        self._timeout = timeout
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._connecting: asyncio.Task[None] | None = None
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def from_url(cls, url: str, timeout: float = 1.0) -> RedisClient:
+        """Build a client from a redis://[:password@]host[:port][/db] URL"""
+        parsed = urlparse(url)
+        db = int(parsed.path.lstrip("/") or 0)
+        password = unquote(parsed.password) if parsed.password else None
+        return cls(parsed.hostname or "localhost", parsed.port or 6379, db=db, password=password, timeout=timeout)
+
+    async def execute(self, *args: Any) -> Any:
+        """Send one command and return its decoded reply"""
+        if self._writer is None:
+            await self._ensure_connected()
+        async with self._lock:
+            if self._writer is None:
+                # Dropped by a command that failed while this one waited for the lock
+                raise ConnectionError("Redis connection was dropped")
+            try:
+                return await asyncio.wait_for(self._execute(*args), self._timeout)
+            except BaseException:
+                # Whatever interrupted the command (network error, timeout, cancellation, an error reply inside an
+                # array), part of the reply may still be unread; the next command must not read it as its own
+                self._abort()
+                raise
+
+    async def close(self) -> None:
+        if self._connecting is not None:
+            self._connecting.cancel()
+        async with self._lock:
+            await self._disconnect()
+
+    async def _execute(self, *args: Any) -> Any:
+        assert self._reader is not None and self._writer is not None
+        self._writer.write(self._encode(args))
+        await self._writer.drain()
+        return await self._read_reply(self._reader)
+
+    async def _ensure_connected(self) -> None:
+        if self._connecting is None:
+            self._connecting = asyncio.create_task(asyncio.wait_for(self._connect(), self._timeout))
+            self._connecting.add_done_callback(self._connect_done)
+        # A cancelled caller must not cancel the attempt the other callers are waiting on
+        await asyncio.shield(self._connecting)
+
+    def _connect_done(self, task: asyncio.Task[None]) -> None:
+        self._connecting = None
+        if not task.cancelled():
+            # Retrieved here as well, in case every caller waiting on it was cancelled
+            task.exception()
+
+    async def _connect(self) -> None:
+        reader, writer = await asyncio.open_connection(self._host, self._port)
+        try:
+            if self._password:
+                writer.write(self._encode(("AUTH", self._password)))
+                await self._read_reply(reader)
+            if self._db:
+                writer.write(self._encode(("SELECT", self._db)))
+                await self._read_reply(reader)
+        except BaseException:
+            writer.close()
+            raise
+        self._reader, self._writer = reader, writer
+
+    def _abort(self) -> None:
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer is not None:
+            writer.close()
+
+    async def _disconnect(self) -> None:
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    @staticmethod
+    def _encode(args: tuple[Any, ...]) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            value = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(value), value))
+        return b"".join(parts)
+
+    @classmethod
+    async def _read_reply(cls, reader: asyncio.StreamReader) -> Any:
+        line = (await reader.readuntil(b"\r\n"))[:-2]
+        kind, rest = line[:1], line[1:]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            raise RedisError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length < 0:
+                return None
+            return (await reader.readexactly(length + 2))[:-2]
+        if kind == b"*":
+            length = int(rest)
+            if length < 0:
+                return None
+            return [await cls._read_reply(reader) for _ in range(length)]
+        raise RedisError(f"Unexpected reply type {kind!r}")
@@ -0,0 +1,278 @@
+"""Caches shared by every worker process, behind the same API as ``BoundedCache``.
+
+Usage:
+    cache = SharedCache("user-data", SqliteCacheStore("/dev/shm/user-data.cache.sqlite3", max_entries=10_000), 300)
+    value = await cache.get_or_load(key, loader)
+
+Values are stored as JSON, never pickled: pydantic models, UUIDs, decimals and datetimes are encoded the way the
+API would render them, and anything else (ORM instances in particular) is rejected. A cached value therefore comes
+back as plain JSON data, which serializes to the same response body as the original.
+
+Stores:
+    SqliteCacheStore  a SQLite file in shared memory (/dev/shm), for all workers on one host
+    RedisCacheStore   any server speaking the Redis protocol, for workers across hosts
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import date, datetime
+from datetime import time as dt_time
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Optional, Protocol
+
+from pydantic import BaseModel
+
+from app.common.utils.redis import RedisClient
+
+logger = logging.getLogger(__name__)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (datetime, date, dt_time)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"{type(value).__name__} values cannot be stored in a shared cache")
+
+
+def encode_value(value: Any) -> bytes:
+    """Serialize a cache value to JSON bytes"""
+    return json.dumps(value, default=_json_default, separators=(",", ":")).encode()
+
+
+def decode_value(data: bytes) -> Any:
+    """Deserialize a cache value stored by encode_value"""
+    return json.loads(data)
+
+
+class CacheStore(Protocol):
+    """Byte storage with per-entry TTLs used by SharedCache"""
+
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    async def set(self, key: str, data: bytes, ttl_seconds: float) -> None: ...
+
+    async def delete(self, key: str) -> None: ...
+
+    async def clear(self) -> None: ...
+
+    async def cleanup_expired(self) -> int: ...
+
+
+class SqliteCacheStore:
+    """
+    Entries in a SQLite database file that every worker on the host opens.
+
+    Put on ``/dev/shm`` the file lives in memory; WAL mode lets readers proceed while another worker writes.
+    Calls run in a thread so the event loop never blocks on the file lock. Expiry uses the wall clock because the
+    entries are shared between processes.
+    """
+
+    def __init__(self, path: str, max_entries: int):
+        self._path = path
+        self._max_entries = max_entries
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self._path, timeout=1.0, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries (key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                "expires_at REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS ix_cache_entries_expires_at ON cache_entries (expires_at)")
+            self._connection = connection
+        return self._connection
+
+    async def _run(self, func: Callable[[sqlite3.Connection], Any]) -> Any:
+        def call() -> Any:
+            with self._lock:
+                return func(self._connect())
+
+        return await asyncio.to_thread(call)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        row = await self._run(
+            lambda db: db.execute(
+                "SELECT value FROM cache_entries WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        )
+        return row[0] if row is not None else None
+
+    async def set(self, key: str, data: bytes, ttl_seconds: float) -> None:
+        await self._run(
+            lambda db: db.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, data, time.time() + ttl_seconds),
+            )
+        )
+
+    async def delete(self, key: str) -> None:
+        await self._run(lambda db: db.execute("DELETE FROM cache_entries WHERE key = ?", (key,)))
+
+    async def clear(self) -> None:
+        await self._run(lambda db: db.execute("DELETE FROM cache_entries"))
+
+    async def cleanup_expired(self) -> int:
+        def cleanup(db: sqlite3.Connection) -> int:
+            removed = db.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),)).rowcount
+            # Over budget: drop the entries closest to expiry
+            (count,) = db.execute("SELECT COUNT(*) FROM cache_entries").fetchone()
+            if count > self._max_entries:
+                removed += db.execute(
+                    "DELETE FROM cache_entries WHERE key IN "
+                    "(SELECT key FROM cache_entries ORDER BY expires_at LIMIT ?)",
+                    (count - self._max_entries,),
+                ).rowcount
+            return removed
+
+        return await self._run(cleanup)
+
+
+class RedisCacheStore:
+    """Entries as Redis strings under a key prefix, expired by the server"""
+
+    def __init__(self, client: RedisClient, prefix: str):
+        self._client = client
+        self._prefix = prefix
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.execute("GET", self._prefix + key)
+
+    async def set(self, key: str, data: bytes, ttl_seconds: float) -> None:
+        await self._client.execute("SET", self._prefix + key, data, "PX", max(1, int(ttl_seconds * 1000)))
+
+    async def delete(self, key: str) -> None:
+        await self._client.execute("DEL", self._prefix + key)
+
+    async def clear(self) -> None:
+        cursor = b"0"
+        while True:
+            cursor, keys = await self._client.execute("SCAN", cursor, "MATCH", self._prefix + "*", "COUNT", 500)
+            if keys:
+                await self._client.execute("DEL", *keys)
+            if cursor == b"0":
+                break
+
+    async def cleanup_expired(self) -> int:
+        # Redis expires the keys itself
+        return 0
+
+
+class SharedCache:
+    """
+    Cache whose entries live in a store shared between processes.
+
+    Offers the ``BoundedCache`` API. Concurrent misses within a process are coalesced into one load; across
+    processes the first finished load wins. A store that is unreachable counts as a miss, so requests still succeed
+    and merely lose the cache.
+    """
+
+    def __init__(self, name: str, store: CacheStore, default_ttl_seconds: float):
+        self.name = name
+        self._store = store
+        self._default_ttl_seconds = default_ttl_seconds
+        self._loading: dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.coalesced_loads = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Get value from cache if not expired"""
+        try:
+            data = await self._store.get(key)
+        except Exception:
+            self.errors += 1
+            logger.exception("Shared cache %s unavailable, treating %s as a miss", self.name, key)
+            data = None
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return decode_value(data)
+
+    async def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Set value in cache with TTL (the cache default when omitted)"""
+        data = encode_value(value)
+        try:
+            await self._store.set(key, data, self._default_ttl_seconds if ttl_seconds is None else ttl_seconds)
+        except Exception:
+            self.errors += 1
+            logger.exception("Shared cache %s unavailable, %s not stored", self.name, key)
+
+    async def get_or_load(
+        self, key: str, loader: Callable[[], Awaitable[Any]], ttl_seconds: Optional[float] = None
+    ) -> Any:
+        """Get value from cache, or load and cache it; concurrent callers for the same key share one load"""
+        future = self._loading.get(key)
+        if future is not None:
+            self.coalesced_loads += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                return await self.get_or_load(key, loader, ttl_seconds)
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        try:
+            value = await self.get(key)
+            if value is None:
+                # Stored values are JSON, so callers get the same shape on a hit and on a miss
+                value = decode_value(encode_value(await loader()))
+                await self.set(key, value, ttl_seconds)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            self._loading.pop(key, None)
+
+    async def invalidate(self, key: str) -> None:
+        """Remove a single entry"""
+        try:
+            await self._store.delete(key)
+        except Exception:
+            self.errors += 1
+            logger.exception("Shared cache %s unavailable, %s not invalidated", self.name, key)
+
+    async def clear(self) -> None:
+        """Clear all cache entries"""
+        await self._store.clear()
+
+    async def cleanup_expired(self) -> int:
+        """Remove expired entries, returning how many were removed"""
+        return await self._store.cleanup_expired()
+
+    def stats(self) -> dict[str, int]:
+        """Counters of this process since startup"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "coalescedLoads": self.coalesced_loads,
+        }
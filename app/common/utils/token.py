@@ -0,0 +1,132 @@
+"""JWT helpers for the login flow.
+
+With ``AUTH_STATELESS_ENABLED`` the access token is short-lived and carries the profile fields the endpoints read,
+so ``get_current_user`` can trust it without a database lookup. A refresh token is issued next to it and exchanged
+on ``/auth/refresh`` for a new pair built from the current ``users`` row.
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+import jwt  # type: ignore[import-not-found]
+
+from app.core.config import SETTINGS
+from app.model.model import User
+
+ACCESS_TOKEN_TYPE = "access"
+REFRESH_TOKEN_TYPE = "refresh"
+
+
+class RevocationFilter:
+    """
+    Per-user "tokens issued before T are stale" watermarks for stateless access tokens.
+
+    A watermark only matters while access tokens issued before it can still be valid, so entries older than the
+    access token lifetime are pruned and the map stays proportional to the users changed in that window.
+    """
+
+    def __init__(self, retention_seconds: float):
+        self._watermarks: dict[uuid.UUID, float] = {}
+        self._retention_seconds = retention_seconds
+
+    def revoke(self, user_id: uuid.UUID) -> None:
+        """Mark every access token issued for the user until now as stale"""
+        now = time.time()
+        self._watermarks[user_id] = now
+        if len(self._watermarks) > 1_000:
+            cutoff = now - self._retention_seconds
+            self._watermarks = {key: value for key, value in self._watermarks.items() if value > cutoff}
+
+    def is_revoked(self, user_id: uuid.UUID, issued_at: float) -> bool:
+        """Check whether a token issued at the given time predates the user's watermark"""
+        watermark = self._watermarks.get(user_id)
+        return watermark is not None and issued_at <= watermark
+
+
+revocation_filter = RevocationFilter(retention_seconds=SETTINGS.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+
+def _encode(claims: dict[str, Any]) -> str:
+    return jwt.encode(claims, SETTINGS.JWT_SECRET, algorithm=SETTINGS.JWT_ALGORITHM)
+
+
+def _optional_float(value: Any) -> float | None:
+    return float(value) if value is not None else None
+
+
+def create_access_token(user: User) -> str:
+    """Issue the access token returned to the client after login"""
+    now = datetime.now(timezone.utc)
+    if not SETTINGS.AUTH_STATELESS_ENABLED:
+        exp = now + timedelta(minutes=SETTINGS.JWT_EXPIRE_MINUTES)
+        return _encode(
+            {
+                "sub": str(user.id),
+                "email": user.email,
+                "iat": int(now.timestamp()),
+                "exp": int(exp.timestamp()),
+            }
+        )
+
+    exp = now + timedelta(minutes=SETTINGS.ACCESS_TOKEN_EXPIRE_MINUTES)
+    return _encode(
+        {
+            "sub": str(user.id),
+            "typ": ACCESS_TOKEN_TYPE,
+            # Sub-second precision so a token issued right after a change is not caught by its watermark
+            "iat": now.timestamp(),
+            "exp": int(exp.timestamp()),
+            "email": user.email,
+            "name": user.name,
+            "current_score": _optional_float(user.current_score),
+            "target_score": _optional_float(user.target_score),
+            "test_date": user.test_date.isoformat() if user.test_date else None,
+            "has_previous_test": bool(user.has_previous_test),
+            "last_test_score": _optional_float(user.last_test_score),
+            "level": user.level,
+            "xp": user.xp,
+            "created_at": user.created_at.isoformat() if user.created_at else None,
+            "updated_at": user.updated_at.isoformat() if user.updated_at else None,
+        }
+    )
+
+
+def create_refresh_token(user: User) -> str:
+    """Issue the long-lived token exchanged on /auth/refresh for a new access token"""
+    now = datetime.now(timezone.utc)
+    exp = now + timedelta(minutes=SETTINGS.JWT_EXPIRE_MINUTES)
+    return _encode(
+        {
+            "sub": str(user.id),
+            "typ": REFRESH_TOKEN_TYPE,
+            "iat": int(now.timestamp()),
+            "exp": int(exp.timestamp()),
+        }
+    )
+
+
+def decode_token(token: str) -> dict[str, Any]:
+    """Verify the token signature and expiry and return its claims"""
+    return jwt.decode(token, SETTINGS.JWT_SECRET, algorithms=[SETTINGS.JWT_ALGORITHM])
+
+
+def user_from_claims(claims: dict[str, Any]) -> User:
+    """Build a transient (never persisted) User from stateless access token claims"""
+    return User(
+        id=uuid.UUID(claims["sub"]),
+        email=claims["email"],
+        name=claims["name"],
+        current_score=claims["current_score"],
+        target_score=claims["target_score"],
+        test_date=date.fromisoformat(claims["test_date"]) if claims["test_date"] else None,
+        has_previous_test=claims["has_previous_test"],
+        last_test_score=claims["last_test_score"],
+        level=claims["level"],
+        xp=claims["xp"],
+        created_at=datetime.fromisoformat(claims["created_at"]) if claims["created_at"] else None,
+        updated_at=datetime.fromisoformat(claims["updated_at"]) if claims["updated_at"] else None,
+    )
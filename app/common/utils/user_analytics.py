@@ -15,6 +15,7 @@ def convert_analytics_to_response(analytics_data: Dict[str, Any]) -> UserAnalyti
             bestScore=data["bestScore"],
             totalTimeSpent=data["totalTimeSpent"],
             improvementTrend=data["improvementTrend"],
+            improvementSlope=data["improvementSlope"],
         )
 
     return UserAnalyticsResponse(
@@ -1,3 +1,4 @@
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
 
@@ -5,12 +6,38 @@ class Settings(BaseSettings):
     LOG_ENV: str = "CONSOLE"
     LOG_LEVEL: str = "INFO"
     DEBUG: bool = True
+    # Unauthenticated /debug endpoints (pool, slow queries with SQL and plans, caches, offloading); never in production
+    DEBUG_ENDPOINTS_ENABLED: bool = False
 
     POSTGRES_SERVER: str
     POSTGRES_PORT: int
     POSTGRES_DATABASE: str
     POSTGRES_USERNAME: str
     POSTGRES_PASSWORD: str
+    # Read replicas as "host" or "host:port"; same database and credentials as the primary
+    POSTGRES_REPLICA_SERVERS: list[str] = []
+    DB_REPLICA_STRATEGY: str = "round_robin"  # round_robin | least_busy
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    # Connection pool settings
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 10.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_POOL_WARMUP_CONNECTIONS: int = 2
+
+    # Per-request statement accounting (X-DB-Query-Count / X-DB-Time-Ms headers and N+1 warnings)
+    DB_QUERY_STATS_ENABLED: bool = True
+    DB_STATEMENT_BUDGET: int = 20
+    DB_REPEATED_STATEMENT_THRESHOLD: int = 5
+
+    # Slow query log; a sample of slow SELECTs gets an EXPLAIN (ANALYZE, BUFFERS) captured
+    DB_SLOW_QUERY_LOG_ENABLED: bool = False
+    DB_SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    DB_SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.1
+    DB_SLOW_QUERY_RING_SIZE: int = 100
 
     ALLOW_ORIGINS: list[str]
     ALLOW_CREDENTIALS: bool
@@ -25,15 +52,78 @@ class Settings(BaseSettings):
     SMTP_USE_TLS: bool = True
     SMTP_FROM_EMAIL: str | None = None
     SMTP_FROM_NAME: str = "No-Reply"
+    # Background delivery: persistent SMTP sessions, one per worker
+    SMTP_POOL_SIZE: int = Field(default=2, ge=1)
+    SMTP_QUEUE_MAX_SIZE: int = 1000
+    SMTP_MAX_RETRIES: int = 3
+    SMTP_RETRY_BACKOFF_SECONDS: float = 1.0
+    SMTP_TIMEOUT_SECONDS: float = 30.0
+    SMTP_MAX_IDLE_SECONDS: float = 60.0
 
     # OTP/Auth settings
     OTP_LENGTH: int = 6
     OTP_TTL_SECONDS: int = 120
     OTP_RATE_LIMIT_SECONDS: int = 30
+    OTP_PURGE_INTERVAL_SECONDS: float = 300.0  # 0 disables the purge
+    OTP_PURGE_BATCH_SIZE: int = 1000
+
+    # Token-bucket limits on the auth endpoints: N requests per period, per email and per client address
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"  # memory | redis
+    REDIS_URL: str | None = None
+    RATE_LIMIT_BACKEND_RETRY_SECONDS: float = 30.0  # in-process buckets only, for this long after Redis failed
+    RATE_LIMIT_PERIOD_SECONDS: float = 300.0
+    LOGIN_RATE_LIMIT_PER_EMAIL: int = 5
+    LOGIN_RATE_LIMIT_PER_IP: int = 30
+    REGISTER_RATE_LIMIT_PER_EMAIL: int = 5
+    REGISTER_RATE_LIMIT_PER_IP: int = 30
+    VERIFY_OTP_RATE_LIMIT_PER_EMAIL: int = 5
+    VERIFY_OTP_RATE_LIMIT_PER_IP: int = 30
 
     JWT_SECRET: str = "changeme"
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRE_MINUTES: int = 60 * 24 * 7
+    # Stateless mode: short-lived access tokens carry the profile claims, refreshed with a refresh token
+    AUTH_STATELESS_ENABLED: bool = False
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
+
+    # Process-local cache of authenticated users, keyed by the JWT subject
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10_000
+
+    # Where response caches live: memory (per worker), local (SQLite file in CACHE_LOCAL_DIR, /dev/shm by default,
+    # shared by the workers on a host) or redis (REDIS_URL, shared across hosts)
+    CACHE_BACKEND: str = "memory"  # memory | local | redis
+    CACHE_LOCAL_DIR: str | None = None
+
+    # CPU-heavy per-user computations over at least OFFLOAD_MIN_ROWS rows run in a pool instead of on the event loop
+    OFFLOAD_EXECUTOR: str = "thread"  # thread | process
+    OFFLOAD_MAX_WORKERS: int = 2  # 0 computes everything inline
+    OFFLOAD_MIN_ROWS: int = 5_000
+
+    # LISTEN/NOTIFY channel keeping process-local caches coherent across workers
+    CACHE_INVALIDATION_ENABLED: bool = True
+    CACHE_INVALIDATION_KEEPALIVE_SECONDS: float = 30.0
+
+    # Practice and mock test responses, cleared by content_version bumps; warmed at startup
+    CONTENT_CACHE_ENABLED: bool = True
+    CONTENT_CACHE_MAX_ENTRIES: int = 1_000
+    CONTENT_CACHE_TTL_SECONDS: float = 24 * 60 * 60
+    # Cache-Control of the catalog endpoints by catalog kind (listening, reading, speaking, writing, mock-tests,
+    # mock-test); kinds without an entry use "default"
+    CONTENT_HTTP_CACHE_CONTROL: dict[str, str] = {
+        "default": "public, max-age=300, stale-while-revalidate=86400",
+    }
+
+    # Per-user response cache; keys carry the user's data version, so entries can live for hours.
+    # Expired entries are swept in the background
+    USER_DATA_CACHE_MAX_ENTRIES: int = 10_000
+    USER_DATA_CACHE_TTL_SECONDS: float = 6 * 60 * 60
+    USER_DATA_CACHE_SWEEP_SECONDS: float = 60.0
+
+    # Read dashboard/analytics totals and UTC streaks from the user_stats and user_daily_activity rollups
+    # instead of scanning user_activities
+    ANALYTICS_USE_ROLLUPS: bool = True
 
     # LLM / AI configuration
     LLM_API_KEY: str | None = None
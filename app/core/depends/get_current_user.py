@@ -3,15 +3,24 @@ from __future__ import annotations
 import uuid
 from typing import Annotated
 
-import jwt  # type: ignore[import-not-found]
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.common.utils.cache import principal_cache
+from app.common.utils.token import (
+    ACCESS_TOKEN_TYPE,
+    REFRESH_TOKEN_TYPE,
+    decode_token,
+    revocation_filter,
+    user_from_claims,
+)
 from app.core.config import SETTINGS
 from app.core.depends.get_session import get_session
 from app.crud.user import UserCrud
 from app.model.model import User
+from app.setup.database import sessionmanager
+from app.setup.invalidation import invalidation_bus
 
 security_scheme = HTTPBearer(auto_error=True)
 
@@ -22,15 +31,39 @@ async def get_current_user(
 ) -> User:
     token = credentials.credentials
     try:
-        payload = jwt.decode(token, SETTINGS.JWT_SECRET, algorithms=[SETTINGS.JWT_ALGORITHM])
+        payload = decode_token(token)
         subject = payload.get("sub")
         if subject is None:
             raise ValueError("Missing sub claim")
+        if payload.get("typ") == REFRESH_TOKEN_TYPE:
+            raise ValueError("Refresh tokens cannot authenticate requests")
         user_id = uuid.UUID(subject)
     except Exception:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
 
+    # Without the invalidation channel another worker's write would go unnoticed, so go to the database
+    use_cache = invalidation_bus.local_caching_safe
+
+    # Stateless access tokens are trusted as-is unless the user changed since they were issued; other workers'
+    # changes only reach the revocation filter through the invalidation channel
+    if (
+        SETTINGS.AUTH_STATELESS_ENABLED
+        and use_cache
+        and payload.get("typ") == ACCESS_TOKEN_TYPE
+        and not revocation_filter.is_revoked(user_id, payload["iat"])
+    ):
+        return user_from_claims(payload)
+
+    user = principal_cache.get(user_id) if use_cache else None
+    if user is not None:
+        return user
+
     user = await UserCrud.get_user_by_id(db, user_id)
+    # Don't keep the lookup's connection checked out while the endpoint does non-database work.
+    # This also detaches the user, so the cached instance is never bound to another request's session.
+    await sessionmanager.release(db)
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    if use_cache:
+        principal_cache.set(user_id, user)
     return user
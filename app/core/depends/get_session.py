@@ -1,11 +1,34 @@
+import hashlib
 from typing import AsyncIterator
 
+from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.setup.database import sessionmanager
 
 
-async def get_session() -> AsyncIterator[AsyncSession]:
-    """Get a session from the session manager"""
-    async with sessionmanager.session() as session:
+def get_sticky_key(request: Request) -> str | None:
+    """
+    Identify the client for read-your-writes stickiness by a digest of its credentials, so live tokens are not kept
+    as keys. Anonymous requests get no key: the reads that must see their own writes are the authenticated ones, and
+    keying on the client address would pin everyone behind the same NAT or proxy to the primary.
+    """
+    authorization = request.headers.get("authorization")
+    if not authorization:
+        return None
+    return hashlib.sha256(authorization.encode()).hexdigest()[:32]
+
+
+async def get_session(request: Request) -> AsyncIterator[AsyncSession]:
+    """
+    Get a session on the primary database from the session manager.
+    No connection is checked out until the first query.
+    """
+    async with sessionmanager.session(get_sticky_key(request)) as session:
+        yield session
+
+
+async def get_read_session(request: Request) -> AsyncIterator[AsyncSession]:
+    """Get a read-only session, served by a replica unless the client wrote recently"""
+    async with sessionmanager.read_session(get_sticky_key(request)) as session:
         yield session
@@ -0,0 +1,17 @@
+from typing import Annotated
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from fastapi import HTTPException, Query, status
+
+
+async def get_time_zone(
+    tz: Annotated[str | None, Query(description="IANA time zone for day boundaries, e.g. Asia/Ho_Chi_Minh")] = None,
+) -> str:
+    """Validate the optional time zone query parameter (UTC when omitted)"""
+    if tz is None:
+        return "UTC"
+    try:
+        ZoneInfo(tz)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid tz: {tz}")
+    return tz
@@ -0,0 +1,55 @@
+from fastapi import Request
+
+from app.common.exceptions.common import RateLimitExceeded
+from app.common.utils.rate_limit import rate_limiter
+from app.core.config import SETTINGS
+from app.schema.auth import LoginRequest, RegisterRequest, VerifyOtpRequest
+
+
+async def _enforce(scope: str, request: Request, email: str, email_limit: int, ip_limit: int) -> None:
+    if not SETTINGS.RATE_LIMIT_ENABLED:
+        return
+    period = SETTINGS.RATE_LIMIT_PERIOD_SECONDS
+    client_ip = request.client.host if request.client else "unknown"
+    retry_after = max(
+        await rate_limiter.hit(f"{scope}:email:{email.lower()}", email_limit, period),
+        await rate_limiter.hit(f"{scope}:ip:{client_ip}", ip_limit, period),
+    )
+    if retry_after:
+        raise RateLimitExceeded(retry_after)
+
+
+# Each limiter returns the request body it checked, so the endpoint takes its payload from the dependency and the
+# body is declared (and reported in validation errors) only once
+
+
+async def login_rate_limit(request: Request, payload: LoginRequest) -> LoginRequest:
+    """Limit OTP requests per email and per client address, before any database work"""
+    await _enforce(
+        "login", request, str(payload.email), SETTINGS.LOGIN_RATE_LIMIT_PER_EMAIL, SETTINGS.LOGIN_RATE_LIMIT_PER_IP
+    )
+    return payload
+
+
+async def register_rate_limit(request: Request, payload: RegisterRequest) -> RegisterRequest:
+    """Limit registrations, which also issue an OTP, per email and per client address, before any database work"""
+    await _enforce(
+        "register",
+        request,
+        str(payload.email),
+        SETTINGS.REGISTER_RATE_LIMIT_PER_EMAIL,
+        SETTINGS.REGISTER_RATE_LIMIT_PER_IP,
+    )
+    return payload
+
+
+async def verify_otp_rate_limit(request: Request, payload: VerifyOtpRequest) -> VerifyOtpRequest:
+    """Limit OTP guesses per email and per client address, before any database work"""
+    await _enforce(
+        "verify-otp",
+        request,
+        str(payload.email),
+        SETTINGS.VERIFY_OTP_RATE_LIMIT_PER_EMAIL,
+        SETTINGS.VERIFY_OTP_RATE_LIMIT_PER_IP,
+    )
+    return payload
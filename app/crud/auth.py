@@ -3,6 +3,7 @@ from __future__ import annotations
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
+from sqlalchemy import delete, exists, insert, literal, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import select
 
@@ -21,31 +22,48 @@ class AuthCrud:
         # Ensure user exists (get_or_create strategy)
         await UserCrud.get_or_create_user_by_email(db, email=email)
 
-        # Rate limit based on latest OTP for this email (only consider the single latest record)
-        result = await db.execute(
-            select(OtpCode).where(OtpCode.email == email).order_by(OtpCode.created_at.desc()).limit(1)
-        )
-        existing: Optional[OtpCode] = result.scalar_one_or_none()
-        now = cls._now()
-        # Only reuse the existing OTP within the rate limit window if it is still valid and unused
-        if (
-            existing
-            and not existing.used
-            and existing.expires_at > now
-            and (now - existing.created_at).total_seconds() < SETTINGS.OTP_RATE_LIMIT_SECONDS
-        ):
-            return existing
-
-        # Create new OTP record
+        # Create new OTP record unless the latest one can be reused
         import random
 
         digits = "0123456789"
         code = "".join(random.choice(digits) for _ in range(SETTINGS.OTP_LENGTH))
+        now = cls._now()
         expires_at = now + timedelta(seconds=SETTINGS.OTP_TTL_SECONDS)
-        otp = OtpCode(email=email, otp_code=code, expires_at=expires_at, created_at=now)
-        db.add(otp)
+
+        # Rate limit check and insert in one round trip: the latest OTP for this email is reused within the rate
+        # limit window if it is still valid and unused, otherwise a new one is inserted and returned
+        latest = (
+            select(OtpCode).where(OtpCode.email == email).order_by(OtpCode.created_at.desc()).limit(1).cte("latest")
+        )
+        reusable = (
+            select(latest)
+            .where(
+                latest.c.used.is_(False),
+                latest.c.expires_at > now,
+                latest.c.created_at > now - timedelta(seconds=SETTINGS.OTP_RATE_LIMIT_SECONDS),
+            )
+            .cte("reusable")
+        )
+        inserted = (
+            insert(OtpCode)
+            .from_select(
+                ["email", "otp_code", "expires_at", "created_at"],
+                select(
+                    literal(email, OtpCode.email.type),
+                    literal(code, OtpCode.otp_code.type),
+                    literal(expires_at, OtpCode.expires_at.type),
+                    literal(now, OtpCode.created_at.type),
+                ).where(~exists(select(reusable.c.id))),
+            )
+            .returning(*OtpCode.__table__.c)
+            .cte("inserted")
+        )
+        result = await db.execute(
+            select(OtpCode).from_statement(union_all(select(inserted), select(reusable))),
+            execution_options={"populate_existing": True},
+        )
+        otp = result.scalar_one()
         await db.commit()
-        await db.refresh(otp)
         return otp
 
     @classmethod
@@ -72,3 +90,15 @@ class AuthCrud:
 
         user = await UserCrud.get_or_create_user_by_email(db, email=email)
         return user
+
+    @classmethod
+    async def purge_expired_otps(cls, db: AsyncSession, batch_size: int) -> int:
+        """Delete expired OTPs in batches so no single statement holds locks on many rows"""
+        purged = 0
+        while True:
+            batch = select(OtpCode.id).where(OtpCode.expires_at < cls._now()).limit(batch_size)
+            result = await db.execute(delete(OtpCode).where(OtpCode.id.in_(batch.scalar_subquery())))
+            await db.commit()
+            purged += result.rowcount
+            if result.rowcount < batch_size:
+                return purged
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import select
+
+from app.model.model import ContentVersion
+
+
+class ContentCrud:
+    @classmethod
+    async def get_content_version(cls, db: AsyncSession) -> int:
+        """
+        Get the current version of the editorial content (passages, practice questions and mock tests)
+        """
+        result = await db.execute(select(ContentVersion.version).where(ContentVersion.id == 1))
+        return result.scalar_one_or_none() or 0
@@ -1,46 +1,92 @@
 from __future__ import annotations
 
 import uuid
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List
 
-from sqlalchemy import and_, desc, func
+from sqlalchemy import desc, func
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.sql import select
+from sqlalchemy.orm import defer
+from sqlalchemy.sql import Select, select
 
-from app.model.model import User, UserActivity
+from app.core.config import SETTINGS
+from app.crud.streak import StreakCrud
+from app.model.model import User, UserActivity, UserStats
 
 
 class DashboardCrud:
     @classmethod
-    async def get_dashboard_data(cls, db: AsyncSession, user_id: uuid.UUID) -> Dict:
+    async def get_dashboard_data(cls, db: AsyncSession, user_id: uuid.UUID, tz: str = "UTC") -> Dict:
         """
         Get comprehensive dashboard data for a user
         """
-        # Get user activities
-        activities_result = await db.execute(
-            select(UserActivity).where(UserActivity.user_id == user_id).order_by(desc(UserActivity.created_at))
-        )
-        activities = activities_result.scalars().all()
-
-        # Get user info
-        user_result = await db.execute(select(User).where(User.id == user_id))
-        user = user_result.scalar_one_or_none()
+        stats_query = cls._rollup_stats_query(user_id) if SETTINGS.ANALYTICS_USE_ROLLUPS else cls._stats_query(user_id)
+        stats_result = await db.execute(stats_query)
+        stats = stats_result.one()
 
-        if not user:
+        if not stats.user_exists or not stats.activities:
             return cls._get_empty_dashboard()
 
-        # Calculate user stats
-        user_stats = cls._calculate_user_stats(activities, user)
+        # studyStreak has always been the run of active days ending today, like currentStreak
+        current_streak, _ = await StreakCrud.get_streaks(db, user_id, tz=tz)
+        study_streak = current_streak
 
         # Get recent activity (last 3)
-        recent_activity = cls._get_recent_activity(activities[:3])
+        recent_result = await db.execute(
+            select(UserActivity)
+            .options(defer(UserActivity.details))
+            .where(UserActivity.user_id == user_id)
+            .order_by(desc(UserActivity.created_at))
+            .limit(3)
+        )
+        recent_activity = cls._get_recent_activity(recent_result.scalars().all())
 
+        average_score = stats.average_score if stats.average_score is not None else 0.0
+        best_score = stats.best_score if stats.best_score is not None else 0.0
         return {
-            "userStats": user_stats,
+            "userStats": {
+                "totalTestsTaken": stats.tests_taken,
+                "averageScore": round(average_score, 1),
+                "bestScore": round(best_score, 1),
+                "studyStreak": study_streak,
+                "totalStudyTime": cls._format_study_time(stats.time_spent),
+                "completedLessons": stats.completed_lessons,
+                "currentStreak": current_streak,
+            },
             "recentActivity": recent_activity,
         }
 
+    @classmethod
+    def _stats_query(cls, user_id: uuid.UUID) -> Select:
+        """Counts, scores and study time aggregated over the raw activities"""
+        return select(
+            select(User.id).where(User.id == user_id).exists().label("user_exists"),
+            func.count().label("activities"),
+            func.count().filter(UserActivity.practice_type == "mockTest").label("tests_taken"),
+            func.count().filter(UserActivity.practice_type == "practice").label("completed_lessons"),
+            func.avg(UserActivity.score).label("average_score"),
+            func.max(UserActivity.score).label("best_score"),
+            func.coalesce(func.sum(UserActivity.time_spent), 0).label("time_spent"),
+        ).where(UserActivity.user_id == user_id)
+
+    @classmethod
+    def _rollup_stats_query(cls, user_id: uuid.UUID) -> Select:
+        """Same columns as _stats_query, read from the handful of user_stats rows of the user"""
+        return select(
+            select(User.id).where(User.id == user_id).exists().label("user_exists"),
+            func.coalesce(func.sum(UserStats.sessions), 0).label("activities"),
+            func.coalesce(func.sum(UserStats.sessions).filter(UserStats.practice_type == "mockTest"), 0).label(
+                "tests_taken"
+            ),
+            func.coalesce(func.sum(UserStats.sessions).filter(UserStats.practice_type == "practice"), 0).label(
+                "completed_lessons"
+            ),
+            (func.sum(UserStats.score_sum) / func.nullif(func.sum(UserStats.scored_sessions), 0)).label(
+                "average_score"
+            ),
+            func.max(UserStats.score_max).label("best_score"),
+            func.coalesce(func.sum(UserStats.time_spent), 0).label("time_spent"),
+        ).where(UserStats.user_id == user_id)
+
     @classmethod
     def _get_empty_dashboard(cls) -> Dict:
         """Return empty dashboard structure"""
@@ -57,47 +103,6 @@ class DashboardCrud:
             "recentActivity": [],
         }
 
-    @classmethod
-    def _calculate_user_stats(cls, activities: List[UserActivity], user: User) -> Dict:
-        """Calculate comprehensive user statistics"""
-        if not activities:
-            return {
-                "totalTestsTaken": 0,
-                "averageScore": 0.0,
-                "bestScore": 0.0,
-                "studyStreak": 0,
-                "totalStudyTime": "0 hours",
-                "completedLessons": 0,
-                "currentStreak": 0,
-            }
-
-        # Calculate basic stats
-        total_tests_taken = len([a for a in activities if a.practice_type == "mockTest"])
-        completed_lessons = len([a for a in activities if a.practice_type == "practice"])
-
-        # Calculate scores
-        scores = [a.score for a in activities if a.score is not None]
-        average_score = sum(scores) / len(scores) if scores else 0.0
-        best_score = max(scores) if scores else 0.0
-
-        # Calculate study time
-        total_time_minutes = sum(a.time_spent or 0 for a in activities)
-        total_study_time = cls._format_study_time(total_time_minutes)
-
-        # Calculate streaks
-        study_streak = cls._calculate_study_streak(activities)
-        current_streak = cls._calculate_current_streak(activities)
-
-        return {
-            "totalTestsTaken": total_tests_taken,
-            "averageScore": round(average_score, 1),
-            "bestScore": round(best_score, 1),
-            "studyStreak": study_streak,
-            "totalStudyTime": total_study_time,
-            "completedLessons": completed_lessons,
-            "currentStreak": current_streak,
-        }
-
     @classmethod
     def _format_study_time(cls, minutes: int) -> str:
         """Format study time in hours"""
@@ -109,61 +114,6 @@ class DashboardCrud:
             return f"{hours} hours"
         return f"{hours} hours {remaining_minutes} minutes"
 
-    @classmethod
-    def _calculate_study_streak(cls, activities: List[UserActivity]) -> int:
-        """Calculate longest study streak"""
-        if not activities:
-            return 0
-
-        # Group activities by date
-        date_activities = {}
-        for activity in activities:
-            date = activity.created_at.date()
-            if date not in date_activities:
-                date_activities[date] = []
-            date_activities[date].append(activity)
-
-        # Sort dates
-        sorted_dates = sorted(date_activities.keys(), reverse=True)
-
-        # Find longest consecutive streak
-        max_streak = 0
-        current_streak = 0
-        current_date = datetime.utcnow().date()
-
-        for date in sorted_dates:
-            days_diff = (current_date - date).days
-            if days_diff == current_streak:
-                current_streak += 1
-                max_streak = max(max_streak, current_streak)
-            else:
-                break
-
-        return max_streak
-
-    @classmethod
-    def _calculate_current_streak(cls, activities: List[UserActivity]) -> int:
-        """Calculate current study streak"""
-        if not activities:
-            return 0
-
-        # Sort activities by date (newest first)
-        sorted_activities = sorted(activities, key=lambda x: x.created_at.date(), reverse=True)
-
-        streak = 0
-        current_date = datetime.utcnow().date()
-
-        for activity in sorted_activities:
-            activity_date = activity.created_at.date()
-            days_diff = (current_date - activity_date).days
-
-            if days_diff == streak:
-                streak += 1
-            else:
-                break
-
-        return streak
-
     @classmethod
     def _get_recent_activity(cls, activities: List[UserActivity]) -> List[Dict]:
         """Get recent activity data (last 3)"""
@@ -1,23 +1,26 @@
 from __future__ import annotations
 
 import uuid
-from typing import List
+from typing import List, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import select
 
+from app.common.utils.pagination import Cursor, keyset_page, split_page
 from app.model.model import MockTest
 
 
 class MockTestCrud:
     @classmethod
-    async def get_all_mock_tests(cls, db: AsyncSession, limit: int = 50) -> List[MockTest]:
+    async def get_all_mock_tests(
+        cls, db: AsyncSession, limit: int = 50, after: Optional[Cursor] = None
+    ) -> tuple[List[MockTest], Optional[Cursor]]:
         """
-        Get all available mock tests.
-        Returns tests ordered by creation date (newest first).
+        Get a page of the available mock tests.
+        Returns tests ordered by creation date (newest first), and the position of the next page.
         """
-        result = await db.execute(select(MockTest).order_by(MockTest.created_at.desc()).limit(limit))
-        return result.scalars().all()
+        result = await db.execute(keyset_page(select(MockTest), MockTest, limit, after))
+        return split_page(result.scalars().all(), limit)
 
     @classmethod
     async def get_mock_test_by_id(cls, db: AsyncSession, test_id: uuid.UUID) -> MockTest | None:
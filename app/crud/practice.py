@@ -4,65 +4,34 @@ import uuid
 from typing import List, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from sqlalchemy.sql import select
 
+from app.common.utils.pagination import Cursor, keyset_page, split_page
 from app.model.model import Passage, PracticeQuestion
 
 
 class PracticeCrud:
     @classmethod
-    async def get_listening_passages_with_questions(cls, db: AsyncSession, limit: int = 10) -> List[Passage]:
+    async def get_passages_with_questions(
+        cls, db: AsyncSession, skill: str, limit: int = 10, after: Optional[Cursor] = None
+    ) -> tuple[List[Passage], Optional[Cursor]]:
         """
-        Get listening passages with their associated questions.
-        Returns passages ordered by creation date (newest first).
+        Get a page of passages of a skill (listening or reading) with their questions, in two queries whatever the
+        limit. Returns passages ordered by creation date (newest first), each with its questions oldest first, and
+        the position of the next page.
         """
-        # Get passages for listening skill
-        result = await db.execute(
-            select(Passage).where(Passage.skill == "listening").order_by(Passage.created_at.desc()).limit(limit)
-        )
-        passages = result.scalars().all()
-
-        # For each passage, fetch its questions
-        for passage in passages:
-            questions_result = await db.execute(
-                select(PracticeQuestion)
-                .where(PracticeQuestion.passage_id == passage.id)
-                .order_by(PracticeQuestion.created_at.asc())
-            )
-            passage.questions = questions_result.scalars().all()
-
-        return passages
-
-    @classmethod
-    async def get_reading_passages_with_questions(cls, db: AsyncSession, limit: int = 10) -> List[Passage]:
-        """
-        Get reading passages with their associated questions.
-        Returns passages ordered by creation date (newest first).
-        """
-        # Get passages for reading skill
-        result = await db.execute(
-            select(Passage).where(Passage.skill == "reading").order_by(Passage.created_at.desc()).limit(limit)
-        )
-        passages = result.scalars().all()
-
-        # For each passage, fetch its questions
-        for passage in passages:
-            questions_result = await db.execute(
-                select(PracticeQuestion)
-                .where(PracticeQuestion.passage_id == passage.id)
-                .order_by(PracticeQuestion.created_at.asc())
-            )
-            passage.questions = questions_result.scalars().all()
-
-        return passages
+        query = select(Passage).options(selectinload(Passage.questions)).where(Passage.skill == skill)
+        result = await db.execute(keyset_page(query, Passage, limit, after))
+        return split_page(result.scalars().all(), limit)
 
     @classmethod
     async def get_speaking_questions(
-        cls, db: AsyncSession, limit: int = 10, question_type: Optional[str] = None
-    ) -> List[PracticeQuestion]:
+        cls, db: AsyncSession, limit: int = 10, question_type: Optional[str] = None, after: Optional[Cursor] = None
+    ) -> tuple[List[PracticeQuestion], Optional[Cursor]]:
         """
-        Get speaking practice questions.
-        Returns questions ordered by creation date (newest first).
+        Get a page of speaking practice questions.
+        Returns questions ordered by creation date (newest first), and the position of the next page.
         """
         # Get questions for speaking skill (no passage_id since speaking questions are standalone)
         query = (
@@ -74,10 +43,8 @@ class PracticeCrud:
         if question_type:
             query = query.where(PracticeQuestion.question_type == question_type)
 
-        query = query.order_by(PracticeQuestion.created_at.desc()).limit(limit)
-
-        result = await db.execute(query)
-        return result.scalars().all()
+        result = await db.execute(keyset_page(query, PracticeQuestion, limit, after))
+        return split_page(result.scalars().all(), limit)
 
     @classmethod
     async def get_passage_by_id(cls, db: AsyncSession, passage_id: uuid.UUID) -> Optional[Passage]:
@@ -97,11 +64,11 @@ class PracticeCrud:
 
     @classmethod
     async def get_writing_prompts(
-        cls, db: AsyncSession, limit: int = 10, question_type: Optional[str] = None
-    ) -> List[PracticeQuestion]:
+        cls, db: AsyncSession, limit: int = 10, question_type: Optional[str] = None, after: Optional[Cursor] = None
+    ) -> tuple[List[PracticeQuestion], Optional[Cursor]]:
         """
-        Get writing practice prompts.
-        Returns prompts ordered by creation date (newest first).
+        Get a page of writing practice prompts.
+        Returns prompts ordered by creation date (newest first), and the position of the next page.
         """
         # Get questions for writing skill (no passage_id since writing prompts are standalone)
         query = (
@@ -113,7 +80,5 @@ class PracticeCrud:
         if question_type:
             query = query.where(PracticeQuestion.question_type == question_type)
 
-        query = query.order_by(PracticeQuestion.created_at.desc()).limit(limit)
-
-        result = await db.execute(query)
-        return result.scalars().all()
+        result = await db.execute(keyset_page(query, PracticeQuestion, limit, after))
+        return split_page(result.scalars().all(), limit)
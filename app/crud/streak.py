@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+from sqlalchemy import Integer, cast, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select, select
+
+from app.core.config import SETTINGS
+from app.model.model import UserActivity, UserDailyActivity
+
+
+class StreakCrud:
+    @classmethod
+    async def get_streaks(
+        cls,
+        db: AsyncSession,
+        user_id: uuid.UUID,
+        tz: str = "UTC",
+        since: Optional[datetime] = None,
+        practice_type: Optional[str] = None,
+    ) -> Tuple[int, int]:
+        """
+        Get the current and longest streak of consecutive active days for a user
+
+        Days are calendar days in the given IANA time zone. The current streak is the run of active days that
+        includes today, or 0 when the user has not been active today.
+        """
+        days = cls._active_days(user_id, tz, since, practice_type).subquery()
+
+        # Gaps and islands: day minus its rank is constant within a run of consecutive days
+        islands = select(
+            days.c.day,
+            (days.c.day - cast(func.row_number().over(order_by=days.c.day), Integer)).label("island"),
+        ).subquery()
+        runs = (
+            select(
+                func.min(islands.c.day).label("first_day"),
+                func.max(islands.c.day).label("last_day"),
+                func.count().label("length"),
+            )
+            .group_by(islands.c.island)
+            .subquery()
+        )
+
+        today = func.date(func.timezone(tz, func.now()))
+        result = await db.execute(
+            select(
+                func.coalesce(
+                    func.max(today - runs.c.first_day + 1).filter(runs.c.first_day <= today, runs.c.last_day >= today),
+                    0,
+                ).label("current_streak"),
+                func.coalesce(func.max(runs.c.length), 0).label("longest_streak"),
+            )
+        )
+        streaks = result.one()
+        return streaks.current_streak, streaks.longest_streak
+
+    @classmethod
+    def _active_days(
+        cls, user_id: uuid.UUID, tz: str, since: Optional[datetime], practice_type: Optional[str]
+    ) -> Select:
+        """Distinct active days, from the daily rollup for UTC (since is then taken as its UTC day) or raw activities"""
+        if tz == "UTC" and SETTINGS.ANALYTICS_USE_ROLLUPS:
+            query = select(UserDailyActivity.day.label("day")).where(UserDailyActivity.user_id == user_id).distinct()
+            if since is not None:
+                query = query.where(UserDailyActivity.day >= since.astimezone(timezone.utc).date())
+            if practice_type is not None:
+                query = query.where(UserDailyActivity.practice_type == practice_type)
+            return query
+
+        local_day = func.date(func.timezone(tz, UserActivity.created_at))
+        query = select(local_day.label("day")).where(UserActivity.user_id == user_id).distinct()
+        if since is not None:
+            query = query.where(UserActivity.created_at >= since)
+        if practice_type is not None:
+            query = query.where(UserActivity.practice_type == practice_type)
+        return query
@@ -4,10 +4,14 @@ import uuid
 from datetime import date, datetime, timezone
 from typing import Optional
 
+from sqlalchemy import Integer, cast, func, insert, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.sql import select
+from sqlalchemy.sql import ColumnElement, select
 
+from app.common.utils.cache import principal_cache
+from app.common.utils.token import revocation_filter
 from app.model.model import User
+from app.setup.invalidation import notify_invalidation
 
 
 class UserCrud:
@@ -32,17 +36,20 @@ class UserCrud:
         test_date: date | None = None,
     ) -> User:
         now = datetime.now(timezone.utc)
-        user = User(
-            name=name,
-            email=email,
-            target_score=target_score,
-            test_date=test_date,
-            created_at=now,
-            updated_at=now,
+        result = await db.execute(
+            insert(User)
+            .values(
+                name=name,
+                email=email,
+                target_score=target_score,
+                test_date=test_date,
+                created_at=now,
+                updated_at=now,
+            )
+            .returning(User)
         )
-        db.add(user)
+        user = result.scalar_one()
         await db.commit()
-        await db.refresh(user)
         return user
 
     @classmethod
@@ -68,25 +75,30 @@ class UserCrud:
         has_previous_test: Optional[bool] = None,
         last_test_score: Optional[float] = None,
     ) -> Optional[User]:
-        result = await db.execute(select(User).where(User.id == user_id).limit(1))
-        user = result.scalar_one_or_none()
-        if user is None:
-            return None
+        values: dict = {"updated_at": datetime.now(timezone.utc)}
         if name is not None:
-            user.name = name
+            values["name"] = name
         if email is not None:
-            user.email = email
+            values["email"] = email
         if target_score is not None:
-            user.target_score = target_score
+            values["target_score"] = target_score
         if test_date is not None:
-            user.test_date = test_date
+            values["test_date"] = test_date
         if has_previous_test is not None:
-            user.has_previous_test = has_previous_test
+            values["has_previous_test"] = has_previous_test
         if last_test_score is not None:
-            user.last_test_score = last_test_score
-        user.updated_at = datetime.now(timezone.utc)
+            values["last_test_score"] = last_test_score
+        result = await db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(**values, data_version=User.data_version + 1)
+            .returning(User)
+            .execution_options(populate_existing=True)
+        )
+        user = result.scalar_one_or_none()
+        await notify_invalidation(db, "principal", str(user_id))
         await db.commit()
-        await db.refresh(user)
+        cls._invalidate_principal(user_id)
         return user
 
     @classmethod
@@ -104,53 +116,57 @@ class UserCrud:
         Add XP to user and handle level progression.
         Returns the updated user or None if user not found.
         """
-        result = await db.execute(select(User).where(User.id == user_id).limit(1))
+        xp = User.xp + xp_amount
+        result = await db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(
+                xp=xp,
+                level=cls._level_from_xp(xp),
+                updated_at=datetime.now(timezone.utc),
+                data_version=User.data_version + 1,
+            )
+            .returning(User)
+            .execution_options(populate_existing=True)
+        )
         user = result.scalar_one_or_none()
-        if user is None:
-            return None
-
-        # Store previous values for response
-        previous_xp = user.xp
-        previous_level = user.level
-
-        # Add XP
-        user.xp += xp_amount
-
-        # Calculate new level based on XP
-        new_level = cls._calculate_level_from_xp(user.xp)
-        user.level = new_level
-
-        # Update timestamp
-        user.updated_at = datetime.now(timezone.utc)
-
+        await notify_invalidation(db, "principal", str(user_id))
         await db.commit()
-        await db.refresh(user)
+        cls._invalidate_principal(user_id)
         return user
 
-    @staticmethod
-    def _calculate_level_from_xp(xp: int) -> int:
+    @classmethod
+    async def bump_data_version(cls, db: AsyncSession, user_id: uuid.UUID) -> None:
+        """
+        Mark the user's data as changed; runs in the caller's transaction and does not commit
         """
-        Calculate level based on total XP.
+        await db.execute(update(User).where(User.id == user_id).values(data_version=User.data_version + 1))
 
-        Level progression formula:
-        - Level 1: 0-99 XP
-        - Level 2: 100-299 XP (200 XP needed)
-        - Level 3: 300-599 XP (300 XP needed)
-        - Level 4: 600-999 XP (400 XP needed)
-        - And so on...
+    @classmethod
+    async def get_data_version(cls, db: AsyncSession, user_id: uuid.UUID) -> int:
+        """
+        Get the current data version of a user (0 if the user does not exist)
         """
-        if xp < 100:
-            return 1
+        result = await db.execute(select(User.data_version).where(User.id == user_id))
+        return result.scalar_one_or_none() or 0
 
-        # For level 2 and above, calculate based on cumulative XP needed
-        level = 1
-        cumulative_xp_needed = 0
+    @staticmethod
+    def _invalidate_principal(user_id: uuid.UUID) -> None:
+        """Drop the cached principal and mark stateless access tokens issued so far as stale"""
+        principal_cache.invalidate(user_id)
+        revocation_filter.revoke(user_id)
 
-        while True:
-            level += 1
-            cumulative_xp_needed += level * 100
+    @staticmethod
+    def _level_from_xp(xp: ColumnElement[int]) -> ColumnElement[int]:
+        """
+        SQL expression for the level reached with the given total XP.
 
-            if xp < cumulative_xp_needed:
-                return level - 1
+        Level progression formula:
+        - Level 1: 0-199 XP
+        - Level 2: 200-499 XP (300 XP needed)
+        - Level 3: 500-899 XP (400 XP needed)
+        - And so on, level L starts at 100 * (L * (L + 1) / 2 - 1) XP
 
-        return 1  # Fallback
+        Solving that threshold for L gives floor((sqrt(900 + 8 * xp) - 10) / 20).
+        """
+        return cast(func.floor((func.sqrt(900 + 8 * xp) - 10) / 20), Integer)
@@ -3,9 +3,13 @@ from __future__ import annotations
 import uuid
 from typing import Optional
 
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import select
 
+from app.common.utils.pagination import Cursor, keyset_page, split_page
+from app.crud.user import UserCrud
+from app.crud.user_stats import UserStatsCrud
 from app.model.model import UserActivity
 
 
@@ -26,20 +30,25 @@ class UserActivityCrud:
         """
         Create a new user activity record
         """
-        user_activity = UserActivity(
-            user_id=user_id,
-            type=activity_type,
-            practice_type=practice_type,
-            score=score,
-            band=band,
-            details=details,
-            xp_earned=xp_earned,
-            time_spent=time_spent,
+        result = await db.execute(
+            insert(UserActivity)
+            .values(
+                user_id=user_id,
+                type=activity_type,
+                practice_type=practice_type,
+                score=score,
+                band=band,
+                details=details,
+                xp_earned=xp_earned,
+                time_spent=time_spent,
+            )
+            .returning(UserActivity)
         )
-
-        db.add(user_activity)
+        user_activity = result.scalar_one()
+        # Keep the rollups and the data version in step within the same transaction
+        await UserStatsCrud.record_activity(db, user_activity)
+        await UserCrud.bump_data_version(db, user_id)
         await db.commit()
-        await db.refresh(user_activity)
 
         return user_activity
 
@@ -50,12 +59,10 @@ class UserActivityCrud:
         return result.scalar_one_or_none()
 
     @classmethod
-    async def get_user_activities(cls, db: AsyncSession, user_id: uuid.UUID, limit: int = 50) -> list[UserActivity]:
-        """Get all activities for a specific user"""
-        result = await db.execute(
-            select(UserActivity)
-            .where(UserActivity.user_id == user_id)
-            .order_by(UserActivity.created_at.desc())
-            .limit(limit)
-        )
-        return result.scalars().all()
+    async def get_user_activities(
+        cls, db: AsyncSession, user_id: uuid.UUID, limit: int = 50, after: Optional[Cursor] = None
+    ) -> tuple[list[UserActivity], Optional[Cursor]]:
+        """Get a page of a user's activities, newest first, and the position of the next page"""
+        query = select(UserActivity).where(UserActivity.user_id == user_id)
+        result = await db.execute(keyset_page(query, UserActivity, limit, after))
+        return split_page(result.scalars().all(), limit)
@@ -1,15 +1,70 @@
 from __future__ import annotations
 
 import uuid
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from sqlalchemy import and_, desc, func
+import numpy as np
+from numpy.typing import ArrayLike
+from sqlalchemy import Float, case, cast, desc, func
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 from sqlalchemy.sql import select
 
-from app.common.utils.cache import analytics_cache
-from app.model.model import UserActivity
+from app.common.utils.offload import offloader
+from app.core.config import SETTINGS
+from app.crud.streak import StreakCrud
+from app.crud.user_stats import UserStatsCrud
+from app.model.model import UserActivity, UserDailyActivity, UserStats
+
+SKILLS = ("listening", "reading", "writing", "speaking")
+
+_SECONDS_PER_DAY = 86_400
+
+_EPOCH = date(1970, 1, 1)
+
+
+def _least_squares_slope(
+    n: ArrayLike, sum_x: ArrayLike, sum_xx: ArrayLike, sum_y: ArrayLike, sum_xy: ArrayLike
+) -> np.ndarray:
+    """Ordinary least-squares slope from the sums of x, x*x, y and x*y; 0 where there are fewer than two distinct x"""
+    n, sum_x, sum_xx, sum_y, sum_xy = (np.asarray(value, dtype=float) for value in (n, sum_x, sum_xx, sum_y, sum_xy))
+    denominator = n * sum_xx - sum_x * sum_x
+    # Guard against rounding noise when every x is the same
+    valid = denominator > 1e-9 * np.maximum(n * sum_xx, 1.0)
+    return np.where(valid, (n * sum_xy - sum_x * sum_y) / np.where(valid, denominator, 1.0), 0.0)
+
+
+def _rollup_slope(rows: Sequence[UserStats | UserDailyActivity]) -> float:
+    """
+    Least-squares slope of score per UTC day from rollup rows: lifetime rows carry their sums over x = epoch day, and
+    every score of a daily row shares the row's day
+    """
+    n = sum_x = sum_xx = 0
+    sum_y = sum_xy = Decimal(0)
+    for row in rows:
+        if not row.scored_sessions:
+            continue
+        n += row.scored_sessions
+        sum_y += row.score_sum
+        if isinstance(row, UserStats):
+            sum_x += row.scored_day_sum
+            sum_xx += row.scored_day_square_sum
+            sum_xy += row.scored_day_score_sum
+        else:
+            day = (row.day - _EPOCH).days
+            sum_x += day * row.scored_sessions
+            sum_xx += day * day * row.scored_sessions
+            sum_xy += day * row.score_sum
+    if not n:
+        return 0.0
+    # Shift x to around its mean in exact arithmetic, so the float regression does not cancel epoch-sized sums
+    shift = sum_x // n
+    sum_xx += n * shift * shift - 2 * shift * sum_x
+    sum_xy -= shift * sum_y
+    sum_x -= n * shift
+    return float(_least_squares_slope(n, sum_x, sum_xx, float(sum_y), float(sum_xy)))
 
 
 class UserAnalyticsCrud:
@@ -20,45 +75,127 @@ class UserAnalyticsCrud:
         user_id: uuid.UUID,
         time_range: str = "all",
         practice_type: str = "both",
+        tz: str = "UTC",
     ) -> Dict:
         """
         Get comprehensive analytics for a user
         """
-        # Generate cache key
-        cache_key = f"analytics:{user_id}:{time_range}:{practice_type}"
+        practice_type_filter = practice_type if practice_type != "both" else None
+        since = cls._get_range_start(time_range)
+        if not SETTINGS.ANALYTICS_USE_ROLLUPS:
+            return await cls._get_analytics_from_activities(db, user_id, since, practice_type_filter, tz)
+        # Lifetime totals for "all", at most one row per day, skill and practice type otherwise
+        if since is None:
+            rollup_rows = await UserStatsCrud.get_user_stats(db, user_id, practice_type_filter)
+        else:
+            rollup_rows = await UserStatsCrud.get_daily_activity(db, user_id, since.date(), practice_type_filter)
+        return await cls._get_analytics_from_rollup(db, user_id, rollup_rows, since, practice_type_filter, tz)
 
-        # Try to get from cache first
-        cached_result = await analytics_cache.get(cache_key)
-        if cached_result is not None:
-            return cached_result
+    @classmethod
+    async def _get_analytics_from_activities(
+        cls,
+        db: AsyncSession,
+        user_id: uuid.UUID,
+        since: Optional[datetime],
+        practice_type: Optional[str],
+        tz: str,
+    ) -> Dict:
+        """Calculate analytics by scanning the matching activities"""
+        # One row of arrays holding only the columns the aggregates need, instead of an ORM object per activity
+        skill_code = case(
+            *((func.lower(UserActivity.type) == skill, code) for code, skill in enumerate(SKILLS)), else_=len(SKILLS)
+        )
+        columns_query = select(
+            func.array_agg(skill_code),
+            func.array_agg(cast(UserActivity.score, Float)),
+            func.array_agg(func.coalesce(UserActivity.time_spent, 0)),
+            func.array_agg(cast(func.extract("epoch", UserActivity.created_at), Float)),
+        ).where(UserActivity.user_id == user_id)
+        if since is not None:
+            columns_query = columns_query.where(UserActivity.created_at >= since)
+        if practice_type is not None:
+            columns_query = columns_query.where(UserActivity.practice_type == practice_type)
+        columns = tuple((await db.execute(columns_query)).one())
+
+        # array_agg over no rows is NULL
+        if columns[0] is None:
+            return cls._get_empty_analytics()
+
+        recent_activities = await cls._get_recent_activities(db, user_id, since, practice_type)
+        # Study streak over the same filtered activities
+        study_streak, _ = await StreakCrud.get_streaks(db, user_id, tz=tz, since=since, practice_type=practice_type)
+        # Calculate analytics, in the offload pool for long histories
+        overall_stats, skill_breakdown = await offloader.run(
+            "analytics", cls._calculate_analytics, columns, size=len(columns[0])
+        )
+        return {
+            "overallStats": overall_stats,
+            "skillBreakdown": skill_breakdown,
+            "recentActivity": cls._get_recent_activity(recent_activities),
+            "studyStreak": study_streak,
+        }
 
-        # Build base query
-        base_query = select(UserActivity).where(UserActivity.user_id == user_id)
+    @classmethod
+    async def _get_analytics_from_rollup(
+        cls,
+        db: AsyncSession,
+        user_id: uuid.UUID,
+        rows: Sequence[UserStats | UserDailyActivity],
+        since: Optional[datetime],
+        practice_type: Optional[str],
+        tz: str,
+    ) -> Dict:
+        """Calculate analytics from rollup rows covering the range, matching _calculate_analytics"""
+        total_sessions = sum(row.sessions for row in rows)
+        if not total_sessions:
+            return cls._get_empty_analytics()
 
-        # Apply time range filter
-        if time_range != "all":
-            days = cls._get_days_from_range(time_range)
-            cutoff_date = datetime.utcnow() - timedelta(days=days)
-            base_query = base_query.where(UserActivity.created_at >= cutoff_date)
+        recent_activities = await cls._get_recent_activities(db, user_id, since, practice_type)
+        study_streak, _ = await StreakCrud.get_streaks(db, user_id, tz=tz, since=since, practice_type=practice_type)
 
-        # Apply practice type filter
-        if practice_type != "both":
-            base_query = base_query.where(UserActivity.practice_type == practice_type)
+        scored_sessions = sum(row.scored_sessions for row in rows)
+        scored_rows = [row for row in rows if row.scored_sessions]
+        overall_stats = {
+            "totalSessions": total_sessions,
+            "totalTimeSpent": sum(row.time_spent for row in rows),
+            "averageScore": sum(row.score_sum for row in scored_rows) / scored_sessions if scored_sessions else 0.0,
+            "bestScore": max(row.score_max for row in scored_rows) if scored_rows else 0.0,
+        }
 
-        # Get all activities for the user
-        result = await db.execute(base_query.order_by(desc(UserActivity.created_at)))
-        activities = result.scalars().all()
+        skill_breakdown = {}
+        for skill in SKILLS:
+            skill_breakdown[skill] = cls._calculate_skill_analytics_from_rollup(
+                [row for row in rows if row.skill == skill]
+            )
 
-        if not activities:
-            analytics_result = cls._get_empty_analytics()
-        else:
-            # Calculate analytics
-            analytics_result = cls._calculate_analytics(activities)
+        return {
+            "overallStats": overall_stats,
+            "skillBreakdown": skill_breakdown,
+            "recentActivity": cls._get_recent_activity(recent_activities),
+            "studyStreak": study_streak,
+        }
 
-        # Cache the result for 5 minutes
-        await analytics_cache.set(cache_key, analytics_result, ttl_seconds=300)
+    @classmethod
+    async def _get_recent_activities(
+        cls, db: AsyncSession, user_id: uuid.UUID, since: Optional[datetime], practice_type: Optional[str]
+    ) -> List[UserActivity]:
+        """Get the five most recent activities in the range, without their details"""
+        recent_query = select(UserActivity).options(defer(UserActivity.details)).where(UserActivity.user_id == user_id)
+        if since is not None:
+            recent_query = recent_query.where(UserActivity.created_at >= since)
+        if practice_type is not None:
+            recent_query = recent_query.where(UserActivity.practice_type == practice_type)
+        result = await db.execute(recent_query.order_by(desc(UserActivity.created_at)).limit(5))
+        return list(result.scalars().all())
 
-        return analytics_result
+    @classmethod
+    def _get_range_start(cls, time_range: str) -> Optional[datetime]:
+        """Start of the time range: UTC midnight of the first day, so it lines up with the daily rollup"""
+        if time_range == "all":
+            return None
+        days = cls._get_days_from_range(time_range)
+        start_day = (datetime.now(timezone.utc) - timedelta(days=days)).date()
+        return datetime.combine(start_day, time.min, tzinfo=timezone.utc)
 
     @classmethod
     def _get_days_from_range(cls, time_range: str) -> int:
@@ -79,6 +216,7 @@ class UserAnalyticsCrud:
             "bestScore": 0.0,
             "totalTimeSpent": 0,
             "improvementTrend": 0.0,
+            "improvementSlope": 0.0,
         }
 
         return {
@@ -99,86 +237,105 @@ class UserAnalyticsCrud:
         }
 
     @classmethod
-    def _calculate_analytics(cls, activities: List[UserActivity]) -> Dict:
-        """Calculate analytics from user activities"""
-        # Group activities by skill
-        skill_activities = {
-            "listening": [],
-            "reading": [],
-            "writing": [],
-            "speaking": [],
-        }
-
-        total_sessions = len(activities)
-        total_time_spent = 0
-        all_scores = []
-
-        for activity in activities:
-            skill = activity.type.lower()
-            if skill in skill_activities:
-                skill_activities[skill].append(activity)
-
-            if activity.score is not None:
-                all_scores.append(activity.score)
-
-            if activity.time_spent is not None:
-                total_time_spent += activity.time_spent
+    def _calculate_analytics(
+        cls, columns: Tuple[Sequence[int], Sequence[Optional[float]], Sequence[int], Sequence[float]]
+    ) -> Tuple[Dict, Dict]:
+        """
+        Calculate overall stats and skill breakdown from the (skill code, score, time spent, created_at epoch)
+        columns with NumPy group-by reductions; pure, so it can run in a worker thread or process
+        """
+        codes, scores, time_spent, created_at = columns
+        # Group codes: the index in SKILLS, or len(SKILLS) for other activity types
+        codes = np.array(codes, dtype=np.intp)
+        groups = len(SKILLS) + 1
+        scores = np.array(scores, dtype=float)  # NULL scores become NaN
+        time_spent = np.array(time_spent, dtype=np.int64)
+        created_at = np.array(created_at, dtype=float)
+
+        sessions = np.bincount(codes, minlength=groups)
+        time_totals = np.bincount(codes, weights=time_spent, minlength=groups)
+
+        scored = ~np.isnan(scores)
+        scored_codes = codes[scored]
+        scored_values = scores[scored]
+        scored_at = created_at[scored]
+        scored_sessions = np.bincount(scored_codes, minlength=groups)
+        score_sums = np.bincount(scored_codes, weights=scored_values, minlength=groups)
+        best_scores = np.full(groups, -np.inf)
+        np.maximum.at(best_scores, scored_codes, scored_values)
+
+        # Oldest and newest score of each group: sort by group, then time
+        order = np.lexsort((scored_at, scored_codes))
+        sorted_codes = scored_codes[order]
+        group_starts = np.searchsorted(sorted_codes, np.arange(groups), side="left")
+        group_ends = np.searchsorted(sorted_codes, np.arange(groups), side="right")
+        if order.size:
+            sorted_values = scored_values[order]
+            has_scores = scored_sessions > 0
+            oldest_scores = np.where(has_scores, sorted_values[np.minimum(group_starts, order.size - 1)], 0.0)
+            newest_scores = np.where(has_scores, sorted_values[np.maximum(group_ends - 1, 0)], 0.0)
+        else:
+            # Activities, but none of them scored
+            oldest_scores = newest_scores = np.zeros(groups)
+
+        # Regression of score on the UTC day it was recorded, counted from the first day
+        days = np.floor(scored_at / _SECONDS_PER_DAY)
+        if days.size:
+            days -= days.min()
+        slopes = _least_squares_slope(
+            scored_sessions,
+            np.bincount(scored_codes, weights=days, minlength=groups),
+            np.bincount(scored_codes, weights=days * days, minlength=groups),
+            score_sums,
+            np.bincount(scored_codes, weights=days * scored_values, minlength=groups),
+        )
 
-        # Calculate overall stats
         overall_stats = {
-            "totalSessions": total_sessions,
-            "totalTimeSpent": total_time_spent,
-            "averageScore": sum(all_scores) / len(all_scores) if all_scores else 0.0,
-            "bestScore": max(all_scores) if all_scores else 0.0,
+            "totalSessions": len(codes),
+            "totalTimeSpent": int(time_spent.sum()),
+            "averageScore": float(scored_values.mean()) if scored_values.size else 0.0,
+            "bestScore": float(scored_values.max()) if scored_values.size else 0.0,
         }
 
-        # Calculate skill breakdown
         skill_breakdown = {}
-        for skill, skill_acts in skill_activities.items():
-            skill_breakdown[skill] = cls._calculate_skill_analytics(skill_acts)
-
-        # Get recent activity (last 5)
-        recent_activity = cls._get_recent_activity(activities[:5])
-
-        # Calculate study streak
-        study_streak = cls._calculate_study_streak(activities)
+        for code, skill in enumerate(SKILLS):
+            # (oldest - newest) / newest, as the trend has always been reported
+            improvement_trend = 0.0
+            if scored_sessions[code] >= 2 and newest_scores[code] > 0:
+                improvement_trend = float((oldest_scores[code] - newest_scores[code]) / newest_scores[code] * 100)
+            skill_breakdown[skill] = {
+                "totalSessions": int(sessions[code]),
+                "averageScore": float(score_sums[code] / scored_sessions[code]) if scored_sessions[code] else 0.0,
+                "bestScore": float(best_scores[code]) if scored_sessions[code] else 0.0,
+                "totalTimeSpent": int(time_totals[code]),
+                "improvementTrend": improvement_trend,
+                "improvementSlope": float(slopes[code]),
+            }
 
-        return {
-            "overallStats": overall_stats,
-            "skillBreakdown": skill_breakdown,
-            "recentActivity": recent_activity,
-            "studyStreak": study_streak,
-        }
+        return overall_stats, skill_breakdown
 
     @classmethod
-    def _calculate_skill_analytics(cls, activities: List[UserActivity]) -> Dict:
-        """Calculate analytics for a specific skill"""
-        if not activities:
-            return {
-                "totalSessions": 0,
-                "averageScore": 0.0,
-                "bestScore": 0.0,
-                "totalTimeSpent": 0,
-                "improvementTrend": 0.0,
-            }
-
-        scores = [act.score for act in activities if act.score is not None]
-        time_spent = sum(act.time_spent or 0 for act in activities)
+    def _calculate_skill_analytics_from_rollup(cls, rows: Sequence[UserStats | UserDailyActivity]) -> Dict:
+        """Calculate analytics for a specific skill from its rollup rows"""
+        sessions = sum(row.sessions for row in rows)
+        scored_rows = [row for row in rows if row.scored_sessions]
+        scored_sessions = sum(row.scored_sessions for row in scored_rows)
 
-        # Calculate improvement trend (simple: first vs last score)
+        # Same trend as _calculate_analytics: (oldest - newest) / newest
         improvement_trend = 0.0
-        if len(scores) >= 2:
-            first_score = scores[0]
-            last_score = scores[-1]
-            if first_score > 0:
-                improvement_trend = ((last_score - first_score) / first_score) * 100
+        if scored_sessions >= 2:
+            newest_score = max(scored_rows, key=lambda row: row.last_score_at).last_score
+            oldest_score = min(scored_rows, key=lambda row: row.first_score_at).first_score
+            if newest_score > 0:
+                improvement_trend = ((oldest_score - newest_score) / newest_score) * 100
 
         return {
-            "totalSessions": len(activities),
-            "averageScore": sum(scores) / len(scores) if scores else 0.0,
-            "bestScore": max(scores) if scores else 0.0,
-            "totalTimeSpent": time_spent,
+            "totalSessions": sessions,
+            "averageScore": sum(row.score_sum for row in scored_rows) / scored_sessions if scored_sessions else 0.0,
+            "bestScore": max(row.score_max for row in scored_rows) if scored_rows else 0.0,
+            "totalTimeSpent": sum(row.time_spent for row in rows),
             "improvementTrend": improvement_trend,
+            "improvementSlope": _rollup_slope(rows),
         }
 
     @classmethod
@@ -197,26 +354,3 @@ class UserAnalyticsCrud:
                 }
             )
         return recent
-
-    @classmethod
-    def _calculate_study_streak(cls, activities: List[UserActivity]) -> int:
-        """Calculate consecutive days of study"""
-        if not activities:
-            return 0
-
-        # Sort activities by date (newest first)
-        sorted_activities = sorted(activities, key=lambda x: x.created_at.date(), reverse=True)
-
-        streak = 0
-        current_date = datetime.utcnow().date()
-
-        for activity in sorted_activities:
-            activity_date = activity.created_at.date()
-            days_diff = (current_date - activity_date).days
-
-            if days_diff == streak:
-                streak += 1
-            else:
-                break
-
-        return streak
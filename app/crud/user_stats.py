@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import uuid
+from datetime import date, timezone
+from typing import Any, Dict, List, Optional, Type
+
+from sqlalchemy import case, delete, func, literal_column
+from sqlalchemy.dialects.postgresql import Insert, aggregate_order_by, array_agg, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import select
+
+from app.model.model import UserActivity, UserDailyActivity, UserStats
+
+_ROLLUP_COLUMNS = [
+    "sessions",
+    "scored_sessions",
+    "score_sum",
+    "score_max",
+    "time_spent",
+    "first_score",
+    "first_score_at",
+    "last_score",
+    "last_score_at",
+]
+
+# Lifetime rows only: least-squares sums of score on x = UTC epoch day, over the scored activities
+_SLOPE_COLUMNS = ["scored_day_sum", "scored_day_square_sum", "scored_day_score_sum"]
+
+_EPOCH = date(1970, 1, 1)
+
+
+def _activity_values(activity: UserActivity) -> Dict[str, Any]:
+    """Rollup columns for a single activity"""
+    scored = activity.score is not None
+    return {
+        "user_id": activity.user_id,
+        "skill": activity.type.lower(),
+        "practice_type": activity.practice_type or "",
+        "sessions": 1,
+        "scored_sessions": 1 if scored else 0,
+        "score_sum": activity.score if scored else 0,
+        "score_max": activity.score,
+        "time_spent": activity.time_spent or 0,
+        "first_score": activity.score,
+        "first_score_at": activity.created_at if scored else None,
+        "last_score": activity.score,
+        "last_score_at": activity.created_at if scored else None,
+    }
+
+
+def _slope_values(activity: UserActivity) -> Dict[str, Any]:
+    """Least-squares sums for a single activity"""
+    if activity.score is None:
+        return dict.fromkeys(_SLOPE_COLUMNS, 0)
+    day = (activity.created_at.astimezone(timezone.utc).date() - _EPOCH).days
+    return {
+        "scored_day_sum": day,
+        "scored_day_square_sum": day * day,
+        "scored_day_score_sum": day * activity.score,
+    }
+
+
+def _accumulate(stmt: Insert, model: Type[UserStats] | Type[UserDailyActivity]) -> Dict[str, Any]:
+    """ON CONFLICT assignments adding the inserted activity to the existing rollup row"""
+    excluded = stmt.excluded
+    # GREATEST ignores NULLs; first/last only move for a scored activity outside the known range
+    takes_first = excluded.first_score_at.is_not(None) & (
+        model.first_score_at.is_(None) | (excluded.first_score_at < model.first_score_at)
+    )
+    takes_last = excluded.last_score_at.is_not(None) & (
+        model.last_score_at.is_(None) | (excluded.last_score_at >= model.last_score_at)
+    )
+    return {
+        "sessions": model.sessions + excluded.sessions,
+        "scored_sessions": model.scored_sessions + excluded.scored_sessions,
+        "score_sum": model.score_sum + excluded.score_sum,
+        "score_max": func.greatest(model.score_max, excluded.score_max),
+        "time_spent": model.time_spent + excluded.time_spent,
+        "first_score": case((takes_first, excluded.first_score), else_=model.first_score),
+        "first_score_at": case((takes_first, excluded.first_score_at), else_=model.first_score_at),
+        "last_score": case((takes_last, excluded.last_score), else_=model.last_score),
+        "last_score_at": case((takes_last, excluded.last_score_at), else_=model.last_score_at),
+    }
+
+
+def _aggregates() -> List[Any]:
+    """Rollup columns aggregated over a group of activities, in _ROLLUP_COLUMNS order"""
+    scored = UserActivity.score.is_not(None)
+    oldest_first = array_agg(aggregate_order_by(UserActivity.score, UserActivity.created_at.asc())).filter(scored)
+    newest_first = array_agg(aggregate_order_by(UserActivity.score, UserActivity.created_at.desc())).filter(scored)
+    return [
+        func.count(),
+        func.count(UserActivity.score),
+        func.coalesce(func.sum(UserActivity.score), 0),
+        func.max(UserActivity.score),
+        func.coalesce(func.sum(UserActivity.time_spent), 0),
+        oldest_first[1],
+        func.min(UserActivity.created_at).filter(scored),
+        newest_first[1],
+        func.max(UserActivity.created_at).filter(scored),
+    ]
+
+
+def _slope_aggregates() -> List[Any]:
+    """Least-squares sums aggregated over a group of activities, in _SLOPE_COLUMNS order"""
+    scored = UserActivity.score.is_not(None)
+    day = _utc_day(UserActivity.created_at) - literal_column("DATE '1970-01-01'")
+    return [
+        func.coalesce(func.sum(day).filter(scored), 0),
+        func.coalesce(func.sum(day * day).filter(scored), 0),
+        func.coalesce(func.sum(day * UserActivity.score).filter(scored), 0),
+    ]
+
+
+def _utc_day(column: Any) -> Any:
+    # Literal rather than a bound parameter so GROUP BY expressions match the selected ones
+    return func.date(func.timezone(literal_column("'UTC'"), column))
+
+
+class UserStatsCrud:
+    @classmethod
+    async def record_activity(cls, db: AsyncSession, activity: UserActivity) -> None:
+        """
+        Add an activity to the user's lifetime and daily rollup rows; runs in the caller's transaction
+        """
+        values = _activity_values(activity)
+
+        stmt = insert(UserStats).values(**values, **_slope_values(activity), last_activity_at=activity.created_at)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[UserStats.user_id, UserStats.skill, UserStats.practice_type],
+            set_={
+                **_accumulate(stmt, UserStats),
+                **{column: getattr(UserStats, column) + stmt.excluded[column] for column in _SLOPE_COLUMNS},
+                "last_activity_at": func.greatest(UserStats.last_activity_at, stmt.excluded.last_activity_at),
+            },
+        )
+        await db.execute(stmt)
+
+        daily_stmt = insert(UserDailyActivity).values(**values, day=activity.created_at.astimezone(timezone.utc).date())
+        daily_stmt = daily_stmt.on_conflict_do_update(
+            index_elements=[
+                UserDailyActivity.user_id,
+                UserDailyActivity.day,
+                UserDailyActivity.skill,
+                UserDailyActivity.practice_type,
+            ],
+            set_=_accumulate(daily_stmt, UserDailyActivity),
+        )
+        await db.execute(daily_stmt)
+
+    @classmethod
+    async def get_user_stats(
+        cls, db: AsyncSession, user_id: uuid.UUID, practice_type: Optional[str] = None
+    ) -> List[UserStats]:
+        """
+        Get the lifetime rollup rows of a user, optionally for one practice type
+        """
+        query = select(UserStats).where(UserStats.user_id == user_id)
+        if practice_type is not None:
+            query = query.where(UserStats.practice_type == practice_type)
+        result = await db.execute(query)
+        return list(result.scalars().all())
+
+    @classmethod
+    async def get_daily_activity(
+        cls, db: AsyncSession, user_id: uuid.UUID, since: date, practice_type: Optional[str] = None
+    ) -> List[UserDailyActivity]:
+        """
+        Get the daily rollup rows of a user from the given UTC day on, optionally for one practice type
+        """
+        query = select(UserDailyActivity).where(UserDailyActivity.user_id == user_id, UserDailyActivity.day >= since)
+        if practice_type is not None:
+            query = query.where(UserDailyActivity.practice_type == practice_type)
+        result = await db.execute(query)
+        return list(result.scalars().all())
+
+    @classmethod
+    async def rebuild(cls, db: AsyncSession, user_id: Optional[uuid.UUID] = None) -> int:
+        """
+        Recompute the lifetime rollup from user_activities for one user or everyone; returns the rows written
+        """
+        skill = func.lower(UserActivity.type)
+        practice_type = func.coalesce(UserActivity.practice_type, literal_column("''"))
+        source = select(
+            UserActivity.user_id,
+            skill,
+            practice_type,
+            *_aggregates(),
+            *_slope_aggregates(),
+            func.max(UserActivity.created_at),
+        ).group_by(UserActivity.user_id, skill, practice_type)
+        columns = ["user_id", "skill", "practice_type", *_ROLLUP_COLUMNS, *_SLOPE_COLUMNS, "last_activity_at"]
+        return await cls._replace(db, UserStats, columns, source, user_id)
+
+    @classmethod
+    async def rebuild_daily(
+        cls, db: AsyncSession, user_id: Optional[uuid.UUID] = None, since: Optional[date] = None
+    ) -> int:
+        """
+        Recompute the daily rollup from user_activities, for one user or everyone and optionally only from a UTC
+        day on; returns the rows written
+        """
+        day = _utc_day(UserActivity.created_at)
+        skill = func.lower(UserActivity.type)
+        practice_type = func.coalesce(UserActivity.practice_type, literal_column("''"))
+        source = select(UserActivity.user_id, day, skill, practice_type, *_aggregates()).group_by(
+            UserActivity.user_id, day, skill, practice_type
+        )
+        columns = ["user_id", "day", "skill", "practice_type", *_ROLLUP_COLUMNS]
+        return await cls._replace(db, UserDailyActivity, columns, source, user_id, since)
+
+    @classmethod
+    async def _replace(
+        cls,
+        db: AsyncSession,
+        model: Type[UserStats] | Type[UserDailyActivity],
+        columns: List[str],
+        source: Any,
+        user_id: Optional[uuid.UUID],
+        since: Optional[date] = None,
+    ) -> int:
+        delete_stmt = delete(model)
+        if user_id is not None:
+            source = source.where(UserActivity.user_id == user_id)
+            delete_stmt = delete_stmt.where(model.user_id == user_id)
+        if since is not None:
+            source = source.where(_utc_day(UserActivity.created_at) >= since)
+            delete_stmt = delete_stmt.where(UserDailyActivity.day >= since)
+
+        await db.execute(delete_stmt)
+        result = await db.execute(insert(model).from_select(columns, source))
+        await db.commit()
+        return result.rowcount
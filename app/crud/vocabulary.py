@@ -3,23 +3,27 @@ from __future__ import annotations
 import uuid
 from typing import List, Optional
 
+from sqlalchemy import delete, insert, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import select
 
+from app.common.utils.pagination import Cursor, keyset_page, split_page
+from app.crud.user import UserCrud
 from app.model.model import Vocabulary
 
 
 class VocabularyCrud:
     @classmethod
-    async def get_user_vocabulary(cls, db: AsyncSession, user_id: uuid.UUID, limit: int = 100) -> List[Vocabulary]:
+    async def get_user_vocabulary(
+        cls, db: AsyncSession, user_id: uuid.UUID, limit: int = 100, after: Optional[Cursor] = None
+    ) -> tuple[List[Vocabulary], Optional[Cursor]]:
         """
-        Get vocabulary list for a specific user.
-        Returns vocabulary ordered by creation date (newest first).
+        Get a page of the vocabulary list of a specific user.
+        Returns vocabulary ordered by creation date (newest first), and the position of the next page.
         """
-        result = await db.execute(
-            select(Vocabulary).where(Vocabulary.user_id == user_id).order_by(Vocabulary.created_at.desc()).limit(limit)
-        )
-        return result.scalars().all()
+        query = select(Vocabulary).where(Vocabulary.user_id == user_id)
+        result = await db.execute(keyset_page(query, Vocabulary, limit, after))
+        return split_page(result.scalars().all(), limit)
 
     @classmethod
     async def get_vocabulary_by_id(cls, db: AsyncSession, vocabulary_id: uuid.UUID) -> Optional[Vocabulary]:
@@ -45,16 +49,12 @@ class VocabularyCrud:
         context: Optional[str] = None,
     ) -> Vocabulary:
         """Create a new vocabulary item"""
-        vocabulary = Vocabulary(
-            user_id=user_id,
-            word=word,
-            source=source,
-            notes=context,
+        result = await db.execute(
+            insert(Vocabulary).values(user_id=user_id, word=word, source=source, notes=context).returning(Vocabulary)
         )
-
-        db.add(vocabulary)
+        vocabulary = result.scalar_one()
+        await UserCrud.bump_data_version(db, user_id)
         await db.commit()
-        await db.refresh(vocabulary)
 
         return vocabulary
 
@@ -101,21 +101,31 @@ class VocabularyCrud:
         Update vocabulary word status.
         Returns None if vocabulary not found or doesn't belong to user.
         """
-        # Get vocabulary item and verify ownership
-        vocabulary = await cls.get_vocabulary_by_id(db, vocabulary_id)
-        if not vocabulary or vocabulary.user_id != user_id:
-            return None
-
         # Update fields if provided
+        values: dict = {}
         if reviewed is not None:
-            vocabulary.reviewed = reviewed
+            values["reviewed"] = reviewed
         if mastered is not None:
-            vocabulary.mastered = mastered
+            values["mastered"] = mastered
         if notes is not None:
-            vocabulary.notes = notes
+            values["notes"] = notes
+
+        if not values:
+            vocabulary = await cls.get_vocabulary_by_id(db, vocabulary_id)
+            return vocabulary if vocabulary and vocabulary.user_id == user_id else None
 
+        # Ownership is part of the WHERE clause, so a foreign or missing item updates nothing
+        result = await db.execute(
+            update(Vocabulary)
+            .where(Vocabulary.id == vocabulary_id, Vocabulary.user_id == user_id)
+            .values(**values)
+            .returning(Vocabulary)
+            .execution_options(populate_existing=True)
+        )
+        vocabulary = result.scalar_one_or_none()
+        if vocabulary is not None:
+            await UserCrud.bump_data_version(db, user_id)
         await db.commit()
-        await db.refresh(vocabulary)
 
         return vocabulary
 
@@ -130,13 +140,15 @@ class VocabularyCrud:
         Delete vocabulary word.
         Returns True if deleted successfully, False if not found or doesn't belong to user.
         """
-        # Get vocabulary item and verify ownership
-        vocabulary = await cls.get_vocabulary_by_id(db, vocabulary_id)
-        if not vocabulary or vocabulary.user_id != user_id:
-            return False
-
-        # Delete the vocabulary item
-        await db.delete(vocabulary)
+        # Ownership is part of the WHERE clause, so a foreign or missing item deletes nothing
+        result = await db.execute(
+            delete(Vocabulary)
+            .where(Vocabulary.id == vocabulary_id, Vocabulary.user_id == user_id)
+            .returning(Vocabulary.id)
+        )
+        deleted_id = result.scalar_one_or_none()
+        if deleted_id is not None:
+            await UserCrud.bump_data_version(db, user_id)
         await db.commit()
 
-        return True
+        return deleted_id is not None
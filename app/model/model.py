@@ -1,14 +1,17 @@
 import uuid
-from datetime import datetime
-from typing import LiteralString, Optional
+from datetime import date, datetime
+from typing import List, LiteralString, Optional
 
 from sqlalchemy import (
     JSON,
+    BigInteger,
     Boolean,
+    CheckConstraint,
     Date,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
@@ -16,6 +19,7 @@ from sqlalchemy import (
     text,
 )
 from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import relationship
 from sqlalchemy.orm.attributes import Mapped
 from sqlalchemy.sql.schema import Column
 
@@ -41,6 +45,8 @@ class User(Base):
     updated_at: Mapped[datetime] = Column(
         DateTime(timezone=True), nullable=False, server_default=text("CURRENT_TIMESTAMP")
     )
+    # Bumped by every write to the user's data; part of the cache keys and ETags of per-user reads
+    data_version: Mapped[int] = Column(BigInteger, nullable=False, server_default=text("0"))
 
 
 class OtpCode(Base):
@@ -55,6 +61,14 @@ class OtpCode(Base):
         DateTime(timezone=True), nullable=False, server_default=text("CURRENT_TIMESTAMP")
     )
 
+    __table_args__ = (
+        # Latest code per email (issue path)
+        Index("ix_otp_codes_email_created_at", email, created_at.desc()),
+        # Latest unused code per email (verify path)
+        Index("ix_otp_codes_email_unused", email, created_at.desc(), postgresql_where=text("NOT used")),
+        Index("ix_otp_codes_expires_at", expires_at),
+    )
+
 
 class Passage(Base):
     __tablename__ = "passages"
@@ -69,6 +83,14 @@ class Passage(Base):
         DateTime(timezone=True), nullable=False, server_default=text("CURRENT_TIMESTAMP")
     )
 
+    # Never lazy-loaded: load it explicitly, e.g. with selectinload(Passage.questions)
+    questions: Mapped[List["PracticeQuestion"]] = relationship(order_by="PracticeQuestion.created_at", lazy="raise")
+
+    __table_args__ = (
+        # Keyset pages per skill, newest first (scanned backwards)
+        Index("ix_passages_skill_created_at_id", skill, created_at, id),
+    )
+
 
 class PracticeQuestion(Base):
     __tablename__ = "practice_questions"
@@ -76,7 +98,9 @@ class PracticeQuestion(Base):
     id: Mapped[uuid.UUID] = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     skill: Mapped[str] = Column(String(50), nullable=False)
     question_type: Mapped[str] = Column(String(50), nullable=False)
-    passage_id: Mapped[Optional[uuid.UUID]] = Column(UUID(as_uuid=True), ForeignKey("passages.id"), nullable=True)
+    passage_id: Mapped[Optional[uuid.UUID]] = Column(
+        UUID(as_uuid=True), ForeignKey("passages.id"), nullable=True, index=True
+    )
     question_text: Mapped[str] = Column(Text, nullable=False)
     options: Mapped[Optional[dict]] = Column(JSONB, nullable=True)
     correct_answer: Mapped[Optional[str]] = Column(Text, nullable=True)
@@ -86,6 +110,17 @@ class PracticeQuestion(Base):
         DateTime(timezone=True), nullable=False, server_default=text("CURRENT_TIMESTAMP")
     )
 
+    __table_args__ = (
+        # Keyset pages of standalone (speaking and writing) questions per skill
+        Index(
+            "ix_practice_questions_standalone_skill_created_at_id",
+            skill,
+            created_at,
+            id,
+            postgresql_where=text("passage_id IS NULL"),
+        ),
+    )
+
 
 class MockTest(Base):
     __tablename__ = "mock_tests"
@@ -99,6 +134,19 @@ class MockTest(Base):
         DateTime(timezone=True), nullable=False, server_default=text("CURRENT_TIMESTAMP")
     )
 
+    __table_args__ = (Index("ix_mock_tests_created_at_id", created_at, id),)
+
+
+class ContentVersion(Base):
+    """Single row counter bumped by triggers on every change to passages, practice_questions and mock_tests"""
+
+    __tablename__ = "content_version"
+
+    id: Mapped[int] = Column(Integer, primary_key=True, server_default=text("1"))
+    version: Mapped[int] = Column(BigInteger, nullable=False, server_default=text("0"))
+
+    __table_args__ = (CheckConstraint("id = 1", name="ck_content_version_single_row"),)
+
 
 class UserActivity(Base):
     __tablename__ = "user_activities"
@@ -116,6 +164,55 @@ class UserActivity(Base):
         DateTime(timezone=True), nullable=False, server_default=text("CURRENT_TIMESTAMP")
     )
 
+    __table_args__ = (
+        # Keyset pages of a user's activities, newest first (scanned backwards)
+        Index("ix_user_activities_user_id_created_at_id", user_id, created_at, id),
+    )
+
+
+class UserStats(Base):
+    """Lifetime totals of a user's activities per skill and practice type, maintained by UserStatsCrud"""
+
+    __tablename__ = "user_stats"
+
+    user_id: Mapped[uuid.UUID] = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    skill: Mapped[str] = Column(String(50), primary_key=True)  # lower-cased activity type
+    practice_type: Mapped[str] = Column(String(50), primary_key=True, server_default=text("''"))  # '' when unset
+    sessions: Mapped[int] = Column(Integer, nullable=False, server_default=text("0"))
+    scored_sessions: Mapped[int] = Column(Integer, nullable=False, server_default=text("0"))
+    score_sum: Mapped[float] = Column(Numeric(12, 1), nullable=False, server_default=text("0"))
+    score_max: Mapped[Optional[float]] = Column(Numeric(3, 1), nullable=True)
+    time_spent: Mapped[int] = Column(Integer, nullable=False, server_default=text("0"))  # in minutes
+    first_score: Mapped[Optional[float]] = Column(Numeric(3, 1), nullable=True)
+    first_score_at: Mapped[Optional[datetime]] = Column(DateTime(timezone=True), nullable=True)
+    last_score: Mapped[Optional[float]] = Column(Numeric(3, 1), nullable=True)
+    last_score_at: Mapped[Optional[datetime]] = Column(DateTime(timezone=True), nullable=True)
+    last_activity_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=False)
+    # Least-squares sums of score on x = UTC epoch day over the scored activities, for the lifetime trend slope
+    scored_day_sum: Mapped[int] = Column(BigInteger, nullable=False, server_default=text("0"))
+    scored_day_square_sum: Mapped[int] = Column(BigInteger, nullable=False, server_default=text("0"))
+    scored_day_score_sum: Mapped[float] = Column(Numeric(20, 1), nullable=False, server_default=text("0"))
+
+
+class UserDailyActivity(Base):
+    """Per-day totals of a user's activities per skill and practice type (UTC days), maintained by UserStatsCrud"""
+
+    __tablename__ = "user_daily_activity"
+
+    user_id: Mapped[uuid.UUID] = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    day: Mapped[date] = Column(Date, primary_key=True)
+    skill: Mapped[str] = Column(String(50), primary_key=True)  # lower-cased activity type
+    practice_type: Mapped[str] = Column(String(50), primary_key=True, server_default=text("''"))  # '' when unset
+    sessions: Mapped[int] = Column(Integer, nullable=False, server_default=text("0"))
+    scored_sessions: Mapped[int] = Column(Integer, nullable=False, server_default=text("0"))
+    score_sum: Mapped[float] = Column(Numeric(12, 1), nullable=False, server_default=text("0"))
+    score_max: Mapped[Optional[float]] = Column(Numeric(3, 1), nullable=True)
+    time_spent: Mapped[int] = Column(Integer, nullable=False, server_default=text("0"))  # in minutes
+    first_score: Mapped[Optional[float]] = Column(Numeric(3, 1), nullable=True)
+    first_score_at: Mapped[Optional[datetime]] = Column(DateTime(timezone=True), nullable=True)
+    last_score: Mapped[Optional[float]] = Column(Numeric(3, 1), nullable=True)
+    last_score_at: Mapped[Optional[datetime]] = Column(DateTime(timezone=True), nullable=True)
+
 
 class Vocabulary(Base):
     __tablename__ = "vocabulary"
@@ -132,6 +229,11 @@ class Vocabulary(Base):
         DateTime(timezone=True), nullable=False, server_default=text("CURRENT_TIMESTAMP")
     )
 
+    __table_args__ = (
+        # Keyset pages of a user's vocabulary, newest first (scanned backwards)
+        Index("ix_vocabulary_user_id_created_at_id", user_id, created_at, id),
+    )
+
 
 class StudyPlan(Base):
     __tablename__ = "study_plans"
@@ -29,6 +29,10 @@ class VerifyOtpRequest(BaseModel):
     otp: str
 
 
+class RefreshTokenRequest(BaseModel):
+    refreshToken: str
+
+
 class UpdateProfileRequest(BaseModel):
     name: str | None = Field(default=None, min_length=2, max_length=50)
     email: EmailStr | None = None
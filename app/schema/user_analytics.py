@@ -10,6 +10,7 @@ class SkillAnalytics(BaseModel):
     bestScore: float
     totalTimeSpent: int  # in minutes
     improvementTrend: float  # percentage improvement over time
+    improvementSlope: float = 0.0  # least-squares change in score per day
 
 
 class UserAnalyticsResponse(BaseModel):
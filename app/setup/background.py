@@ -0,0 +1,47 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """
+    Runs a coroutine function at a fixed interval for the lifetime of the application.
+
+    A failing run is logged and the next one still happens on schedule.
+    """
+
+    def __init__(self, name: str, interval_seconds: float, func: Callable[[], Awaitable[object]]) -> None:
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self._func = func
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """
+        Schedules the task on the running event loop; does nothing when the interval is not positive.
+        """
+        if self._task is None and self.interval_seconds > 0:
+            self._task = asyncio.create_task(self._run(), name=self.name)
+
+    async def stop(self) -> None:
+        """
+        Cancels the task and waits for the current run to unwind.
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self._func()
+            except Exception:
+                logger.exception("Periodic task %s failed", self.name)
@@ -1,6 +1,11 @@
+import asyncio
 import contextlib
-from typing import AsyncIterator, LiteralString
+import itertools
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, LiteralString
 
+from sqlalchemy import event, exc
 from sqlalchemy.ext.asyncio import (
     AsyncConnection,
     AsyncEngine,
@@ -8,9 +13,14 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.orm import declarative_base, declared_attr
+from sqlalchemy.orm import Session, declarative_base, declared_attr
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
 
 from app.common.exceptions.db_session import DatabaseSessionManagerInitializeError
+from app.setup.instrumentation import instrument_engine
+
+# Clients whose reads can be pinned to the primary at once; beyond that the oldest writes are forgotten first
+_MAX_RECENT_WRITES = 10_000
 
 
 class BaseTableName:
@@ -31,6 +41,77 @@ class BaseTableName:
 Base = declarative_base(cls=BaseTableName)
 
 
+class PoolStats:
+    """
+    Running counters describing how requests wait on the connection pool.
+    """
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.timeouts = 0
+        self.overflow_hits = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record_checkout(self, wait_seconds: float, overflowed: bool) -> None:
+        """
+        Records a successful checkout and how long it took.
+
+        Parameters
+        ----------
+        wait_seconds : float
+            Time spent waiting for (or connecting) the connection.
+        overflowed : bool
+            Whether the checkout had to open a connection beyond ``pool_size``.
+        """
+        self.checkouts += 1
+        self.total_wait_seconds += wait_seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+        if overflowed:
+            self.overflow_hits += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """
+        Returns the counters as a JSON friendly dictionary.
+        """
+        average_wait = self.total_wait_seconds / self.checkouts if self.checkouts else 0.0
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "overflowHits": self.overflow_hits,
+            "avgWaitMs": round(average_wait * 1000, 3),
+            "maxWaitMs": round(self.max_wait_seconds * 1000, 3),
+        }
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that measures checkout wait time, overflow usage and timeouts.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        overflow_before = self._overflow
+        try:
+            entry = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        overflowed = self._overflow > max(overflow_before, 0)
+        self.stats.record_checkout(time.perf_counter() - started, overflowed)
+        return entry
+
+
+class PrimarySession(Session):
+    """
+    Session class used for the primary engine; commits are reported back to the session manager.
+    """
+
+
 class DatabaseSessionManager:
     """
     A class to manage database sessions and connections.
@@ -40,14 +121,26 @@ class DatabaseSessionManager:
     Attributes
     ----------
     _engine : AsyncEngine
-        the async engine used to connect to the database
+        the async engine used to connect to the primary database
     _sessionmaker : async_sessionmaker[AsyncSession]
-        the async sessionmaker used to create sessions
+        the async sessionmaker used to create primary sessions
+    _replica_engines : list[AsyncEngine]
+        the async engines used to connect to read replicas
+    _replica_sessionmakers : list[async_sessionmaker[AsyncSession]]
+        the async sessionmakers used to create read-only sessions
+    _recent_writes : OrderedDict[str, float]
+        monotonic deadlines until which a client's reads stick to the primary, earliest first
 
     Methods
     -------
-    init(database_url: str) -> None:
-        Initializes the database session manager with the given database URL.
+    init(database_url: str, ...) -> None:
+        Initializes the database session manager with the given database URL and pool options.
+
+    warmup(connections: int) -> None:
+        Opens connections up front so the first requests don't pay the connect cost.
+
+    pool_status() -> dict:
+        Returns live pool occupancy and checkout statistics.
 
     close() -> None:
         Closes the database session manager.
@@ -55,8 +148,14 @@ class DatabaseSessionManager:
     connect() -> AsyncIterator[AsyncConnection]:
         Connects to the database and returns an async connection.
 
-    session() -> AsyncIterator[AsyncSession]:
-        Creates a new async session and returns it.
+    session(sticky_key: str | None) -> AsyncIterator[AsyncSession]:
+        Creates a new async session on the primary and returns it.
+
+    read_session(sticky_key: str | None) -> AsyncIterator[AsyncSession]:
+        Creates a new async session on a replica (or the primary after a recent write) and returns it.
+
+    release(session: AsyncSession) -> None:
+        Returns the session's connection to the pool while keeping loaded objects readable.
 
     create_all(connection: AsyncConnection) -> None:
         Creates all tables in the database.
@@ -71,18 +170,84 @@ class DatabaseSessionManager:
         """
         self._engine: AsyncEngine | None = None
         self._sessionmaker: async_sessionmaker[AsyncSession] | None = None
-
-    def init(self, database_url: str) -> None:
+        self._replica_engines: list[AsyncEngine] = []
+        self._replica_sessionmakers: list[async_sessionmaker[AsyncSession]] = []
+        self._replica_strategy = "round_robin"
+        self._replica_counter = itertools.count()
+        self._read_your_writes_seconds = 0.0
+        self._recent_writes: OrderedDict[str, float] = OrderedDict()
+
+    def init(
+        self,
+        database_url: str,
+        *,
+        replica_urls: list[str] | None = None,
+        replica_strategy: str = "round_robin",
+        read_your_writes_seconds: float = 0.0,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30.0,
+        pool_recycle: int = -1,
+        pool_pre_ping: bool = False,
+        statement_cache_size: int = 100,
+    ) -> None:
         """
         Initializes the database session manager with the given database URL.
 
         Parameters
         ----------
         database_url : str
-            The URL of the database to connect to.
+            The URL of the primary database to connect to.
+        replica_urls : list[str] | None
+            The URLs of read replicas; reads go to the primary when empty.
+        replica_strategy : str
+            How to pick a replica, ``round_robin`` or ``least_busy``.
+        read_your_writes_seconds : float
+            How long reads stay on the primary after a client committed a write.
+        pool_size : int
+            Number of connections kept open in each pool.
+        max_overflow : int
+            Number of connections allowed beyond ``pool_size`` under load.
+        pool_timeout : float
+            Seconds to wait for a free connection before raising.
+        pool_recycle : int
+            Seconds after which a connection is replaced, ``-1`` to disable.
+        pool_pre_ping : bool
+            Whether to test connections for liveness on checkout.
+        statement_cache_size : int
+            Size of the asyncpg prepared statement cache, ``0`` to disable (e.g. behind PgBouncer).
         """
-        self._engine = create_async_engine(database_url, future=True)
-        self._sessionmaker = async_sessionmaker(autocommit=False, bind=self._engine)
+        if replica_strategy not in ("round_robin", "least_busy"):
+            raise ValueError(f"Unknown replica strategy: {replica_strategy}")
+
+        engine_options: dict[str, Any] = {
+            "future": True,
+            "poolclass": InstrumentedAsyncAdaptedQueuePool,
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": pool_timeout,
+            "pool_recycle": pool_recycle,
+            "pool_pre_ping": pool_pre_ping,
+            "connect_args": {
+                "prepared_statement_cache_size": statement_cache_size,
+                "statement_cache_size": statement_cache_size,
+            },
+        }
+        self._engine = create_async_engine(database_url, **engine_options)
+        # Writes return their rows with RETURNING, so committed objects don't need to be reloaded
+        self._sessionmaker = async_sessionmaker(
+            autocommit=False, expire_on_commit=False, bind=self._engine, sync_session_class=PrimarySession
+        )
+        self._replica_engines = [create_async_engine(url, **engine_options) for url in replica_urls or []]
+        self._replica_sessionmakers = [
+            async_sessionmaker(autocommit=False, expire_on_commit=False, bind=engine)
+            for engine in self._replica_engines
+        ]
+        for engine in [self._engine, *self._replica_engines]:
+            instrument_engine(engine)
+        self._replica_strategy = replica_strategy
+        self._read_your_writes_seconds = read_your_writes_seconds
+        self._recent_writes.clear()
 
     async def close(self) -> None:
         """
@@ -90,9 +255,101 @@ class DatabaseSessionManager:
         """
         if self._engine is None:
             raise DatabaseSessionManagerInitializeError
-        await self._engine.dispose()
+        for engine in [self._engine, *self._replica_engines]:
+            await engine.dispose()
         self._engine = None
         self._sessionmaker = None
+        self._replica_engines = []
+        self._replica_sessionmakers = []
+
+    async def warmup(self, connections: int) -> None:
+        """
+        Opens the given number of connections concurrently on every engine and returns them to the pool.
+
+        Parameters
+        ----------
+        connections : int
+            How many connections to establish per engine, capped by the pool size.
+        """
+        if self._engine is None:
+            raise DatabaseSessionManagerInitializeError
+
+        async with contextlib.AsyncExitStack() as stack:
+            await asyncio.gather(
+                *(
+                    stack.enter_async_context(engine.connect())
+                    for engine in [self._engine, *self._replica_engines]
+                    for _ in range(min(connections, engine.pool.size()))
+                )
+            )
+
+    def pool_status(self) -> dict[str, Any]:
+        """
+        Returns live pool occupancy and checkout statistics for the primary and every replica.
+        """
+        if self._engine is None:
+            raise DatabaseSessionManagerInitializeError
+
+        status = self._engine_pool_status(self._engine)
+        status["replicas"] = [self._engine_pool_status(engine) for engine in self._replica_engines]
+        return status
+
+    @staticmethod
+    def _engine_pool_status(engine: AsyncEngine) -> dict[str, Any]:
+        pool = engine.pool
+        status: dict[str, Any] = {
+            "host": engine.url.host,
+            "size": pool.size(),
+            "checkedOut": pool.checkedout(),
+            "checkedIn": pool.checkedin(),
+            "overflow": pool.overflow(),
+        }
+        if isinstance(pool, InstrumentedAsyncAdaptedQueuePool):
+            status.update(pool.stats.as_dict())
+        return status
+
+    def mark_write(self, sticky_key: str) -> None:
+        """
+        Pins reads of the given client to the primary for the read-your-writes window.
+
+        Parameters
+        ----------
+        sticky_key : str
+            Identifies the client, e.g. a digest of its bearer token.
+        """
+        if not self._replica_sessionmakers or self._read_your_writes_seconds <= 0:
+            return
+        now = time.monotonic()
+        # Every deadline is now + the same window, so moving the key to the end keeps them in expiry order
+        self._recent_writes[sticky_key] = now + self._read_your_writes_seconds
+        self._recent_writes.move_to_end(sticky_key)
+        while self._recent_writes:
+            key, until = next(iter(self._recent_writes.items()))
+            if until > now and len(self._recent_writes) <= _MAX_RECENT_WRITES:
+                break
+            # Expired, or the oldest write once the cap is reached: that client may read a replica a bit early
+            del self._recent_writes[key]
+
+    def _wrote_recently(self, sticky_key: str | None) -> bool:
+        if sticky_key is None:
+            return False
+        until = self._recent_writes.get(sticky_key)
+        if until is None:
+            return False
+        if until <= time.monotonic():
+            self._recent_writes.pop(sticky_key, None)
+            return False
+        return True
+
+    def _pick_replica(self) -> async_sessionmaker[AsyncSession]:
+        if self._replica_strategy == "least_busy":
+            index = min(
+                range(len(self._replica_engines)),
+                key=lambda i: self._replica_engines[i].pool.checkedout(),
+            )
+        else:
+            index = next(self._replica_counter) % len(self._replica_sessionmakers)
+        return self._replica_sessionmakers[index]
 
     @contextlib.asynccontextmanager
     async def connect(self) -> AsyncIterator[AsyncConnection]:
@@ -110,14 +367,49 @@ class DatabaseSessionManager:
                 raise
 
     @contextlib.asynccontextmanager
-    async def session(self) -> AsyncIterator[AsyncSession]:
+    async def session(self, sticky_key: str | None = None) -> AsyncIterator[AsyncSession]:
         """
-        Creates a new async session and returns it.
+        Creates a new async session on the primary and returns it.
+
+        Parameters
+        ----------
+        sticky_key : str | None
+            Identifies the client so its following reads can be pinned to the primary after a commit.
         """
         if self._sessionmaker is None:
             raise DatabaseSessionManagerInitializeError
 
         session = self._sessionmaker()
+        session.info["sticky_key"] = sticky_key
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    @contextlib.asynccontextmanager
+    async def read_session(self, sticky_key: str | None = None) -> AsyncIterator[AsyncSession]:
+        """
+        Creates a new async session for read-only work and returns it.
+
+        The session is bound to a replica unless none is configured or the client wrote recently.
+
+        Parameters
+        ----------
+        sticky_key : str | None
+            Identifies the client for read-your-writes stickiness.
+        """
+        if self._sessionmaker is None:
+            raise DatabaseSessionManagerInitializeError
+
+        if not self._replica_sessionmakers or self._wrote_recently(sticky_key):
+            async with self.session(sticky_key) as session:
+                yield session
+            return
+
+        session = self._pick_replica()()
         try:
             yield session
         except Exception:
@@ -126,6 +418,24 @@ class DatabaseSessionManager:
         finally:
             await session.close()
 
+    @staticmethod
+    async def release(session: AsyncSession) -> None:
+        """
+        Ends the session's transaction and returns its connection to the pool.
+
+        Sessions only check out a connection on their first query and hold it until the transaction ends,
+        so read-only work should release before a slow await (LLM call, email, ...). Loaded objects stay
+        readable as detached instances and the session checks out a new connection if it is queried again.
+        Uncommitted changes are discarded, so only call this after committing or for read-only work.
+
+        Parameters
+        ----------
+        session : AsyncSession
+            The session whose connection should be released.
+        """
+        if session.in_transaction():
+            await session.close()
+
     @staticmethod
     async def create_all(connection: AsyncConnection) -> None:
         """
@@ -152,3 +462,10 @@ class DatabaseSessionManager:
 
 
 sessionmanager = DatabaseSessionManager()
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _remember_write(session: Session) -> None:
+    sticky_key = session.info.get("sticky_key")
+    if sticky_key is not None:
+        sessionmanager.mark_write(sticky_key)
@@ -0,0 +1,285 @@
+import asyncio
+import contextlib
+import hashlib
+import logging
+import random
+import re
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# SELECTs whose execution has effects beyond reading: row locks and calls of volatile functions with side effects
+_SIDE_EFFECTS = re.compile(
+    r"\bFOR\s+(NO\s+KEY\s+UPDATE|UPDATE|KEY\s+SHARE|SHARE)\b"
+    r"|\b(pg_notify|nextval|setval|set_config|pg_(try_)?advisory_\w+|dblink\w*)\s*\(",
+    re.IGNORECASE,
+)
+
+
+class RequestQueryStats:
+    """
+    Statements executed while serving a single request.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration_seconds = 0.0
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, duration_seconds: float) -> None:
+        """
+        Records one executed statement.
+
+        Parameters
+        ----------
+        statement : str
+            The SQL sent to the driver, with bound parameters as placeholders.
+        duration_seconds : float
+            Time spent executing the statement.
+        """
+        self.count += 1
+        self.duration_seconds += duration_seconds
+        self.shapes[statement] += 1
+
+
+_request_query_stats: ContextVar[RequestQueryStats | None] = ContextVar("request_query_stats", default=None)
+
+
+def get_request_query_stats() -> RequestQueryStats | None:
+    """
+    Returns the statistics of the request being served, if any.
+    """
+    return _request_query_stats.get()
+
+
+@contextlib.contextmanager
+def count_queries() -> Iterator[RequestQueryStats]:
+    """
+    Counts the statements executed on instrumented engines until the block exits.
+    """
+    stats = RequestQueryStats()
+    token = _request_query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _request_query_stats.reset(token)
+
+
+class SlowQueryRecorder:
+    """
+    Logs statements slower than a threshold and keeps the latest ones in a bounded ring.
+
+    A sample of the slow SELECT statements is re-run with ``EXPLAIN (ANALYZE, BUFFERS)`` on a separate connection
+    in the background, and the plan is stored with the entry. Statements that modify data are never re-run, and
+    SELECTs that lock rows or call side-effecting functions (``pg_notify``, ``nextval``, ...) only get a plain
+    ``EXPLAIN``, which plans without executing.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.threshold_seconds = 0.2
+        self.explain_sample_rate = 0.0
+        self._entries: deque[dict[str, Any]] = deque(maxlen=100)
+        self._explain_tasks: set[asyncio.Task] = set()
+
+    def configure(self, *, enabled: bool, threshold_ms: float, explain_sample_rate: float, ring_size: int) -> None:
+        """
+        Applies the recorder settings.
+
+        Parameters
+        ----------
+        enabled : bool
+            Whether slow statements are recorded at all.
+        threshold_ms : float
+            Statements taking longer than this are considered slow.
+        explain_sample_rate : float
+            Fraction (0..1) of slow SELECT statements that get an EXPLAIN captured.
+        ring_size : int
+            Number of slow statements kept in memory.
+        """
+        self.enabled = enabled
+        self.threshold_seconds = threshold_ms / 1000
+        self.explain_sample_rate = explain_sample_rate
+        self._entries = deque(self._entries, maxlen=ring_size)
+
+    def entries(self) -> list[dict[str, Any]]:
+        """
+        Returns the recorded slow statements, newest first.
+        """
+        return list(reversed(self._entries))
+
+    def record(
+        self, engine: AsyncEngine, statement: str, parameters: Any, executemany: bool, duration_seconds: float
+    ) -> None:
+        """
+        Records the statement if it was slow.
+
+        Parameters
+        ----------
+        engine : AsyncEngine
+            The engine the statement ran on, used to capture the plan.
+        statement : str
+            The SQL sent to the driver.
+        parameters : Any
+            The bound parameters.
+        executemany : bool
+            Whether the statement ran once per parameter set.
+        duration_seconds : float
+            Time spent executing the statement.
+        """
+        if not self.enabled or duration_seconds < self.threshold_seconds or statement.startswith("EXPLAIN"):
+            return
+
+        normalized = " ".join(statement.split())
+        entry: dict[str, Any] = {
+            "statement": normalized,
+            "parametersFingerprint": hashlib.sha1(repr(parameters).encode()).hexdigest()[:16],
+            "durationMs": round(duration_seconds * 1000, 2),
+            "recordedAt": datetime.now(timezone.utc).isoformat(),
+            "plan": None,
+            "analyzed": False,
+        }
+        self._entries.append(entry)
+        logger.warning(
+            "Slow query (%.2f ms): %s",
+            entry["durationMs"],
+            normalized[:500],
+            extra={
+                "event": "db_slow_query",
+                "statement": normalized,
+                "parameters_fingerprint": entry["parametersFingerprint"],
+                "duration_ms": entry["durationMs"],
+            },
+        )
+
+        if not executemany and normalized.upper().startswith("SELECT") and random.random() < self.explain_sample_rate:
+            task = asyncio.get_running_loop().create_task(self._explain(engine, statement, parameters, entry))
+            self._explain_tasks.add(task)
+            task.add_done_callback(self._explain_tasks.discard)
+
+    @staticmethod
+    async def _explain(engine: AsyncEngine, statement: str, parameters: Any, entry: dict[str, Any]) -> None:
+        # The plan lookup must not be counted against whichever request happens to be running
+        _request_query_stats.set(None)
+        analyze = _SIDE_EFFECTS.search(statement) is None
+        explain = "EXPLAIN (ANALYZE, BUFFERS)" if analyze else "EXPLAIN"
+        try:
+            async with engine.connect() as connection:
+                result = await connection.exec_driver_sql(f"{explain} {statement}", parameters)
+                entry["plan"] = "\n".join(row[0] for row in result)
+                entry["analyzed"] = analyze
+                await connection.rollback()
+        except Exception:
+            logger.exception("Could not capture the plan of a slow query")
+
+
+slow_query_recorder = SlowQueryRecorder()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Attaches the statement timing hooks to the given engine.
+
+    Parameters
+    ----------
+    engine : AsyncEngine
+        The engine to instrument.
+    """
+
+    def before_cursor_execute(
+        conn: Connection, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> None:
+        conn.info["query_started_at"] = time.perf_counter()
+
+    def after_cursor_execute(
+        conn: Connection, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> None:
+        started_at = conn.info.pop("query_started_at", None)
+        if started_at is None:
+            return
+        duration_seconds = time.perf_counter() - started_at
+        stats = _request_query_stats.get()
+        if stats is not None:
+            stats.record(statement, duration_seconds)
+        slow_query_recorder.record(engine, statement, parameters, executemany, duration_seconds)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", after_cursor_execute)
+
+
+class QueryStatsMiddleware:
+    """
+    Counts the statements and database time of every request.
+
+    The totals are returned as ``X-DB-Query-Count`` and ``X-DB-Time-Ms`` response headers. A structured warning is
+    logged when a route exceeds its statement budget or runs the same SQL shape more often than the repeat threshold,
+    which usually means an N+1 query.
+    """
+
+    def __init__(self, app: ASGIApp, statement_budget: int, repeated_statement_threshold: int) -> None:
+        self.app = app
+        self.statement_budget = statement_budget
+        self.repeated_statement_threshold = repeated_statement_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with count_queries() as stats:
+
+            async def send_with_headers(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Query-Count"] = str(stats.count)
+                    headers["X-DB-Time-Ms"] = f"{stats.duration_seconds * 1000:.2f}"
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_headers)
+            finally:
+                self._report(scope, stats)
+
+    def _report(self, scope: Scope, stats: RequestQueryStats) -> None:
+        route = scope.get("route")
+        route_path = getattr(route, "path", scope["path"])
+        if stats.count > self.statement_budget:
+            logger.warning(
+                "Statement budget exceeded on %s %s: %d statements",
+                scope["method"],
+                route_path,
+                stats.count,
+                extra={
+                    "event": "db_statement_budget_exceeded",
+                    "method": scope["method"],
+                    "route": route_path,
+                    "statement_count": stats.count,
+                    "statement_budget": self.statement_budget,
+                    "db_time_ms": round(stats.duration_seconds * 1000, 2),
+                },
+            )
+        for statement, repeats in stats.shapes.items():
+            if repeats > self.repeated_statement_threshold:
+                logger.warning(
+                    "Possible N+1 on %s %s: same statement ran %d times",
+                    scope["method"],
+                    route_path,
+                    repeats,
+                    extra={
+                        "event": "db_repeated_statement",
+                        "method": scope["method"],
+                        "route": route_path,
+                        "repeats": repeats,
+                        "statement": " ".join(statement.split())[:500],
+                    },
+                )
@@ -0,0 +1,210 @@
+import asyncio
+import inspect
+import json
+import logging
+from typing import Any, Callable, Optional
+
+import asyncpg  # type: ignore[import-untyped]
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "cache_invalidation"
+
+
+class _Subscription:
+    __slots__ = ("invalidate", "clear", "invalidate_prefix")
+
+    def __init__(
+        self,
+        invalidate: Callable[[str], Any],
+        clear: Callable[[], Any],
+        invalidate_prefix: Optional[Callable[[str], Any]],
+    ) -> None:
+        self.invalidate = invalidate
+        self.clear = clear
+        self.invalidate_prefix = invalidate_prefix
+
+
+async def notify_invalidation(db: AsyncSession, namespace: str, key: str, prefix: bool = False) -> None:
+    """
+    Announces that a key (or every key starting with ``key`` when ``prefix`` is set) changed.
+
+    The notification is queued in the session's transaction, so Postgres delivers it to the other workers only
+    when the write commits, and never when it rolls back.
+
+    Parameters
+    ----------
+    db : AsyncSession
+        The session performing the write.
+    namespace : str
+        The cache namespace the subscribers registered for.
+    key : str
+        The changed key, or key prefix.
+    prefix : bool
+        Whether ``key`` is a prefix.
+    """
+    payload = json.dumps({"namespace": namespace, "key": key, "prefix": prefix})
+    await db.execute(select(func.pg_notify(INVALIDATION_CHANNEL, payload)))
+
+
+class InvalidationBus:
+    """
+    Keeps the process-local caches of every worker coherent with the database.
+
+    A dedicated asyncpg connection ``LISTEN``\\s on the invalidation channel and forwards each notification to the
+    subscribers of its namespace. The connection is checked periodically and reopened with backoff when lost. Every
+    time the channel is (re)established all subscribed caches are flushed, because notifications sent while nobody
+    was listening are gone; until then ``local_caching_safe`` is false and callers should bypass their caches.
+    """
+
+    def __init__(self) -> None:
+        self._subscriptions: dict[str, list[_Subscription]] = {}
+        self._task: asyncio.Task | None = None
+        self._listening = False
+        self._callback_tasks: set[asyncio.Task] = set()
+        self.notifications = 0
+        self.reconnects = 0
+
+    def subscribe(
+        self,
+        namespace: str,
+        invalidate: Callable[[str], Any],
+        clear: Callable[[], Any],
+        invalidate_prefix: Optional[Callable[[str], Any]] = None,
+    ) -> None:
+        """
+        Registers a local cache for the notifications of a namespace.
+
+        Parameters
+        ----------
+        namespace : str
+            The namespace writers pass to ``notify_invalidation``.
+        invalidate : Callable[[str], Any]
+            Drops one key; may return an awaitable.
+        clear : Callable[[], Any]
+            Drops everything; called after reconnecting, and for prefixes when ``invalidate_prefix`` is not given.
+        invalidate_prefix : Optional[Callable[[str], Any]]
+            Drops every key starting with the given prefix.
+        """
+        self._subscriptions.setdefault(namespace, []).append(_Subscription(invalidate, clear, invalidate_prefix))
+
+    @property
+    def local_caching_safe(self) -> bool:
+        """
+        Whether a process-local cache will hear about writes made by other workers.
+        """
+        return self._task is None or self._listening
+
+    @property
+    def listening(self) -> bool:
+        """
+        Whether notifications are being received right now; false when the bus was never started.
+        """
+        return self._listening
+
+    def start(self, dsn: str, keepalive_seconds: float) -> None:
+        """
+        Starts listening in the background.
+
+        Parameters
+        ----------
+        dsn : str
+            A libpq-style connection string for the primary database.
+        keepalive_seconds : float
+            How often the connection is checked while idle.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(dsn, keepalive_seconds), name="cache-invalidation-bus")
+
+    async def stop(self) -> None:
+        """
+        Stops listening and closes the connection.
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._listening = False
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Returns the state of the listener.
+        """
+        return {
+            "listening": self._listening,
+            "notifications": self.notifications,
+            "reconnects": self.reconnects,
+            "namespaces": sorted(self._subscriptions),
+        }
+
+    async def _run(self, dsn: str, keepalive_seconds: float) -> None:
+        backoff_seconds = 0.5
+        while True:
+            connection = None
+            lost = asyncio.Event()
+            try:
+                connection = await asyncpg.connect(dsn)
+                connection.add_termination_listener(lambda _: lost.set())
+                await connection.add_listener(INVALIDATION_CHANNEL, self._on_notification)
+                self._flush_all()
+                self._listening = True
+                backoff_seconds = 0.5
+                logger.info("Listening for cache invalidations on %s", INVALIDATION_CHANNEL)
+                while not lost.is_set():
+                    try:
+                        await asyncio.wait_for(lost.wait(), timeout=keepalive_seconds)
+                    except asyncio.TimeoutError:
+                        await connection.execute("SELECT 1", timeout=keepalive_seconds)
+                logger.warning("Cache invalidation connection closed, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Cache invalidation listener failed, reconnecting in %.1f s", backoff_seconds)
+            finally:
+                self._listening = False
+                if connection is not None and not connection.is_closed():
+                    connection.terminate()
+            self.reconnects += 1
+            await asyncio.sleep(backoff_seconds)
+            backoff_seconds = min(backoff_seconds * 2, 30.0)
+
+    def _on_notification(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed cache invalidation %r", payload)
+            return
+        self.notifications += 1
+        key = message["key"]
+        for subscription in self._subscriptions.get(message["namespace"], []):
+            if not message.get("prefix"):
+                self._call(subscription.invalidate, key)
+            elif subscription.invalidate_prefix is not None:
+                self._call(subscription.invalidate_prefix, key)
+            else:
+                self._call(subscription.clear)
+
+    def _flush_all(self) -> None:
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                self._call(subscription.clear)
+
+    def _call(self, callback: Callable[..., Any], *args: Any) -> None:
+        try:
+            result = callback(*args)
+        except Exception:
+            logger.exception("Cache invalidation callback failed")
+            return
+        if inspect.isawaitable(result):
+            task = asyncio.ensure_future(result)
+            self._callback_tasks.add(task)
+            task.add_done_callback(self._callback_tasks.discard)
+
+
+invalidation_bus = InvalidationBus()
@@ -2,6 +2,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware import Middleware
 
 from app.core.config import SETTINGS
+from app.setup.instrumentation import QueryStatsMiddleware
 
 middlewares = [
     Middleware(
@@ -12,3 +13,12 @@ middlewares = [
         allow_headers=SETTINGS.ALLOW_HEADERS,
     )
 ]
+
+if SETTINGS.DB_QUERY_STATS_ENABLED:
+    middlewares.append(
+        Middleware(
+            QueryStatsMiddleware,
+            statement_budget=SETTINGS.DB_STATEMENT_BUDGET,
+            repeated_statement_threshold=SETTINGS.DB_REPEATED_STATEMENT_THRESHOLD,
+        )
+    )
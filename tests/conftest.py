@@ -0,0 +1,48 @@
+import os
+
+import pytest
+
+# The settings are validated on import; only the database the tests run against is used
+for name, value in {
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_PORT": "5432",
+    "POSTGRES_DATABASE": "test",
+    "POSTGRES_USERNAME": "test",
+    "POSTGRES_PASSWORD": "test",
+    "ALLOW_ORIGINS": '["*"]',
+    "ALLOW_CREDENTIALS": "true",
+    "ALLOW_METHODS": '["*"]',
+    "ALLOW_HEADERS": '["*"]',
+}.items():
+    os.environ.setdefault(name, value)
+
+from app.setup.database import DatabaseSessionManager  # noqa: E402
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+
+@pytest.fixture
+async def sessionmanager():
+    """
+    A session manager on an empty schema of the database in ``TEST_DATABASE_URL``.
+    """
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    manager = DatabaseSessionManager()
+    manager.init(TEST_DATABASE_URL)
+    async with manager.connect() as connection:
+        await manager.drop_all(connection)
+        await manager.create_all(connection)
+    try:
+        yield manager
+    finally:
+        async with manager.connect() as connection:
+            await manager.drop_all(connection)
+        await manager.close()
+
+
+@pytest.fixture
+async def db(sessionmanager):
+    async with sessionmanager.session() as session:
+        yield session
@@ -0,0 +1,67 @@
+"""
+The rollup-backed analytics agree with a scan of the activities.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert
+
+from app.core.config import SETTINGS
+from app.crud.user import UserCrud
+from app.crud.user_analytics import UserAnalyticsCrud
+from app.crud.user_stats import UserStatsCrud
+from app.model.model import UserActivity
+from app.setup.instrumentation import count_queries
+
+
+async def _analytics(db, monkeypatch, user_id, use_rollups: bool) -> dict:
+    monkeypatch.setattr(SETTINGS, "ANALYTICS_USE_ROLLUPS", use_rollups)
+    return await UserAnalyticsCrud.get_user_analytics(db, user_id, time_range="all")
+
+
+@pytest.fixture
+async def user_id(db):
+    user = await UserCrud.create_user(db, name="Ann", email="ann@example.com")
+    now = datetime.now(timezone.utc)
+    scores = [5.0, 5.5, None, 6.0, 6.5, 6.5, 7.0, 7.5]
+    for days_ago, score in zip(range(400, 0, -50), scores):
+        for skill in ("reading", "listening"):
+            result = await db.execute(
+                insert(UserActivity)
+                .values(
+                    user_id=user.id,
+                    type=skill,
+                    practice_type="practice",
+                    score=score,
+                    band=score,
+                    time_spent=10,
+                    created_at=now - timedelta(days=days_ago),
+                )
+                .returning(UserActivity)
+            )
+            await UserStatsCrud.record_activity(db, result.scalar_one())
+    await db.commit()
+    return user.id
+
+
+def _slopes(analytics: dict) -> dict:
+    return {skill: stats["improvementSlope"] for skill, stats in analytics["skillBreakdown"].items()}
+
+
+async def test_lifetime_slope_matches_the_activities(db, monkeypatch, user_id):
+    expected = _slopes(await _analytics(db, monkeypatch, user_id, use_rollups=False))
+    assert expected["reading"] > 0
+
+    assert _slopes(await _analytics(db, monkeypatch, user_id, use_rollups=True)) == pytest.approx(expected)
+
+    await UserStatsCrud.rebuild(db, user_id)
+    assert _slopes(await _analytics(db, monkeypatch, user_id, use_rollups=True)) == pytest.approx(expected)
+
+
+async def test_lifetime_analytics_do_not_load_the_daily_rollup(db, monkeypatch, user_id):
+    with count_queries() as stats:
+        await _analytics(db, monkeypatch, user_id, use_rollups=True)
+
+    # Lifetime rollup rows, recent activities, streak aggregated in the database
+    assert stats.count == 3
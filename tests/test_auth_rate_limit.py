@@ -0,0 +1,43 @@
+"""
+The auth endpoints that issue or check an OTP are rate limited before any database work.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import create_app
+from app.common.utils.rate_limit import rate_limiter
+from app.core.config import SETTINGS
+
+
+@pytest.fixture(scope="module")
+def client():
+    # No lifespan: these requests are answered before the handlers touch the database
+    return TestClient(create_app())
+
+
+@pytest.mark.parametrize("path", ["/api/auth/login", "/api/auth/register", "/api/auth/verify-otp"])
+def test_invalid_body_is_reported_once(client, path):
+    response = client.post(path, json={"email": "not-an-email", "otp": "123456"})
+
+    assert response.status_code == 422
+    assert [error["loc"] for error in response.json()["detail"]] == [["body", "email"]]
+
+
+@pytest.mark.parametrize(
+    "path, scope, limit",
+    [
+        ("/api/auth/login", "login", SETTINGS.LOGIN_RATE_LIMIT_PER_EMAIL),
+        ("/api/auth/register", "register", SETTINGS.REGISTER_RATE_LIMIT_PER_EMAIL),
+        ("/api/auth/verify-otp", "verify-otp", SETTINGS.VERIFY_OTP_RATE_LIMIT_PER_EMAIL),
+    ],
+)
+async def test_email_over_the_limit_is_rejected(client, path, scope, limit):
+    email = f"{scope}@example.com"
+    for _ in range(limit):
+        await rate_limiter.hit(f"{scope}:email:{email}", limit, SETTINGS.RATE_LIMIT_PERIOD_SECONDS)
+
+    response = client.post(path, json={"email": email, "otp": "123456"})
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
@@ -0,0 +1,100 @@
+"""
+Background email delivery against a local aiosmtpd sink.
+"""
+
+import asyncio
+import socket
+
+import pytest
+from aiosmtpd.controller import Controller
+from aiosmtpd.handlers import Message
+
+from app.common.utils.email import EmailDispatcher
+from app.core.config import SETTINGS
+
+
+class _Sink(Message):
+    def __init__(self) -> None:
+        super().__init__()
+        self.messages = []
+
+    def handle_message(self, message) -> None:
+        self.messages.append(message)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def sink(monkeypatch):
+    port = _free_port()
+    monkeypatch.setattr(SETTINGS, "SMTP_HOST", "127.0.0.1")
+    monkeypatch.setattr(SETTINGS, "SMTP_PORT", port)
+    monkeypatch.setattr(SETTINGS, "SMTP_USE_TLS", False)
+    monkeypatch.setattr(SETTINGS, "SMTP_USERNAME", None)
+    monkeypatch.setattr(SETTINGS, "SMTP_FROM_EMAIL", "no-reply@example.com")
+
+    handler = _Sink()
+    controllers = []
+
+    def start() -> None:
+        controller = Controller(handler, hostname="127.0.0.1", port=port)
+        controller.start()
+        controllers.append(controller)
+
+    def stop() -> None:
+        controllers.pop().stop()
+
+    start()
+    handler.start, handler.stop = start, stop
+    yield handler
+    while controllers:
+        stop()
+
+
+@pytest.fixture
+async def dispatcher():
+    dispatcher = EmailDispatcher()
+    await dispatcher.start(
+        pool_size=1,
+        queue_size=10,
+        max_retries=3,
+        retry_backoff_seconds=0.05,
+        timeout_seconds=5.0,
+        max_idle_seconds=60.0,
+    )
+    yield dispatcher
+    await dispatcher.stop()
+
+
+async def _delivered(sink: _Sink, count: int) -> list:
+    for _ in range(100):
+        if len(sink.messages) >= count:
+            return sink.messages
+        await asyncio.sleep(0.05)
+    raise AssertionError(f"{len(sink.messages)} of {count} emails delivered")
+
+
+async def test_enqueued_email_is_delivered(sink, dispatcher):
+    await dispatcher.enqueue("ann@example.com", subject="Your login code", body="Your OTP is 123456")
+
+    (message,) = await _delivered(sink, 1)
+    assert message["To"] == "ann@example.com"
+    assert message["Subject"] == "Your login code"
+    assert message.get_payload().strip() == "Your OTP is 123456"
+
+
+async def test_delivery_reconnects_after_the_server_restarts(sink, dispatcher):
+    await dispatcher.enqueue("ann@example.com", subject="First", body="1")
+    await _delivered(sink, 1)
+
+    # The worker's open session dies with the server
+    sink.stop()
+    sink.start()
+    await dispatcher.enqueue("ann@example.com", subject="Second", body="2")
+
+    messages = await _delivered(sink, 2)
+    assert [message["Subject"] for message in messages] == ["First", "Second"]
@@ -0,0 +1,50 @@
+"""
+Practice content is loaded with a fixed number of statements, however many passages a page holds.
+"""
+
+import pytest
+from sqlalchemy import insert
+
+from app.crud.practice import PracticeCrud
+from app.model.model import Passage, PracticeQuestion
+from app.setup.instrumentation import count_queries
+
+
+async def _add_passages(db, count: int, questions_per_passage: int) -> None:
+    passages = await db.execute(
+        insert(Passage)
+        .values(
+            [
+                {"title": f"Passage {i}", "content": "...", "skill": "reading", "question_type": "multiple_choice"}
+                for i in range(count)
+            ]
+        )
+        .returning(Passage.id)
+    )
+    await db.execute(
+        insert(PracticeQuestion).values(
+            [
+                {
+                    "skill": "reading",
+                    "question_type": "multiple_choice",
+                    "passage_id": passage_id,
+                    "question_text": f"Question {i}",
+                }
+                for passage_id in passages.scalars()
+                for i in range(questions_per_passage)
+            ]
+        )
+    )
+    await db.commit()
+
+
+@pytest.mark.parametrize("limit", [1, 5, 20])
+async def test_passages_with_questions_take_two_queries(db, limit):
+    await _add_passages(db, 20, 3)
+
+    with count_queries() as stats:
+        passages, _ = await PracticeCrud.get_passages_with_questions(db, "reading", limit=limit)
+
+    assert len(passages) == limit
+    assert all(len(passage.questions) == 3 for passage in passages)
+    assert stats.count <= 2
@@ -0,0 +1,71 @@
+"""
+The rate limiter fails open quickly when Redis does not answer.
+"""
+
+import asyncio
+import logging
+import time
+
+import pytest
+
+from app.common.utils.rate_limit import RateLimiter
+from app.common.utils.redis import RedisClient
+
+
+@pytest.fixture
+async def silent_server():
+    """A server that accepts connections and never replies, like an unreachable Redis behind a timeout"""
+    connections = []
+
+    async def accept(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connections.append(writer)
+
+    server = await asyncio.start_server(accept, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    yield f"redis://127.0.0.1:{port}/1", connections
+    server.close()
+    for writer in connections:
+        writer.close()
+
+
+async def test_concurrent_commands_share_one_connect_attempt(silent_server):
+    url, connections = silent_server
+    client = RedisClient.from_url(url, timeout=0.2)
+
+    started = time.monotonic()
+    results = await asyncio.gather(*(client.execute("PING") for _ in range(10)), return_exceptions=True)
+
+    assert all(isinstance(result, (TimeoutError, ConnectionError)) for result in results)
+    assert len(connections) == 1
+    assert time.monotonic() - started < 1.0
+    await client.close()
+
+
+async def test_open_circuit_skips_redis_and_logs_once(silent_server, caplog):
+    url, connections = silent_server
+    limiter = RateLimiter()
+    limiter.configure("redis", url, retry_seconds=60)
+
+    with caplog.at_level(logging.INFO, logger="app.common.utils.rate_limit"):
+        assert await limiter.hit("login:ip:a", 2, 60) == 0
+        started = time.monotonic()
+        waits = [await limiter.hit("login:ip:a", 2, 60) for _ in range(20)]
+
+    # Still limited, by the in-process buckets, without waiting on Redis again
+    assert waits[0] == 0 and all(waits[1:])
+    assert time.monotonic() - started < 0.1
+    assert len(connections) == 1
+    assert len(caplog.records) == 1
+
+
+async def test_circuit_probes_redis_again_after_the_retry_delay(silent_server):
+    url, connections = silent_server
+    limiter = RateLimiter()
+    limiter.configure("redis", url, retry_seconds=0.5)
+
+    await limiter.hit("login:ip:a", 5, 60)
+    await asyncio.sleep(0.6)
+    await asyncio.gather(*(limiter.hit("login:ip:a", 5, 60) for _ in range(5)))
+
+    # One probe for the five requests
+    assert len(connections) == 2
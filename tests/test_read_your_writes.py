@@ -0,0 +1,36 @@
+"""
+Read-your-writes bookkeeping of the session manager stays bounded.
+"""
+
+import time
+
+from app.setup.database import _MAX_RECENT_WRITES, DatabaseSessionManager
+
+
+def _manager(window_seconds: float) -> DatabaseSessionManager:
+    manager = DatabaseSessionManager()
+    # Stickiness only applies with replicas; no engine is needed for the bookkeeping
+    manager._replica_sessionmakers = [object()]
+    manager._read_your_writes_seconds = window_seconds
+    return manager
+
+
+def test_recent_writes_are_capped_oldest_first():
+    manager = _manager(60.0)
+
+    for i in range(_MAX_RECENT_WRITES + 5):
+        manager.mark_write(f"client-{i}")
+
+    assert len(manager._recent_writes) == _MAX_RECENT_WRITES
+    assert not manager._wrote_recently("client-0")
+    assert manager._wrote_recently(f"client-{_MAX_RECENT_WRITES + 4}")
+
+
+def test_expired_writes_are_dropped():
+    manager = _manager(0.05)
+    manager.mark_write("client-a")
+
+    time.sleep(0.1)
+    manager.mark_write("client-b")
+
+    assert list(manager._recent_writes) == ["client-b"]
@@ -0,0 +1,84 @@
+"""
+Statement budgets of the CRUD writes, counted with the same per-request counter the query stats middleware uses.
+
+A write should cost one statement per table it touches, whatever the size of the row or the state of the user.
+"""
+
+from app.crud.auth import AuthCrud
+from app.crud.user import UserCrud
+from app.crud.user_activity import UserActivityCrud
+from app.crud.vocabulary import VocabularyCrud
+from app.setup.instrumentation import count_queries
+
+
+async def test_create_user_is_one_statement(db):
+    with count_queries() as stats:
+        await UserCrud.create_user(db, name="Ann", email="ann@example.com")
+
+    assert stats.count == 1
+
+
+async def test_update_user_profile_is_update_and_notify(db):
+    user = await UserCrud.create_user(db, name="Ann", email="ann@example.com")
+
+    with count_queries() as stats:
+        updated = await UserCrud.update_user_profile(db, user_id=user.id, name="Anne", target_score=7.5)
+
+    assert updated.name == "Anne"
+    assert stats.count == 2
+
+
+async def test_add_xp_to_user_is_update_and_notify(db):
+    user = await UserCrud.create_user(db, name="Ann", email="ann@example.com")
+
+    with count_queries() as stats:
+        updated = await UserCrud.add_xp_to_user(db, user.id, 150)
+
+    assert updated.xp == 150
+    assert stats.count == 2
+
+
+async def test_create_user_activity_updates_rollups_in_place(db):
+    user = await UserCrud.create_user(db, name="Ann", email="ann@example.com")
+
+    for _ in range(2):
+        with count_queries() as stats:
+            await UserActivityCrud.create_user_activity(db, user.id, "practice", "reading", 8.0, 7.0, xp_earned=10)
+
+        # Activity, user_stats and user_daily_activity upserts, data version
+        assert stats.count == 4
+
+
+async def test_create_vocabulary_is_insert_and_version_bump(db):
+    user = await UserCrud.create_user(db, name="Ann", email="ann@example.com")
+
+    with count_queries() as stats:
+        await VocabularyCrud.create_vocabulary(db, user.id, "ubiquitous", "reading")
+
+    assert stats.count == 2
+
+
+async def test_update_vocabulary_is_update_and_version_bump(db):
+    user = await UserCrud.create_user(db, name="Ann", email="ann@example.com")
+    vocabulary = await VocabularyCrud.create_vocabulary(db, user.id, "ubiquitous", "reading")
+
+    with count_queries() as stats:
+        updated = await VocabularyCrud.update_vocabulary(db, vocabulary.id, user.id, reviewed=True)
+
+    assert updated.reviewed
+    assert stats.count == 2
+
+
+async def test_issue_otp_checks_rate_limit_and_inserts_in_one_statement(db):
+    with count_queries() as stats:
+        first = await AuthCrud.issue_otp(db, "ann@example.com")
+
+    # User lookup, user insert, OTP statement
+    assert stats.count == 3
+
+    with count_queries() as stats:
+        second = await AuthCrud.issue_otp(db, "ann@example.com")
+
+    # The user exists now, and the OTP is reused within the rate limit window
+    assert stats.count == 2
+    assert second.id == first.id